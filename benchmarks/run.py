@@ -0,0 +1,376 @@
+"""
+Benchmarks of the Universe, constraint construction and Optimizer hot paths.
+
+Usage:
+    python -m benchmarks.run --sizes 1000 10000 100000 --output benchmark-results.json
+    python -m benchmarks.run --compare baseline.json --threshold 1.25
+
+Every benchmark is run on synthetic universes, reports the median time of its phases over the
+repeats and the peak memory allocated by Python, and the results are written to a JSON file.
+With --compare, the command exits with a non-zero status when a phase is slower than the baseline
+by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Optional
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+
+import corefolio
+from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.optimizer import Optimizer, _PhaseTimer
+from corefolio.universe import Universe
+
+from benchmarks.synthetic import make_constraints, make_frame
+
+# Phases shorter than this are too noisy to be compared against a baseline
+MIN_COMPARED_SECONDS = 1e-3
+
+# A benchmark prepares its inputs and returns a callable running the timed code, which returns its phase timings
+Benchmark = Callable[..., Callable[[], Dict[str, float]]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+PARAMETERS: Dict[str, List[Dict[str, Any]]] = {}
+# Benchmarks that are skipped on universes larger than --max-solve-size
+SOLVING = set()
+# Benchmarks that do not depend on the universe size, which are run once with num_assets=0
+SIZELESS = set()
+
+# Imports the package in a fresh interpreter and prints the cumulative time at which every stage is reached
+IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import corefolio
+stages = {"package": time.perf_counter() - start}
+corefolio.Universe
+stages["universe"] = time.perf_counter() - start
+corefolio.Optimizer
+stages["optimizer"] = time.perf_counter() - start
+stages["cvxpy_deferred"] = float("cvxpy" not in sys.modules)
+import cvxpy
+stages["cvxpy"] = time.perf_counter() - start
+print(json.dumps(stages))
+"""
+
+
+def benchmark(name: str, parameters: Optional[List[Dict[str, Any]]] = None, solves: bool = False, sizeless: bool = False) -> Callable[[Benchmark], Benchmark]:
+    """
+    Registers a benchmark.
+
+    Args:
+        name (str): The benchmark name.
+        parameters (Optional[List[Dict[str, Any]]]): The parameter sets the benchmark is run with, besides the size.
+        solves (bool): Whether the benchmark only makes sense when the MIP is solved.
+        sizeless (bool): Whether the benchmark does not depend on the universe size.
+
+    Returns:
+        Callable[[Benchmark], Benchmark]: The decorator.
+    """
+    def register(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = function
+        PARAMETERS[name] = parameters or [{}]
+        if solves:
+            SOLVING.add(name)
+        if sizeless:
+            SIZELESS.add(name)
+        return function
+    return register
+
+
+def _timed(function: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+@benchmark("universe")
+def bench_universe(num_assets: int, max_solve_size: int) -> Callable[[], Dict[str, float]]:
+    df = make_frame(num_assets, num_numeric=10)
+
+    def run() -> Dict[str, float]:
+        return {"construct": _timed(lambda: Universe(df))}
+    return run
+
+
+@benchmark("import", sizeless=True)
+def bench_import(num_assets: int, max_solve_size: int) -> Callable[[], Dict[str, float]]:
+    # The package is imported from the same location in the child interpreter
+    root = os.path.dirname(os.path.dirname(os.path.abspath(corefolio.__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        filter(None, [root, os.environ.get("PYTHONPATH")])))
+
+    def run() -> Dict[str, float]:
+        output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        stages = json.loads(output)
+        if not stages.pop("cvxpy_deferred"):
+            raise RuntimeError("Importing corefolio imported cvxpy.")
+        # The stages are reported as the time spent in each one
+        return {"package": stages["package"], "universe": stages["universe"] - stages["package"],
+                "optimizer": stages["optimizer"] - stages["universe"], "cvxpy": stages["cvxpy"] - stages["optimizer"]}
+    return run
+
+
+@benchmark("mean_constraint_numeric")
+def bench_mean_constraint_numeric(num_assets: int, max_solve_size: int) -> Callable[[], Dict[str, float]]:
+    df = make_frame(num_assets)
+    constraint = MeanConstraint(column_name="numeric_0", tolerance=0.1)
+
+    def run() -> Dict[str, float]:
+        x = cp.Variable(num_assets, boolean=True)
+        start = time.perf_counter()
+        constraints = constraint.apply_constraint(x, df)
+        build = time.perf_counter() - start
+        problem = cp.Problem(cp.Maximize(cp.sum(x)), constraints)
+        return {"build": build, "canonicalization": _timed(lambda: problem.get_problem_data(cp.SCIPY))}
+    return run
+
+
+@benchmark("mean_constraint_categorical", [{"num_categories": 10}, {"num_categories": 100}, {"num_categories": 1000}])
+def bench_mean_constraint_categorical(num_assets: int, max_solve_size: int, num_categories: int) -> Callable[[], Dict[str, float]]:
+    df = make_frame(num_assets, num_categories=num_categories)
+    constraint = MeanConstraint(column_name="category", tolerance=0.05)
+
+    def run() -> Dict[str, float]:
+        x = cp.Variable(num_assets, boolean=True)
+        start = time.perf_counter()
+        constraints = constraint.apply_constraint(x, df)
+        build = time.perf_counter() - start
+        problem = cp.Problem(cp.Maximize(cp.sum(x)), constraints)
+        return {"build": build, "canonicalization": _timed(lambda: problem.get_problem_data(cp.SCIPY))}
+    return run
+
+
+@benchmark("optimizer_mip", [{"num_numeric": 1}, {"num_numeric": 5}])
+def bench_optimizer_mip(num_assets: int, max_solve_size: int, num_numeric: int) -> Callable[[], Dict[str, float]]:
+    universe = Universe(make_frame(num_assets, num_numeric=num_numeric))
+    constraints = make_constraints(num_assets, num_numeric=num_numeric)
+
+    def run() -> Dict[str, float]:
+        optimizer = Optimizer(universe, constraints, target_column="value")
+        if num_assets > max_solve_size:
+            # Only the construction is measured on universes too large to solve routinely
+            timer = _PhaseTimer(optimizer)
+            problem, _ = optimizer._build_problem(universe.frame, np.asarray(
+                universe.column("value"), dtype=float), timer)
+            timer.record("canonicalization", _timed(
+                lambda: problem.get_problem_data(cp.SCIPY)))
+            return _group_build_phases(timer.timings)
+        return _group_build_phases(optimizer.solve().timings)
+    return run
+
+
+@benchmark("optimizer_compiled_resolve", solves=True)
+def bench_optimizer_compiled_resolve(num_assets: int, max_solve_size: int) -> Callable[[], Dict[str, float]]:
+    universe = Universe(make_frame(num_assets))
+    constraints = make_constraints(num_assets, categorical=False)
+
+    def run() -> Dict[str, float]:
+        optimizer = Optimizer(universe, constraints,
+                              target_column="value", compiled=True)
+        first = _timed(optimizer.solve)
+        constraints[0].max_assets += 1
+        second = _timed(optimizer.solve)
+        constraints[0].max_assets -= 1
+        return {"first_solve": first, "resolve": second}
+    return run
+
+
+@benchmark("optimizer_greedy", [{"num_numeric": 1}, {"num_numeric": 5}])
+def bench_optimizer_greedy(num_assets: int, max_solve_size: int, num_numeric: int) -> Callable[[], Dict[str, float]]:
+    universe = Universe(make_frame(num_assets, num_numeric=num_numeric))
+    constraints = make_constraints(num_assets, num_numeric=num_numeric)
+
+    def run() -> Dict[str, float]:
+        optimizer = Optimizer(universe, constraints,
+                              target_column="value", method="greedy")
+        timings = optimizer.solve().timings
+        return {"rows": timings["heuristic_rows"], "heuristic": timings["heuristic"]}
+    return run
+
+
+@benchmark("optimizer_top_k")
+def bench_optimizer_top_k(num_assets: int, max_solve_size: int) -> Callable[[], Dict[str, float]]:
+    universe = Universe(make_frame(num_assets))
+    constraints = [MaxAssetsConstraint(max_assets=max(10, num_assets // 100))]
+
+    def run() -> Dict[str, float]:
+        optimizer = Optimizer(universe, constraints,
+                              target_column="value", method="auto")
+        return {"solve": _timed(optimizer.solve)}
+    return run
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _group_build_phases(timings: Dict[str, float]) -> Dict[str, float]:
+    """
+    Sums the construction phases of the Optimizer timings into a 'build' phase.
+
+    Args:
+        timings (Dict[str, float]): The Optimizer phase timings.
+
+    Returns:
+        Dict[str, float]: The 'build', 'canonicalization' and, when solved, 'solver' timings.
+    """
+    build_phases = {"variables", "objective", "problem"}
+    grouped = {"build": sum(seconds for phase, seconds in timings.items()
+                            if phase in build_phases or phase.startswith("constraint:"))}
+    for phase in ["canonicalization", "solver"]:
+        if phase in timings:
+            grouped[phase] = timings[phase]
+    return grouped
+
+
+def run_benchmark(name: str, num_assets: int, parameters: Dict[str, Any], repeats: int, max_solve_size: int) -> Dict[str, Any]:
+    """
+    Runs a benchmark and measures the median phase timings and the peak memory.
+
+    Args:
+        name (str): The benchmark name.
+        num_assets (int): The number of assets of the synthetic universe.
+        parameters (Dict[str, Any]): The benchmark parameters.
+        repeats (int): The number of timed repeats.
+        max_solve_size (int): The largest universe size that is solved.
+
+    Returns:
+        Dict[str, Any]: The benchmark record.
+    """
+    run = BENCHMARKS[name](num_assets, max_solve_size, **parameters)
+    samples = [run() for _ in range(repeats)]
+    timings = {phase: statistics.median(sample[phase] for sample in samples)
+               for phase in samples[0]}
+    timings["total"] = statistics.median(
+        sum(sample.values()) for sample in samples)
+
+    # Memory is measured in a separate run since tracing slows down the allocations
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"benchmark": name, "num_assets": num_assets, "parameters": parameters,
+            "timings": timings, "peak_memory_bytes": peak}
+
+
+def run_all(sizes: List[int], repeats: int = 3, max_solve_size: int = 10000, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Runs the benchmarks on every universe size.
+
+    Args:
+        sizes (List[int]): The numbers of assets of the synthetic universes.
+        repeats (int): The number of timed repeats.
+        max_solve_size (int): The largest universe size that is solved.
+        names (Optional[List[str]]): The benchmarks to run, defaults to all of them.
+
+    Returns:
+        Dict[str, Any]: The machine-readable results, with the environment metadata.
+    """
+    records = []
+    for name in names or list(BENCHMARKS):
+        for num_assets in ([0] if name in SIZELESS else sizes):
+            if name in SOLVING and num_assets > max_solve_size:
+                continue
+            for parameters in PARAMETERS[name]:
+                record = run_benchmark(
+                    name, num_assets, parameters, repeats, max_solve_size)
+                print(f"{name} n={num_assets} {parameters}: " +
+                      ", ".join(f"{phase}={seconds:.4f}s" for phase, seconds in record["timings"].items()) +
+                      f", peak={record['peak_memory_bytes'] / 2 ** 20:.1f}MiB", file=sys.stderr)
+                records.append(record)
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corefolio": _package_version("corefolio"),
+            "cvxpy": cp.__version__,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeats": repeats,
+        },
+        "results": records,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (Dict[str, Any]): The current results.
+        baseline (Dict[str, Any]): The baseline results.
+        threshold (float): The slowdown ratio above which a phase is a regression.
+
+    Returns:
+        List[str]: The description of every regression.
+    """
+    def key(record: Dict[str, Any]) -> str:
+        return json.dumps([record["benchmark"], record["num_assets"], record["parameters"]], sort_keys=True)
+
+    baseline_records = {key(record): record for record in baseline["results"]}
+    regressions = []
+    for record in results["results"]:
+        reference = baseline_records.get(key(record))
+        if reference is None:
+            continue
+        for phase, seconds in record["timings"].items():
+            reference_seconds = reference["timings"].get(phase)
+            if reference_seconds is None or reference_seconds < MIN_COMPARED_SECONDS:
+                continue
+            if seconds > threshold * reference_seconds:
+                regressions.append(
+                    f"{record['benchmark']} n={record['num_assets']} {record['parameters']} {phase}: "
+                    f"{reference_seconds:.4f}s -> {seconds:.4f}s")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-solve-size", type=int, default=10000,
+                        help="Universes larger than this are built and canonicalized but not solved.")
+    parser.add_argument("--benchmarks", nargs="+",
+                        choices=sorted(BENCHMARKS), default=None)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--compare", default=None,
+                        help="Baseline results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run_all(args.sizes, args.repeats,
+                      args.max_solve_size, args.benchmarks)
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
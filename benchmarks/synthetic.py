@@ -0,0 +1,55 @@
+"""This module contains the synthetic universe generators used by the benchmarks."""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from corefolio.constraint import Constraint, MaxAssetsConstraint, MeanConstraint
+
+
+def make_frame(num_assets: int, num_categories: int = 10, num_numeric: int = 1, seed: int = 0) -> pd.DataFrame:
+    """
+    Generates a synthetic asset table.
+
+    Args:
+        num_assets (int): The number of assets.
+        num_categories (int): The number of levels of the 'category' column.
+        num_numeric (int): The number of numerical characteristic columns, named 'numeric_<i>'.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        pd.DataFrame: The asset table with 'ID', 'value', 'category' and the numerical columns.
+    """
+    rng = np.random.default_rng(seed)
+    data = {
+        "ID": np.arange(1, num_assets + 1),
+        "value": rng.normal(1.0, 1.0, num_assets),
+        "category": pd.Series(rng.integers(0, num_categories, num_assets)).map(lambda code: f"C{code}").to_numpy(),
+    }
+    for index in range(num_numeric):
+        data[f"numeric_{index}"] = rng.normal(5.0, 2.0, num_assets)
+    return pd.DataFrame(data)
+
+
+def make_constraints(num_assets: int, num_numeric: int = 1, categorical: bool = True) -> List[Constraint]:
+    """
+    Generates a constraint set matching make_frame.
+
+    Args:
+        num_assets (int): The number of assets, used to size the MaxAssetsConstraint.
+        num_numeric (int): The number of numerical MeanConstraint, one per 'numeric_<i>' column.
+        categorical (bool): Whether to add a MeanConstraint on the 'category' column.
+
+    Returns:
+        List[Constraint]: The constraints.
+    """
+    constraints: List[Constraint] = [
+        MaxAssetsConstraint(max_assets=max(10, num_assets // 100))]
+    for index in range(num_numeric):
+        constraints.append(MeanConstraint(
+            column_name=f"numeric_{index}", min_value=4.5, max_value=5.5))
+    if categorical:
+        constraints.append(MeanConstraint(
+            column_name="category", tolerance=0.05))
+    return constraints
@@ -1,7 +1,64 @@
 """CoreFolio is a Python package for portfolio optimization and risk management."""
 
-from .universe import Universe
-from .constraint import Constraint
-from .optimizer import Optimizer
+import importlib
+from typing import TYPE_CHECKING, Any, List
 
-__all__ = ["Universe", "Constraint", "Optimizer"]
+if TYPE_CHECKING:
+    from .universe import Universe
+    from .constraint import Constraint
+    from .optimizer import Optimizer
+    from .result import OptimizationResult
+    from .batch import Scenario
+    from .solver import SolverOptions
+    from .hooks import OptimizerHook
+    from .weights import FactorRiskModel, WeightOptions
+    from .cache import ResultCache
+    from .problem_store import ProblemStore
+
+# The public names are imported from their module on first access, so that importing corefolio is fast
+_EXPORTS = {
+    "Universe": "universe",
+    "Constraint": "constraint",
+    "Optimizer": "optimizer",
+    "OptimizationResult": "result",
+    "Scenario": "batch",
+    "SolverOptions": "solver",
+    "OptimizerHook": "hooks",
+    "FactorRiskModel": "weights",
+    "WeightOptions": "weights",
+    "ResultCache": "cache",
+    "ProblemStore": "problem_store",
+}
+
+__all__ = ["Universe", "Constraint", "Optimizer", "OptimizationResult", "Scenario", "SolverOptions", "OptimizerHook", "FactorRiskModel", "WeightOptions", "ResultCache", "ProblemStore"]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Returns a public name of the package, importing its module on first access.
+
+    Args:
+        name (str): The attribute name.
+
+    Returns:
+        Any: The attribute.
+
+    Raises:
+        AttributeError: If the name is not a public name of the package.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Later accesses bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    """
+    Returns the attributes of the package, including the public names not imported yet.
+
+    Returns:
+        List[str]: The attribute names.
+    """
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,128 @@
+"""This module contains the helpers used to run optimizations from asyncio code without blocking the event loop."""
+
+import asyncio
+import copy
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from corefolio.cache import result_key
+from corefolio.result import OptimizationResult
+
+
+class _InFlight:
+    def __init__(self, future: asyncio.Future) -> None:
+        """
+        Initializes the record of a solve running in an executor, shared by the identical requests awaiting it.
+
+        Args:
+            future (asyncio.Future): The future of the solve.
+        """
+        self.future = future
+        self.waiters = 0
+
+
+# Solves in flight, by event loop and result key, so that concurrent identical requests share a single solve
+_in_flight: Dict[Tuple[int, str], _InFlight] = {}
+
+
+def _solve_detached(optimizer: Any) -> OptimizationResult:
+    """
+    Solves a copy of an Optimizer, in an executor thread or process.
+
+    Args:
+        optimizer (Optimizer): The copy to solve.
+
+    Returns:
+        OptimizationResult: The result.
+    """
+    return optimizer.solve()
+
+
+def _start_solve(loop: asyncio.AbstractEventLoop, optimizer: Any, executor: Optional[Executor]) -> asyncio.Future:
+    """
+    Submits the solve of a copy of an Optimizer to an executor.
+
+    The copy shields the solve from changes made to the Optimizer while it runs and does not share its
+    compiled problem with other solves. Process executors receive the copy without its hooks, which are
+    notified of the result in the current process.
+
+    Args:
+        loop (asyncio.AbstractEventLoop): The running event loop.
+        optimizer (Optimizer): The Optimizer to solve.
+        executor (Optional[Executor]): The executor, defaults to the default executor of the loop.
+
+    Returns:
+        asyncio.Future: The future of the result.
+    """
+    detached = copy.copy(optimizer)
+    detached.constraints = list(optimizer.constraints)
+    if not isinstance(executor, ProcessPoolExecutor):
+        return loop.run_in_executor(executor, _solve_detached, detached)
+
+    detached.hooks = []
+    future = loop.run_in_executor(executor, _solve_detached, detached)
+
+    def notify(done: asyncio.Future) -> None:
+        if not done.cancelled() and done.exception() is None:
+            for hook in optimizer.hooks:
+                hook.on_result(optimizer, done.result())
+
+    future.add_done_callback(notify)
+    return future
+
+
+async def run_async(optimizer: Any, executor: Optional[Executor] = None, timeout: Optional[float] = None, coalesce: bool = True) -> OptimizationResult:
+    """
+    Solves an Optimizer in an executor, sharing the solve of concurrent identical requests.
+
+    Requests are identical when they have the same result key, see corefolio.cache.result_key, which is
+    computed in the default executor of the loop. A solve is cancelled when all the requests awaiting it
+    are cancelled or time out; a solve already running in a thread or process completes, but its result
+    is discarded.
+
+    Args:
+        optimizer (Optimizer): The Optimizer to solve.
+        executor (Optional[Executor]): The thread or process executor, defaults to the default executor of the loop.
+        timeout (Optional[float]): The time to wait for the result, in seconds. Waits indefinitely if None.
+        coalesce (bool): Whether to share the solve with concurrent identical requests.
+
+    Returns:
+        OptimizationResult: The result, a copy per request.
+
+    Raises:
+        asyncio.TimeoutError: If the result is not available within the timeout.
+        asyncio.CancelledError: If the request is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    key = None
+    if coalesce:
+        # Hashing the columns of a large Universe takes a while, which would block the event loop, and is not
+        # queued behind the solves of the executor
+        result_hash = await asyncio.wait_for(loop.run_in_executor(None, result_key, optimizer), timeout)
+        key = (id(loop), result_hash) if result_hash is not None else None
+    entry = _in_flight.get(key) if key is not None else None
+    if entry is None:
+        entry = _InFlight(_start_solve(loop, optimizer, executor))
+        if key is not None:
+            _in_flight[key] = entry
+
+            def release(done: asyncio.Future) -> None:
+                if _in_flight.get(key) is entry:
+                    del _in_flight[key]
+
+            entry.future.add_done_callback(release)
+
+    entry.waiters += 1
+    try:
+        # The shield keeps the shared solve alive when a single request is cancelled or times out
+        remaining = None if deadline is None else max(deadline - loop.time(), 0.0)
+        result = await asyncio.wait_for(asyncio.shield(entry.future), remaining)
+    finally:
+        entry.waiters -= 1
+        if entry.waiters == 0 and not entry.future.done():
+            # The entry is released before the done callbacks run, so that a new identical request starts a new solve
+            if key is not None and _in_flight.get(key) is entry:
+                del _in_flight[key]
+            entry.future.cancel()
+    return copy.deepcopy(result)
@@ -0,0 +1,173 @@
+"""This module contains the Scenario class and the helpers used to optimize scenarios in parallel processes."""
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from corefolio.result import OptimizationResult
+from corefolio.universe import Universe
+
+
+class Scenario:
+    def __init__(self, target_column: Optional[str] = None, sense: Optional[str] = None, values: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Initializes a Scenario, i.e. a variation of the optimization problem of an Optimizer.
+
+        Args:
+            target_column (Optional[str]): The column name to be used for the optimization target.
+                Defaults to the target column of the Optimizer.
+            sense (Optional[str]): The optimization sense, either 'maximize' or 'minimize'.
+                Defaults to the sense of the Optimizer.
+            values (Optional[Dict[str, Any]]): Column values replacing the Universe ones, e.g. stressed values,
+                given in the order of the Universe assets.
+        """
+        self.target_column = target_column
+        self.sense = sense
+        self.values = values or {}
+
+
+class _UniversePayload:
+    def __init__(self, universe: Universe) -> None:
+        """
+        Initializes the columnar payload of a Universe, which is cheaper to ship to worker processes than a DataFrame.
+
+        Args:
+            universe (Universe): The Universe to ship.
+        """
+        self.columns = {name: universe.column(name)
+                        for name in universe.frame.columns}
+        self.index = universe.frame.index
+        self.id_column = universe.id_column
+
+    def to_universe(self, overrides: Optional[Dict[str, Any]] = None) -> Universe:
+        """
+        Rebuilds a Universe from the payload without copying the columns.
+
+        Args:
+            overrides (Optional[Dict[str, Any]]): Column values replacing the payload ones.
+
+        Returns:
+            Universe: The rebuilt Universe.
+
+        Raises:
+            ValueError: If an override does not have one value per asset.
+        """
+        columns = dict(self.columns)
+        for name, values in (overrides or {}).items():
+            values = np.asarray(values)
+            if len(values) != len(self.index):
+                raise ValueError(
+                    f"Scenario values for column '{name}' must have one value per asset.")
+            columns[name] = values
+        # The payload was validated by the original Universe, only the overrides need to be checked
+        return Universe(pd.DataFrame(columns, index=self.index, copy=False), self.id_column,
+                        columns=list(overrides or {}))
+
+
+# State of the current worker process, set once by _initialize_worker
+_worker_state: Dict[str, Any] = {}
+
+
+def _initialize_worker(template: Any, payload: _UniversePayload) -> None:
+    """
+    Initializes a worker process with the Optimizer template and the Universe payload.
+
+    Args:
+        template (Optimizer): The Optimizer to copy the settings and constraints from.
+        payload (_UniversePayload): The Universe payload.
+    """
+    template.universe = payload.to_universe()
+    _worker_state["optimizer"] = template
+    _worker_state["payload"] = payload
+    _worker_state["universe"] = template.universe
+    _worker_state["target_column"] = template.target_column
+    _worker_state["sense"] = template.sense
+
+
+def _solve_scenario(scenario: Scenario) -> OptimizationResult:
+    """
+    Solves a scenario with the Optimizer of the current worker process.
+
+    Args:
+        scenario (Scenario): The scenario to solve.
+
+    Returns:
+        OptimizationResult: The result, with status 'error' if the scenario raised an exception.
+    """
+    start = time.perf_counter()
+    optimizer = _worker_state["optimizer"]
+    try:
+        if scenario.values:
+            optimizer.universe = _worker_state["payload"].to_universe(
+                scenario.values)
+        else:
+            optimizer.universe = _worker_state["universe"]
+        optimizer.target_column = scenario.target_column or _worker_state["target_column"]
+        optimizer.sense = optimizer._parse_sense(
+            scenario.sense) if scenario.sense else _worker_state["sense"]
+        result = optimizer.solve()
+    except Exception as error:
+        result = OptimizationResult(
+            [], "error", error=f"{type(error).__name__}: {error}")
+    result.wall_time = time.perf_counter() - start
+    return result
+
+
+def _worker_template(optimizer: Any) -> Any:
+    """
+    Returns the copy of an Optimizer shipped to the worker processes, without its Universe and hooks.
+
+    Args:
+        optimizer (Optimizer): The Optimizer to copy.
+
+    Returns:
+        Optimizer: The template.
+    """
+    template = copy.copy(optimizer)
+    template.universe = None
+    # Workers re-solve the same structure for every task
+    template.compiled = True
+    # Hooks are notified of the results in the current process only
+    template.hooks = []
+    return template
+
+
+def run_scenarios(optimizer: Any, scenarios: Sequence[Scenario], max_workers: Optional[int] = None) -> List[OptimizationResult]:
+    """
+    Solves the scenarios of an Optimizer, in parallel across processes when more than one worker is used.
+
+    Args:
+        optimizer (Optimizer): The Optimizer defining the Universe, constraints and default settings.
+        scenarios (Sequence[Scenario]): The scenarios to solve.
+        max_workers (Optional[int]): The number of worker processes, defaults to the number of CPUs.
+
+    Returns:
+        List[OptimizationResult]: The results, in the order of the scenarios.
+    """
+    scenarios = list(scenarios)
+    max_workers = min(max_workers or os.cpu_count() or 1,
+                      max(len(scenarios), 1))
+    payload = _UniversePayload(optimizer.universe)
+    template = _worker_template(optimizer)
+
+    if max_workers == 1:
+        _initialize_worker(copy.deepcopy(template), payload)
+        try:
+            results = [_solve_scenario(scenario) for scenario in scenarios]
+        finally:
+            _worker_state.clear()
+    else:
+        chunksize = max(1, len(scenarios) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker, initargs=(template, payload)) as executor:
+            results = list(executor.map(
+                _solve_scenario, scenarios, chunksize=chunksize))
+
+    for result in results:
+        for hook in optimizer.hooks:
+            hook.on_result(optimizer, result)
+    return results
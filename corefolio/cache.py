@@ -0,0 +1,295 @@
+"""This module contains the ResultCache class, which stores optimization results by a hash of the problem inputs."""
+
+import copy
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from corefolio.result import OptimizationResult
+
+
+def _hash_array(digest: Any, values: np.ndarray) -> None:
+    """
+    Feeds the contents of an array to a hash.
+
+    Args:
+        digest (Any): The hashlib object.
+        values (np.ndarray): The array, numerical or of Python objects.
+    """
+    values = np.asarray(values)
+    if values.dtype == object:
+        # Python objects are hashed by value, their memory layout is not meaningful
+        values = pd.util.hash_array(values, categorize=False)
+    digest.update(str(values.dtype).encode())
+    digest.update(np.ascontiguousarray(values).tobytes())
+
+
+def _array_digest(values: np.ndarray) -> str:
+    """
+    Returns the digest of the contents of an array.
+
+    Args:
+        values (np.ndarray): The array, numerical or of Python objects.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    _hash_array(digest, values)
+    return digest.hexdigest()
+
+
+def result_key(optimizer: Any) -> Optional[str]:
+    """
+    Returns the content-addressed key of the result of an Optimizer: a hash of the columns it reads,
+    the configuration of its constraints, the sense, target column, method, presolve and feasibility
+    pre-check flags and solver options.
+
+    Args:
+        optimizer (Optimizer): The Optimizer.
+
+    Returns:
+        Optional[str]: The hexadecimal key, or None if a constraint has no cache key or the Optimizer
+        is in the weighted mode, whose risk model is not hashed.
+    """
+    if optimizer.weight_options is not None:
+        return None
+    constraint_keys = []
+    for constraint in optimizer.constraints:
+        constraint_key = constraint.cache_key()
+        if constraint_key is None:
+            return None
+        constraint_keys.append(constraint_key)
+    configuration = (optimizer.universe.id_column, optimizer.target_column, optimizer.sense, optimizer.method,
+                     optimizer.presolve, optimizer.feasibility_check, tuple(constraint_keys), sorted(vars(optimizer.solver_options).items()))
+    digest = hashlib.blake2b(repr(configuration).encode(), digest_size=20)
+    for name in optimizer.required_columns:
+        digest.update(name.encode())
+        _hash_array(digest, optimizer.universe.column(name))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 128, path: Optional[Union[str, os.PathLike]] = None, ttl: Optional[float] = None, max_disk_entries: Optional[int] = None) -> None:
+        """
+        Initializes the ResultCache: an in-process LRU of results and an optional SQLite store shared across
+        processes. Results are stored by key, see result_key.
+
+        Args:
+            max_entries (int): The maximum number of results kept in memory, the least recently used are evicted.
+            path (Optional[Union[str, os.PathLike]]): The SQLite file of the on-disk store, which is disabled if None.
+            ttl (Optional[float]): The time to live of the results, in seconds, in memory and on disk.
+                Results never expire if None.
+            max_disk_entries (Optional[int]): The maximum number of results kept on disk, the least recently
+                used are evicted. Unbounded if None.
+
+        Raises:
+            ValueError: If max_entries is negative, the time to live is not positive or max_disk_entries is negative.
+        """
+        if max_entries < 0:
+            raise ValueError("The maximum number of entries must be nonnegative.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("The time to live must be positive.")
+        if max_disk_entries is not None and max_disk_entries < 0:
+            raise ValueError("The maximum number of disk entries must be nonnegative.")
+        self.max_entries = max_entries
+        self.path = path
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            with self._connect() as connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created REAL, accessed REAL, payload BLOB)")
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state used to pickle and copy the ResultCache, with an empty memory store.
+
+        Returns:
+            dict: The ResultCache state.
+        """
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restores the ResultCache from its pickled state.
+
+        Args:
+            state (dict): The ResultCache state.
+        """
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a transaction on the on-disk store, with one connection per operation so that the cache
+        can be shared across threads and processes.
+
+        Yields:
+            sqlite3.Connection: The connection, committed and closed on exit.
+        """
+        connection = sqlite3.connect(os.fspath(self.path), timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        """
+        Returns whether a result created at the given time has expired.
+
+        Args:
+            created (float): The creation time of the result, in seconds since the epoch.
+            now (float): The current time, in seconds since the epoch.
+
+        Returns:
+            bool: True if the result has expired.
+        """
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key: str) -> Optional[OptimizationResult]:
+        """
+        Returns a copy of the result stored under a key, looking up the memory store then the on-disk store.
+
+        Args:
+            key (str): The result key.
+
+        Returns:
+            Optional[OptimizationResult]: The result, or None if it is missing or has expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[0], now):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+
+        result = self._disk_get(key, now)
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.disk_hits += 1
+            self._remember(key, result[0], result[1])
+        return copy.deepcopy(result[1])
+
+    def put(self, key: str, result: OptimizationResult) -> None:
+        """
+        Stores a copy of a result under a key.
+
+        Args:
+            key (str): The result key.
+            result (OptimizationResult): The result.
+        """
+        now = time.time()
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._remember(key, now, result)
+        if self.path is not None:
+            with self._connect() as connection:
+                connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                                   (key, now, now, pickle.dumps(result)))
+                self._evict_disk(connection, now)
+
+    def clear(self) -> None:
+        """
+        Removes all the results, in memory and on disk, and resets the metrics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.disk_hits = self.misses = 0
+        if self.path is not None:
+            with self._connect() as connection:
+                connection.execute("DELETE FROM results")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the metrics of the cache.
+
+        Returns:
+            Dict[str, Any]: The number of hits, of which on-disk hits, misses, the hit rate and the number of
+            results in memory.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                    "hit_rate": self.hits / lookups if lookups else 0.0, "size": len(self._entries)}
+
+    def _remember(self, key: str, created: float, result: OptimizationResult) -> None:
+        """
+        Stores a result in memory, evicting the least recently used ones. The lock must be held.
+
+        Args:
+            key (str): The result key.
+            created (float): The creation time of the result, in seconds since the epoch.
+            result (OptimizationResult): The result.
+        """
+        self._entries[key] = (created, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple]:
+        """
+        Returns the result stored on disk under a key, removing it if it has expired.
+
+        Args:
+            key (str): The result key.
+            now (float): The current time, in seconds since the epoch.
+
+        Returns:
+            Optional[tuple]: The creation time and the result, or None if it is missing or has expired.
+        """
+        if self.path is None:
+            return None
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT created, payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self._is_expired(row[0], now):
+                connection.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            connection.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (now, key))
+        return row[0], pickle.loads(row[1])
+
+    def _evict_disk(self, connection: sqlite3.Connection, now: float) -> None:
+        """
+        Removes the expired results from disk and the least recently used ones beyond max_disk_entries.
+
+        Args:
+            connection (sqlite3.Connection): The connection to the on-disk store.
+            now (float): The current time, in seconds since the epoch.
+        """
+        if self.ttl is not None:
+            connection.execute(
+                "DELETE FROM results WHERE created < ?", (now - self.ttl,))
+        if self.max_disk_entries is not None:
+            connection.execute(
+                "DELETE FROM results WHERE key NOT IN (SELECT key FROM results ORDER BY accessed DESC LIMIT ?)",
+                (self.max_disk_entries,))
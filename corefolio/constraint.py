@@ -1,12 +1,115 @@
 """This module contains the Constraints classes, which are used to apply constraints to the optimization problem."""
 
-import cvxpy as cp
-from typing import List, Optional
+from __future__ import annotations
+
+import numpy as np
+import scipy.sparse as sp
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 from abc import ABC, abstractmethod
 import pandas as pd
 
+from corefolio.cache import _array_digest
+from corefolio.lazy import cp
+
+ParameterUpdater = Callable[[pd.DataFrame], None]
+CategoryBounds = Tuple[Optional[float], Optional[float]]
+
+
+class LinearRows:
+    def __init__(self, coefficients: sp.spmatrix, lower: np.ndarray, upper: np.ndarray, lower_count: Optional[np.ndarray] = None, upper_count: Optional[np.ndarray] = None) -> None:
+        """
+        Initializes linear constraint rows lower + lower_count * n <= coefficients @ x <= upper + upper_count * n,
+        where n = sum(x) is the selected count.
+
+        The selected count is an auxiliary variable, so that bounds proportional to the number of
+        selected assets, e.g. mean constraints, do not add a dense rank-one block to the rows.
+
+        Args:
+            coefficients (sp.spmatrix): The (rows x assets) coefficient matrix.
+            lower (np.ndarray): The lower bound of every row, -np.inf if unbounded.
+            upper (np.ndarray): The upper bound of every row, np.inf if unbounded.
+            lower_count (Optional[np.ndarray]): The coefficient of the selected count in the lower bounds,
+                defaults to zeros.
+            upper_count (Optional[np.ndarray]): The coefficient of the selected count in the upper bounds,
+                defaults to zeros.
+
+        Raises:
+            ValueError: If the arrays do not have one value per row.
+        """
+        self.coefficients = sp.csr_matrix(coefficients, dtype=float)
+        num_rows = self.coefficients.shape[0]
+        self.lower = np.asarray(lower, dtype=float)
+        self.upper = np.asarray(upper, dtype=float)
+        self.lower_count = np.zeros(num_rows) if lower_count is None else np.asarray(
+            lower_count, dtype=float)
+        self.upper_count = np.zeros(num_rows) if upper_count is None else np.asarray(
+            upper_count, dtype=float)
+        if any(array.shape != (num_rows,) for array in [self.lower, self.upper, self.lower_count, self.upper_count]):
+            raise ValueError(
+                "The bounds and count coefficients must have one value per row.")
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Returns the number of rows.
+
+        Returns:
+            int: The number of rows.
+        """
+        return self.coefficients.shape[0]
+
+    @classmethod
+    def stack(cls, rows: List["LinearRows"]) -> "LinearRows":
+        """
+        Stacks linear rows into a single block.
+
+        Args:
+            rows (List[LinearRows]): The rows to stack, over the same assets.
+
+        Returns:
+            LinearRows: The stacked rows.
+        """
+        return cls(sp.vstack([block.coefficients for block in rows], format="csr"),
+                   np.concatenate([block.lower for block in rows]),
+                   np.concatenate([block.upper for block in rows]),
+                   np.concatenate([block.lower_count for block in rows]),
+                   np.concatenate([block.upper_count for block in rows]))
+
+    def apply(self, variables: cp.Variable) -> List[cp.Constraint]:
+        """
+        Applies the rows to the decision variables as at most one lower-bounded and one upper-bounded block.
+
+        Args:
+            variables (cp.Variable): The decision variables.
+
+        Returns:
+            List[cp.Constraint]: The list of constraints.
+        """
+        constraints = []
+        count = None
+        if np.any(self.lower_count != 0) or np.any(self.upper_count != 0):
+            # Bounding the rows by an auxiliary count keeps the constraint matrix sparse,
+            # multiplying the count coefficients by cp.sum(variables) would add a dense rank-one block
+            count = cp.Variable()
+            constraints.append(count == cp.sum(variables))
+        for bounds, count_coefficients, is_lower in [(self.lower, self.lower_count, True), (self.upper, self.upper_count, False)]:
+            rows = np.flatnonzero(np.isfinite(bounds))
+            if not len(rows):
+                continue
+            products = self.coefficients[rows] @ variables
+            bound = bounds[rows]
+            if count is not None:
+                bound = bound + count * count_coefficients[rows]
+            constraints.append(
+                products >= bound if is_lower else products <= bound)
+        return constraints
+
 
 class Constraint(ABC):
+    # Whether the constraint limits the number of selected assets, in which case the weighted mode
+    # applies it to the boolean selection instead of the weights
+    cardinality = False
+
     @abstractmethod
     def apply_constraint(self, variables: List[cp.Variable], df: pd.DataFrame) -> List[cp.Constraint]:
         """
@@ -21,8 +124,81 @@ class Constraint(ABC):
         """
         pass
 
+    @property
+    def columns(self) -> List[str]:
+        """
+        Returns the Universe columns read by the constraint.
+
+        Returns:
+            List[str]: The column names.
+        """
+        return []
+
+    def linear_rows(self, df: pd.DataFrame) -> Optional[LinearRows]:
+        """
+        Returns the constraint as linear rows in bulk, which the Optimizer stacks with the rows of the
+        other constraints into a single block instead of calling apply_constraint. Compiled problems
+        still use apply_parameterized_constraint.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[LinearRows]: The rows, or None if the constraint only supports apply_constraint.
+        """
+        return None
+
+    def cache_key(self) -> Optional[Hashable]:
+        """
+        Returns a key describing the configuration of the constraint, which identifies the cached results
+        of the Optimizer together with the data. Constraints returning None are never cached.
+
+        Returns:
+            Optional[Hashable]: The configuration key, or None if the results cannot be cached.
+        """
+        return None
+
+    def structure_key(self, df: pd.DataFrame) -> Optional[Hashable]:
+        """
+        Returns a key describing the structure of the constraint for the given data.
+
+        Two calls returning the same key must lead to constraints that only differ by
+        parameter values, which allows a compiled problem to be reused. Constraints that
+        cannot be parameterized return None, in which case the problem is rebuilt on every call.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[Hashable]: The structure key, or None if the constraint is not parameterized.
+        """
+        return None
+
+    def apply_parameterized_constraint(self, variables: cp.Variable, df: pd.DataFrame) -> Tuple[List[cp.Constraint], ParameterUpdater]:
+        """
+        Applies the constraint using cp.Parameter objects for its scalar parameters and bounds.
+
+        The per-asset data are constants and part of the structure key: a parameter per asset multiplying
+        the decision variables makes the canonicalization quadratic in the number of assets.
+
+        Args:
+            variables (cp.Variable): The decision variables.
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Tuple[List[cp.Constraint], ParameterUpdater]: The list of constraints and a callable
+            refreshing the parameter values from a DataFrame with the same structure.
+
+        Raises:
+            NotImplementedError: If the constraint does not support parameterization.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support parameterized constraints.")
+
 
 class MaxAssetsConstraint(Constraint):
+    cardinality = True
+
     def __init__(self, max_assets: int = 5) -> None:
         """
         Initializes the MaxAssetsConstraint with a maximum number of assets.
@@ -45,6 +221,59 @@ class MaxAssetsConstraint(Constraint):
         """
         return [cp.sum(variables) <= self._max_assets]
 
+    def linear_rows(self, df: pd.DataFrame) -> Optional[LinearRows]:
+        """
+        Returns the constraint as a single row bounding the selected count.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[LinearRows]: The rows.
+        """
+        # 0 <= max_assets - n
+        return LinearRows(sp.csr_matrix((1, len(df))), np.full(1, -np.inf), np.full(1, float(self._max_assets)),
+                          upper_count=np.full(1, -1.0))
+
+    def cache_key(self) -> Optional[Hashable]:
+        """
+        Returns a key describing the configuration of the constraint.
+
+        Returns:
+            Optional[Hashable]: The configuration key.
+        """
+        return (type(self).__name__, self._max_assets)
+
+    def structure_key(self, df: pd.DataFrame) -> Optional[Hashable]:
+        """
+        Returns a key describing the structure of the constraint for the given data.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[Hashable]: The structure key.
+        """
+        return (type(self).__name__,)
+
+    def apply_parameterized_constraint(self, variables: cp.Variable, df: pd.DataFrame) -> Tuple[List[cp.Constraint], ParameterUpdater]:
+        """
+        Applies the constraint with the maximum number of assets as a cp.Parameter.
+
+        Args:
+            variables (cp.Variable): The decision variables.
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Tuple[List[cp.Constraint], ParameterUpdater]: The list of constraints and the parameter updater.
+        """
+        max_assets = cp.Parameter(nonneg=True, value=self._max_assets)
+
+        def update(df: pd.DataFrame) -> None:
+            max_assets.value = self._max_assets
+
+        return [cp.sum(variables) <= max_assets], update
+
     @property
     def max_assets(self) -> int:
         """
@@ -55,9 +284,19 @@ class MaxAssetsConstraint(Constraint):
         """
         return self._max_assets
 
+    @max_assets.setter
+    def max_assets(self, value: int) -> None:
+        """
+        Sets the maximum number of assets.
+
+        Args:
+            value (int): The maximum number of assets to select.
+        """
+        self._max_assets = value
+
 
 class MeanConstraint(Constraint):
-    def __init__(self, column_name: str, tolerance: float = 0.01, min_value: Optional[float] = None, max_value: Optional[float] = None) -> None:
+    def __init__(self, column_name: str, tolerance: float = 0.01, min_value: Optional[float] = None, max_value: Optional[float] = None, category_bounds: Optional[Dict[Hashable, CategoryBounds]] = None) -> None:
         """
         Initializes the MeanConstraint with a column name, tolerance, and optional minimum and maximum values.
 
@@ -66,16 +305,32 @@ class MeanConstraint(Constraint):
             tolerance (float): The tolerance for the mean constraint.
             min_value (Optional[float]): The minimum value for the mean constraint.
             max_value (Optional[float]): The maximum value for the mean constraint.
+            category_bounds (Optional[Dict[Hashable, CategoryBounds]]): Per-category (min, max) overrides
+                for categorical columns. A None bound falls back to the default bound of the category.
         """
         self._column_name = column_name
         self._tolerance = tolerance
         self._min_value = min_value
         self._max_value = max_value
+        self._category_bounds = dict(category_bounds or {})
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Returns the Universe columns read by the constraint.
+
+        Returns:
+            List[str]: The column names.
+        """
+        return [self._column_name]
 
     def apply_constraint(self, variables: List[cp.Variable], df: pd.DataFrame) -> List[cp.Constraint]:
         """
         Applies the mean constraint to the optimization problem.
 
+        Categorical columns are encoded as a sparse one-hot matrix so that all categories
+        are constrained by two vectorized constraints on an auxiliary selected count.
+
         Args:
             variables (List[cp.Variable]): The decision variables.
             df (pd.DataFrame): The DataFrame containing asset data.
@@ -84,35 +339,191 @@ class MeanConstraint(Constraint):
             List[cp.Constraint]: The list of constraints.
         """
         constraints = []
+        selected_count = cp.sum(variables)
         if pd.api.types.is_numeric_dtype(df[self._column_name]):
             mean_value = df[self._column_name].mean()
-            column_values = df[self._column_name].values
+            column_values = df[self._column_name].to_numpy()
             selected_sum = cp.sum(cp.multiply(variables, column_values))
-            selected_count = cp.sum(variables)
 
-            min_value = self._min_value if self._min_value is not None else mean_value - self._tolerance
-            max_value = self._max_value if self._max_value is not None else mean_value + self._tolerance
+            min_value, max_value = self._bounds(mean_value)
 
             constraints.append(selected_sum >= selected_count * min_value)
             constraints.append(selected_sum <= selected_count * max_value)
         else:
-            categories = df[self._column_name].unique()
-            for category in categories:
-                category_mask = (df[self._column_name] ==
-                                 category).astype(float)
-                category_frequency = category_mask.mean()
-                selected_sum = cp.sum(cp.multiply(
-                    variables, category_mask))
-                selected_count = cp.sum(variables)
+            one_hot, categories, frequencies = self._one_hot(df)
+            selected_sums = one_hot @ variables
 
-                min_value = self._min_value if self._min_value is not None else category_frequency - self._tolerance
-                max_value = self._max_value if self._max_value is not None else category_frequency + self._tolerance
+            min_values, max_values = self._category_bounds_array(
+                categories, frequencies)
 
-                constraints.append(selected_sum >= selected_count * min_value)
-                constraints.append(selected_sum <= selected_count * max_value)
+            # Bounding the sums by an auxiliary count keeps the constraint matrix sparse,
+            # multiplying the bounds by cp.sum(variables) would add a dense rank-one block
+            count = cp.Variable()
+            constraints.append(count == selected_count)
+            constraints.append(
+                selected_sums >= cp.multiply(min_values, count))
+            constraints.append(
+                selected_sums <= cp.multiply(max_values, count))
 
         return constraints
 
+    def linear_rows(self, df: pd.DataFrame) -> Optional[LinearRows]:
+        """
+        Returns the mean constraint as rows homogeneous in the selection: the selected sum of the column,
+        or of every one-hot category row, is bounded by the bounds times the selected count.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[LinearRows]: The rows.
+        """
+        if pd.api.types.is_numeric_dtype(df[self._column_name]):
+            column = df[self._column_name]
+            values = sp.csr_matrix(column.to_numpy(dtype=float))
+            min_values, max_values = (np.full(1, bound)
+                                      for bound in self._bounds(column.mean()))
+        else:
+            values, categories, frequencies = self._one_hot(df)
+            min_values, max_values = self._category_bounds_array(
+                categories, frequencies)
+        zeros = np.zeros(values.shape[0])
+        return LinearRows(values, zeros, zeros, min_values, max_values)
+
+    def cache_key(self) -> Optional[Hashable]:
+        """
+        Returns a key describing the configuration of the constraint.
+
+        Returns:
+            Optional[Hashable]: The configuration key.
+        """
+        return (type(self).__name__, self._column_name, self._tolerance, self._min_value, self._max_value,
+                tuple(self._category_bounds.items()))
+
+    def _bounds(self, center: float) -> Tuple[float, float]:
+        """
+        Returns the lower and upper bounds of the mean constraint around a reference value.
+
+        Args:
+            center (float): The reference value, i.e. the column mean or the category frequency.
+
+        Returns:
+            Tuple[float, float]: The minimum and maximum values.
+        """
+        min_value = self._min_value if self._min_value is not None else center - self._tolerance
+        max_value = self._max_value if self._max_value is not None else center + self._tolerance
+        return min_value, max_value
+
+    def _category_bounds_array(self, categories: pd.Index, frequencies: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the lower and upper bounds of every category, applying the per-category overrides.
+
+        Args:
+            categories (pd.Index): The categories, in one-hot row order.
+            frequencies (np.ndarray): The frequency of each category in the universe.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The minimum and maximum values of each category.
+        """
+        min_values, max_values = self._bounds(frequencies)
+        min_values = np.broadcast_to(min_values, frequencies.shape).astype(float)
+        max_values = np.broadcast_to(max_values, frequencies.shape).astype(float)
+        if self._category_bounds:
+            positions = categories.get_indexer(list(self._category_bounds))
+            for position, (min_value, max_value) in zip(positions, self._category_bounds.values()):
+                if position < 0:
+                    continue
+                if min_value is not None:
+                    min_values[position] = min_value
+                if max_value is not None:
+                    max_values[position] = max_value
+        return min_values, max_values
+
+    def _one_hot(self, df: pd.DataFrame) -> Tuple[sp.csr_matrix, pd.Index, np.ndarray]:
+        """
+        Encodes the categorical column as a sparse one-hot matrix with one row per category.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Tuple[sp.csr_matrix, pd.Index, np.ndarray]: The one-hot matrix, the categories and their frequencies.
+        """
+        codes, categories = pd.factorize(df[self._column_name])
+        num_assets = len(codes)
+        one_hot = sp.csr_matrix(
+            (np.ones(num_assets), (codes, np.arange(num_assets))),
+            shape=(len(categories), num_assets))
+        frequencies = np.bincount(
+            codes, minlength=len(categories)) / max(num_assets, 1)
+        return one_hot, pd.Index(categories), frequencies
+
+    def structure_key(self, df: pd.DataFrame) -> Optional[Hashable]:
+        """
+        Returns a key describing the structure of the constraint for the given data.
+
+        Numerical columns depend on a digest of the column values, which are constants of the compiled
+        problem, categorical columns on the assignment of assets to categories, which defines the one-hot matrix.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[Hashable]: The structure key.
+        """
+        if pd.api.types.is_numeric_dtype(df[self._column_name]):
+            return (type(self).__name__, self._column_name, _array_digest(df[self._column_name].to_numpy(dtype=float)))
+        codes, categories = pd.factorize(df[self._column_name])
+        return (type(self).__name__, self._column_name, tuple(categories), _array_digest(codes))
+
+    def apply_parameterized_constraint(self, variables: cp.Variable, df: pd.DataFrame) -> Tuple[List[cp.Constraint], ParameterUpdater]:
+        """
+        Applies the mean constraint with the bounds as cp.Parameter objects.
+
+        The column values, or the one-hot matrix of categorical columns, are part of the structure
+        and constants of the problem, only the bounds are parameters.
+
+        Args:
+            variables (cp.Variable): The decision variables.
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Tuple[List[cp.Constraint], ParameterUpdater]: The list of constraints and the parameter updater.
+        """
+        selected_count = cp.sum(variables)
+        constraints = []
+        if pd.api.types.is_numeric_dtype(df[self._column_name]):
+            column = df[self._column_name]
+            mean_value = column.mean()
+            min_value = cp.Parameter()
+            max_value = cp.Parameter()
+            selected_sum = column.to_numpy(dtype=float) @ variables
+            constraints.append(selected_sum >= selected_count * min_value)
+            constraints.append(selected_sum <= selected_count * max_value)
+
+            def update(df: pd.DataFrame) -> None:
+                # The column values are part of the structure key, so the mean is unchanged
+                min_value.value, max_value.value = self._bounds(mean_value)
+        else:
+            one_hot, categories, frequencies = self._one_hot(df)
+            min_values = cp.Parameter(len(categories))
+            max_values = cp.Parameter(len(categories))
+            selected_sums = one_hot @ variables
+            count = cp.Variable()
+            constraints.append(count == selected_count)
+            constraints.append(
+                selected_sums >= cp.multiply(min_values, count))
+            constraints.append(
+                selected_sums <= cp.multiply(max_values, count))
+
+            def update(df: pd.DataFrame) -> None:
+                # The category assignment is part of the structure key, so the frequencies are unchanged
+                min_values.value, max_values.value = self._category_bounds_array(
+                    categories, frequencies)
+
+        update(df)
+        return constraints, update
+
     @property
     def column_name(self) -> str:
         """
@@ -133,6 +544,16 @@ class MeanConstraint(Constraint):
         """
         return self._tolerance
 
+    @tolerance.setter
+    def tolerance(self, value: float) -> None:
+        """
+        Sets the tolerance for the mean constraint.
+
+        Args:
+            value (float): The tolerance for the mean constraint.
+        """
+        self._tolerance = value
+
     @property
     def min_value(self) -> Optional[float]:
         """
@@ -143,6 +564,16 @@ class MeanConstraint(Constraint):
         """
         return self._min_value
 
+    @min_value.setter
+    def min_value(self, value: Optional[float]) -> None:
+        """
+        Sets the minimum value for the mean constraint.
+
+        Args:
+            value (Optional[float]): The minimum value for the mean constraint.
+        """
+        self._min_value = value
+
     @property
     def max_value(self) -> Optional[float]:
         """
@@ -152,3 +583,245 @@ class MeanConstraint(Constraint):
             Optional[float]: The maximum value for the mean constraint.
         """
         return self._max_value
+
+    @max_value.setter
+    def max_value(self, value: Optional[float]) -> None:
+        """
+        Sets the maximum value for the mean constraint.
+
+        Args:
+            value (Optional[float]): The maximum value for the mean constraint.
+        """
+        self._max_value = value
+
+    @property
+    def category_bounds(self) -> Dict[Hashable, CategoryBounds]:
+        """
+        Returns the per-category (min, max) overrides for the mean constraint.
+
+        Returns:
+            Dict[Hashable, CategoryBounds]: The per-category bounds.
+        """
+        return self._category_bounds
+
+    @category_bounds.setter
+    def category_bounds(self, value: Optional[Dict[Hashable, CategoryBounds]]) -> None:
+        """
+        Sets the per-category (min, max) overrides for the mean constraint.
+
+        Args:
+            value (Optional[Dict[Hashable, CategoryBounds]]): The per-category bounds.
+        """
+        self._category_bounds = dict(value or {})
+
+
+class MultiMeanConstraint(Constraint):
+    def __init__(self, column_names: List[str], tolerance: float = 0.01, bounds: Optional[Dict[str, CategoryBounds]] = None) -> None:
+        """
+        Initializes the MultiMeanConstraint, which bounds the mean of several numerical columns at once.
+
+        Every column is bounded by its mean plus or minus the tolerance, unless overridden by its bounds.
+
+        Args:
+            column_names (List[str]): The numerical column names.
+            tolerance (float): The tolerance around the mean of every column.
+            bounds (Optional[Dict[str, CategoryBounds]]): Per-column (min, max) overrides. A None bound falls back
+                to the default bound of the column.
+
+        Raises:
+            ValueError: If no column is given.
+        """
+        if not column_names:
+            raise ValueError("MultiMeanConstraint requires at least one column.")
+        self._column_names = list(column_names)
+        self._tolerance = tolerance
+        self._bounds_overrides = dict(bounds or {})
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        Returns the Universe columns read by the constraint.
+
+        Returns:
+            List[str]: The column names.
+        """
+        return list(self._column_names)
+
+    def apply_constraint(self, variables: List[cp.Variable], df: pd.DataFrame) -> List[cp.Constraint]:
+        """
+        Applies the mean constraints of all the columns as two matrix inequalities on a shared selected count.
+
+        Args:
+            variables (List[cp.Variable]): The decision variables.
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            List[cp.Constraint]: The list of constraints.
+        """
+        return self.linear_rows(df).apply(variables)
+
+    def linear_rows(self, df: pd.DataFrame) -> Optional[LinearRows]:
+        """
+        Returns one homogeneous row per column: the selected sum of the column is bounded by its bounds
+        times the selected count.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[LinearRows]: The rows.
+
+        Raises:
+            ValueError: If a column is not numerical.
+        """
+        block = self._block(df)
+        min_values, max_values = self._bounds_arrays(block.mean(axis=1))
+        zeros = np.zeros(len(self._column_names))
+        return LinearRows(block, zeros, zeros, min_values, max_values)
+
+    def _block(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Extracts the columns as a single (columns x assets) block.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            np.ndarray: The column values.
+
+        Raises:
+            ValueError: If a column is not numerical.
+        """
+        for name in self._column_names:
+            if not pd.api.types.is_numeric_dtype(df[name]):
+                raise ValueError(
+                    f"MultiMeanConstraint only supports numerical columns, '{name}' is not.")
+        block = np.empty((len(self._column_names), len(df)))
+        for row, name in enumerate(self._column_names):
+            block[row] = df[name].to_numpy(dtype=float)
+        return block
+
+    def _bounds_arrays(self, centers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the lower and upper bounds of every column, applying the per-column overrides.
+
+        Args:
+            centers (np.ndarray): The mean of every column.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The minimum and maximum values of every column.
+        """
+        min_values = centers - self._tolerance
+        max_values = centers + self._tolerance
+        for row, name in enumerate(self._column_names):
+            min_value, max_value = self._bounds_overrides.get(name, (None, None))
+            if min_value is not None:
+                min_values[row] = min_value
+            if max_value is not None:
+                max_values[row] = max_value
+        return min_values, max_values
+
+    def cache_key(self) -> Optional[Hashable]:
+        """
+        Returns a key describing the configuration of the constraint.
+
+        Returns:
+            Optional[Hashable]: The configuration key.
+        """
+        return (type(self).__name__, tuple(self._column_names), self._tolerance, tuple(self._bounds_overrides.items()))
+
+    def structure_key(self, df: pd.DataFrame) -> Optional[Hashable]:
+        """
+        Returns a key describing the structure of the constraint for the given data, including a digest
+        of the column block, which is a constant of the compiled problem.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Optional[Hashable]: The structure key.
+
+        Raises:
+            ValueError: If a column is not numerical.
+        """
+        return (type(self).__name__, tuple(self._column_names), _array_digest(self._block(df)))
+
+    def apply_parameterized_constraint(self, variables: cp.Variable, df: pd.DataFrame) -> Tuple[List[cp.Constraint], ParameterUpdater]:
+        """
+        Applies the mean constraints with the bounds as cp.Parameter objects, the column block is
+        part of the structure and a constant of the problem.
+
+        Args:
+            variables (cp.Variable): The decision variables.
+            df (pd.DataFrame): The DataFrame containing asset data.
+
+        Returns:
+            Tuple[List[cp.Constraint], ParameterUpdater]: The list of constraints and the parameter updater.
+        """
+        num_columns = len(self._column_names)
+        block = self._block(df)
+        centers = block.mean(axis=1)
+        min_values = cp.Parameter(num_columns)
+        max_values = cp.Parameter(num_columns)
+        count = cp.Variable()
+        selected_sums = block @ variables
+        constraints = [count == cp.sum(variables),
+                       selected_sums >= cp.multiply(min_values, count),
+                       selected_sums <= cp.multiply(max_values, count)]
+
+        def update(df: pd.DataFrame) -> None:
+            # The column block is part of the structure key, so the means are unchanged
+            min_values.value, max_values.value = self._bounds_arrays(centers)
+
+        update(df)
+        return constraints, update
+
+    @property
+    def column_names(self) -> List[str]:
+        """
+        Returns the column names of the constraint.
+
+        Returns:
+            List[str]: The column names.
+        """
+        return list(self._column_names)
+
+    @property
+    def tolerance(self) -> float:
+        """
+        Returns the tolerance around the mean of every column.
+
+        Returns:
+            float: The tolerance.
+        """
+        return self._tolerance
+
+    @tolerance.setter
+    def tolerance(self, value: float) -> None:
+        """
+        Sets the tolerance around the mean of every column.
+
+        Args:
+            value (float): The tolerance.
+        """
+        self._tolerance = value
+
+    @property
+    def bounds(self) -> Dict[str, CategoryBounds]:
+        """
+        Returns the per-column (min, max) overrides.
+
+        Returns:
+            Dict[str, CategoryBounds]: The per-column bounds.
+        """
+        return self._bounds_overrides
+
+    @bounds.setter
+    def bounds(self, value: Optional[Dict[str, CategoryBounds]]) -> None:
+        """
+        Sets the per-column (min, max) overrides.
+
+        Args:
+            value (Optional[Dict[str, CategoryBounds]]): The per-column bounds.
+        """
+        self._bounds_overrides = dict(value or {})
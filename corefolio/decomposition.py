@@ -0,0 +1,304 @@
+"""This module contains the helpers used to solve a partitioned Universe group by group across processes."""
+
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from corefolio.batch import _UniversePayload, _initialize_worker, _worker_state, _worker_template
+from corefolio.constraint import MaxAssetsConstraint
+from corefolio.result import OptimizationResult
+from corefolio.universe import Universe
+
+# Relative gap below which the Lagrangian coordination stops
+DECOMPOSITION_TOLERANCE = 1e-6
+
+# A group subproblem result: the selected positions in the Universe, the status and the objective of the shifted values
+GroupSolution = Tuple[np.ndarray, str, Optional[float]]
+
+
+def _group_optimizer(group: int, positions: np.ndarray) -> Tuple[Any, pd.DataFrame]:
+    """
+    Returns the Optimizer of a group in the current worker process, creating it on first use.
+
+    The group Optimizer applies the non-cardinality constraints of the template to the assets of the group
+    and a MaxAssetsConstraint holding the budget of the group. It is compiled, so that the solves of the
+    group with other budgets or price shifts only update the parameters.
+
+    Args:
+        group (int): The group code.
+        positions (np.ndarray): The positions of the group assets in the Universe.
+
+    Returns:
+        Tuple[Optimizer, pd.DataFrame]: The group Optimizer and the data of its assets.
+    """
+    groups = _worker_state.setdefault("groups", {})
+    if group not in groups:
+        template = _worker_state["optimizer"]
+        payload = _worker_state["payload"]
+        frame = pd.DataFrame({name: values[positions] for name, values in payload.columns.items()},
+                             index=payload.index[positions])
+        optimizer = copy.copy(template)
+        optimizer.universe = Universe(frame, payload.id_column, validate=False)
+        optimizer.constraints = [constraint for constraint in template.constraints if not constraint.cardinality]
+        optimizer.constraints.append(MaxAssetsConstraint(len(positions)))
+        groups[group] = (optimizer, frame)
+    return groups[group]
+
+
+def _solve_group(task: Tuple[int, np.ndarray, Optional[int], float]) -> GroupSolution:
+    """
+    Solves the subproblem of a group with a budget and a price per selected asset.
+
+    Args:
+        task (Tuple[int, np.ndarray, Optional[int], float]): The group code, the positions of its assets,
+            its budget (None for no budget) and the price subtracted from the objective per selected asset.
+
+    Returns:
+        GroupSolution: The selected positions, the status and the objective including the price.
+    """
+    group, positions, budget, price = task
+    optimizer, frame = _group_optimizer(group, positions)
+    optimizer.constraints[-1].max_assets = len(positions) if budget is None else budget
+    if price:
+        values = frame[optimizer.target_column].to_numpy(dtype=float)
+        frame = frame.assign(**{optimizer.target_column: values - optimizer.sense * price})
+    optimizer.universe = Universe(frame, optimizer.universe.id_column, validate=False)
+    result = optimizer.solve()
+    selected = positions[np.isin(frame[optimizer.universe.id_column].to_numpy(), result.selected_ids)]
+    objective = None if result.objective_value is None else optimizer.sense * result.objective_value
+    return selected, result.status, objective
+
+
+def _budget(constraints: Sequence[Any]) -> Optional[int]:
+    """
+    Returns the shared budget of the cardinality constraints.
+
+    Args:
+        constraints (Sequence[Constraint]): The constraints of the Optimizer.
+
+    Returns:
+        Optional[int]: The smallest maximum number of assets, or None without cardinality constraint.
+
+    Raises:
+        NotImplementedError: If a cardinality constraint is not a MaxAssetsConstraint.
+    """
+    budgets = []
+    for constraint in constraints:
+        if not constraint.cardinality:
+            continue
+        if not isinstance(constraint, MaxAssetsConstraint):
+            raise NotImplementedError(
+                f"The group decomposition does not support {type(constraint).__name__}.")
+        budgets.append(int(constraint.max_assets))
+    return min(budgets) if budgets else None
+
+
+def proportional_budgets(sizes: np.ndarray, budget: int) -> np.ndarray:
+    """
+    Allocates a budget across groups in proportion to their sizes, by largest remainder.
+
+    Args:
+        sizes (np.ndarray): The number of assets of every group.
+        budget (int): The total budget.
+
+    Returns:
+        np.ndarray: The budget of every group, at most its size.
+    """
+    budget = min(max(budget, 0), int(sizes.sum()))
+    shares = budget * sizes / max(sizes.sum(), 1)
+    budgets = np.floor(shares).astype(int)
+    remainders = np.argsort(-(shares - budgets), kind="stable")
+    budgets[remainders[:budget - budgets.sum()]] += 1
+    return np.minimum(budgets, sizes)
+
+
+class _GroupSolver:
+    def __init__(self, groups: List[np.ndarray], executor: Optional[ProcessPoolExecutor]) -> None:
+        """
+        Initializes the solver of the group subproblems, in the worker processes or in the current process.
+
+        Args:
+            groups (List[np.ndarray]): The positions of the assets of every group.
+            executor (Optional[ProcessPoolExecutor]): The worker processes, or None to solve in the current process.
+        """
+        self.groups = groups
+        self.executor = executor
+
+    def solve(self, budgets: Sequence[Optional[int]], price: float = 0.0) -> List[GroupSolution]:
+        """
+        Solves every group with its budget and a common price per selected asset.
+
+        Args:
+            budgets (Sequence[Optional[int]]): The budget of every group.
+            price (float): The price subtracted from the objective per selected asset.
+
+        Returns:
+            List[GroupSolution]: The solution of every group.
+        """
+        tasks = [(group, positions, budget, price)
+                 for group, (positions, budget) in enumerate(zip(self.groups, budgets))]
+        if self.executor is None:
+            return [_solve_group(task) for task in tasks]
+        return list(self.executor.map(_solve_group, tasks))
+
+
+def _merge(values: np.ndarray, solutions: List[GroupSolution]) -> Tuple[np.ndarray, float, bool]:
+    """
+    Merges the group solutions into a selection of the Universe.
+
+    Args:
+        values (np.ndarray): The asset values.
+        solutions (List[GroupSolution]): The solution of every group.
+
+    Returns:
+        Tuple[np.ndarray, float, bool]: The sorted selected positions, their objective value and whether
+        all the groups are optimal.
+    """
+    selected = np.sort(np.concatenate([positions for positions, _, _ in solutions] + [np.zeros(0, dtype=int)]))
+    optimal = all(status == "optimal" for _, status, _ in solutions)
+    return selected, float(values[selected].sum()), optimal
+
+
+def run_decomposition(optimizer: Any, group_column: str, allocation: str = "lagrangian", max_workers: Optional[int] = None, iterations: int = 20) -> OptimizationResult:
+    """
+    Solves an Optimizer whose constraints apply per group of a partition of the Universe, sharing the budget
+    of its MaxAssetsConstraint across the groups.
+
+    Every group is solved as an independent subproblem with its own budget. 'proportional' allocates the budget
+    in proportion to the group sizes and solves every group once. 'lagrangian' prices the selected assets,
+    bisecting the price until the groups fit in the budget, then allocates the unused budget to the groups
+    that selected more assets at a lower price; the best price gives an upper bound on the optimum, which
+    is reported as the gap.
+
+    Args:
+        optimizer (Optimizer): The Optimizer defining the Universe, constraints and settings.
+        group_column (str): The column partitioning the Universe.
+        allocation (str): The budget allocation, 'proportional' or 'lagrangian'.
+        max_workers (Optional[int]): The number of worker processes. Defaults to the number of CPUs;
+            1 solves the groups sequentially in the current process.
+        iterations (int): The maximum number of price bisection steps of the Lagrangian allocation.
+
+    Returns:
+        OptimizationResult: The merged result, with status 'feasible' when its optimality is not proven.
+
+    Raises:
+        ValueError: If the allocation is not supported or the Optimizer is in the weighted mode.
+        NotImplementedError: If a cardinality constraint is not a MaxAssetsConstraint.
+    """
+    if allocation not in ["proportional", "lagrangian"]:
+        raise ValueError(
+            "Invalid allocation value. Choose 'proportional' or 'lagrangian'.")
+    if optimizer.weight_options is not None:
+        raise ValueError("The group decomposition does not support the weighted mode.")
+    budget = _budget(optimizer.constraints)
+
+    start = time.perf_counter()
+    universe = optimizer.universe
+    ids = universe.column(universe.id_column).tolist()
+    values = np.asarray(universe.column(optimizer.target_column), dtype=float)
+    codes, _ = pd.factorize(universe.column(group_column))
+    order = np.argsort(codes, kind="stable")
+    groups = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1) if len(codes) else []
+    sizes = np.array([len(positions) for positions in groups])
+
+    payload = _UniversePayload(universe)
+    template = _worker_template(optimizer)
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(groups), 1))
+    if max_workers == 1:
+        _initialize_worker(copy.deepcopy(template), payload)
+        try:
+            result = _coordinate(_GroupSolver(groups, None), sizes, budget, values, optimizer.sense, allocation, iterations)
+        finally:
+            _worker_state.clear()
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker, initargs=(template, payload)) as executor:
+            result = _coordinate(_GroupSolver(groups, executor), sizes, budget, values, optimizer.sense, allocation, iterations)
+
+    selected, status, gap = result
+    result = OptimizationResult([ids[i] for i in selected], status, float(values[selected].sum()),
+                                method=f"decomposition:{allocation}", gap=gap)
+    result.wall_time = time.perf_counter() - start
+    result.timings = {"decomposition": result.wall_time}
+    for hook in optimizer.hooks:
+        hook.on_result(optimizer, result)
+    return result
+
+
+def _coordinate(solver: _GroupSolver, sizes: np.ndarray, budget: Optional[int], values: np.ndarray, sense: int, allocation: str, iterations: int) -> Tuple[np.ndarray, str, Optional[float]]:
+    """
+    Coordinates the budget of the groups.
+
+    Args:
+        solver (_GroupSolver): The solver of the group subproblems.
+        sizes (np.ndarray): The number of assets of every group.
+        budget (Optional[int]): The shared budget, or None if the groups are independent.
+        values (np.ndarray): The asset values.
+        sense (int): The optimization sense, 1 to maximize and -1 to minimize.
+        allocation (str): The budget allocation, 'proportional' or 'lagrangian'.
+        iterations (int): The maximum number of price bisection steps.
+
+    Returns:
+        Tuple[np.ndarray, str, Optional[float]]: The selected positions, the status and the relative gap.
+    """
+    def finish(selected: np.ndarray, optimal: bool, gap: Optional[float]) -> Tuple[np.ndarray, str, Optional[float]]:
+        gap = gap if optimal else None
+        return selected, "optimal" if gap is not None and gap <= DECOMPOSITION_TOLERANCE else "feasible", gap
+
+    if budget is None or allocation == "proportional":
+        budgets = [None] * len(sizes) if budget is None else proportional_budgets(sizes, budget).tolist()
+        selected, _, optimal = _merge(values, solver.solve(budgets))
+        # Independent groups are solved exactly, a proportional allocation is not proven optimal
+        return finish(selected, optimal, 0.0 if budget is None else None)
+
+    budget = max(budget, 0)
+    scores = sense * values
+    caps = np.minimum(sizes, budget).tolist()
+
+    def evaluate(price: float) -> Tuple[List[GroupSolution], np.ndarray, float, bool, Optional[float]]:
+        solutions = solver.solve(caps, price)
+        selected, objective, optimal = _merge(values, solutions)
+        counts = np.array([len(positions) for positions, _, _ in solutions])
+        # The Lagrangian dual value bounds the optimum when every group is solved exactly
+        bound = sum(value for _, _, value in solutions) + price * budget if optimal else None
+        return solutions, counts, sense * objective, optimal, bound
+
+    solutions, counts, objective, optimal, bound = evaluate(0.0)
+    if counts.sum() <= budget:
+        # The groups fit in the budget without coordination, so the merged selection is optimal
+        return finish(_merge(values, solutions)[0], optimal, 0.0)
+
+    best_bound = bound if bound is not None else np.inf
+    low, high = 0.0, float(max(scores.max(initial=0.0), 0.0)) + 1.0
+    low_counts = counts
+    best = (np.zeros(0, dtype=int), 0.0)
+    high_counts = np.zeros(len(sizes), dtype=int)
+    for _ in range(iterations):
+        price = (low + high) / 2
+        solutions, counts, objective, optimal, bound = evaluate(price)
+        if bound is not None:
+            best_bound = min(best_bound, bound)
+        if counts.sum() <= budget:
+            high, high_counts = price, counts
+            if objective > best[1]:
+                best = (_merge(values, solutions)[0], objective)
+        else:
+            low, low_counts = price, counts
+        if np.isfinite(best_bound) and best_bound - best[1] <= DECOMPOSITION_TOLERANCE * max(abs(best_bound), 1.0):
+            break
+
+    # The budget left by the feasible price goes to the groups selecting more assets at the infeasible price
+    budgets = high_counts.copy()
+    for group in np.argsort(-(low_counts - high_counts), kind="stable"):
+        budgets[group] += min(max(low_counts[group] - high_counts[group], 0), budget - budgets.sum())
+    solutions = solver.solve(budgets.tolist())
+    selected, objective, optimal = _merge(values, solutions)
+    if optimal and sense * objective > best[1]:
+        best = (selected, sense * objective)
+
+    gap = max(best_bound - best[1], 0.0) / max(abs(best_bound), 1e-12) if np.isfinite(best_bound) else None
+    return finish(best[0], True, gap)
@@ -0,0 +1,222 @@
+"""This module contains the feasibility pre-check, which detects conflicting constraints before the problem is solved."""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from corefolio.constraint import Constraint, LinearRows
+from corefolio.heuristic import FEASIBILITY_TOLERANCE
+
+
+def _tolerance(bounds: np.ndarray) -> np.ndarray:
+    """
+    Returns the tolerance used when comparing sums of coefficients to bounds.
+
+    Args:
+        bounds (np.ndarray): The bounds.
+
+    Returns:
+        np.ndarray: The tolerance, relative to the magnitude of the bounds.
+    """
+    return FEASIBILITY_TOLERANCE * (1.0 + np.abs(bounds))
+
+
+def _is_partition(rows: LinearRows) -> np.ndarray:
+    """
+    Returns the rows with unit coefficients on disjoint sets of assets, e.g. the one-hot rows of a categorical
+    mean constraint, if all the rows with coefficients are such rows.
+
+    Args:
+        rows (LinearRows): The rows of a constraint.
+
+    Returns:
+        np.ndarray: The mask of the partition rows, all False if the rows are not a partition.
+    """
+    coefficients = rows.coefficients.tocsc()
+    partition = np.diff(rows.coefficients.indptr) > 0
+    if np.any(coefficients.data != 1.0) or np.any(np.diff(coefficients.indptr) > 1):
+        return np.zeros(rows.num_rows, dtype=bool)
+    return partition
+
+
+def _partition_mask(rows: LinearRows, partition: np.ndarray, counts: np.ndarray, num_assets: int) -> np.ndarray:
+    """
+    Returns the counts a selection may have under the partition rows of a constraint.
+
+    A selection of n assets takes an integer number of assets from the set of every row, within the bounds
+    of the row and the size of the set, and these numbers add up to n, minus the assets outside the sets.
+
+    Args:
+        rows (LinearRows): The rows of a constraint.
+        partition (np.ndarray): The mask of the partition rows.
+        counts (np.ndarray): The selected counts.
+        num_assets (int): The number of assets.
+
+    Returns:
+        np.ndarray: Whether a selection of every count may satisfy the partition rows.
+    """
+    lower = rows.lower[partition, None] + rows.lower_count[partition, None] * counts
+    upper = rows.upper[partition, None] + rows.upper_count[partition, None] * counts
+    sizes = np.diff(rows.coefficients.indptr)[partition, None]
+    # The number of assets taken from the set of every row, by count
+    minimum = np.ceil(np.maximum(lower - _tolerance(lower), 0.0))
+    maximum = np.floor(np.minimum(upper + _tolerance(upper), sizes))
+    outside = num_assets - sizes.sum()
+    return np.all(minimum <= maximum, axis=0) & (minimum.sum(axis=0) <= counts) & (counts <= maximum.sum(axis=0) + outside)
+
+
+def count_mask(rows: LinearRows, num_assets: int, max_count: Optional[int] = None) -> np.ndarray:
+    """
+    Returns the counts a selection satisfying the rows of a constraint may have.
+
+    A selection of n assets satisfies a row lower + lower_count * n <= a @ x <= upper + upper_count * n only if
+    the sum of the n largest coefficients of a reaches the lower bound and the sum of the n smallest ones does
+    not exceed the upper bound. For a mean constraint, the achievable mean ranges from the smallest to the
+    largest column value. Rows on disjoint sets of assets are checked together, see _partition_mask.
+
+    Args:
+        rows (LinearRows): The rows of a constraint.
+        num_assets (int): The number of assets.
+        max_count (Optional[int]): The largest count checked, defaults to the number of assets.
+
+    Returns:
+        np.ndarray: Whether a selection of every count, 0 to the largest count, may satisfy the rows.
+    """
+    max_count = num_assets if max_count is None else max_count
+    counts = np.arange(max_count + 1, dtype=float)
+    mask = np.ones(max_count + 1, dtype=bool)
+    partition = _is_partition(rows)
+    if partition.any():
+        mask &= _partition_mask(rows, partition, counts, num_assets)
+    for row in np.flatnonzero(~partition):
+        start, end = rows.coefficients.indptr[row], rows.coefficients.indptr[row + 1]
+        nonzeros = np.sort(rows.coefficients.data[start:end])
+        negative = nonzeros[nonzeros < 0]
+        values = np.concatenate([negative, np.zeros(num_assets - len(nonzeros)), nonzeros[len(negative):]])
+        smallest = np.concatenate([[0.0], np.cumsum(values[:max_count])])
+        largest = np.concatenate([[0.0], np.cumsum(values[::-1][:max_count])])
+        lower = rows.lower[row] + rows.lower_count[row] * counts
+        upper = rows.upper[row] + rows.upper_count[row] * counts
+        mask &= (largest >= lower - _tolerance(lower)) & (smallest <= upper + _tolerance(upper))
+    return mask
+
+
+def _merge_identical_assets(coefficients: sp.csr_matrix) -> Tuple[sp.csc_matrix, np.ndarray]:
+    """
+    Merges the assets with identical coefficient columns, which are interchangeable in the LP relaxation.
+
+    The columns are grouped by a random projection, and the grouping is verified so that a collision of
+    projections only disables the merge.
+
+    Args:
+        coefficients (sp.csr_matrix): The (rows x assets) coefficient matrix.
+
+    Returns:
+        Tuple[sp.csc_matrix, np.ndarray]: The coefficients of the merged assets and the number of assets of each.
+    """
+    columns = coefficients.tocsc()
+    num_rows, num_assets = columns.shape
+    projection = columns.T @ np.random.default_rng(0).standard_normal(num_rows)
+    codes, uniques = pd.factorize(projection)
+    representatives = np.empty(len(uniques), dtype=np.int64)
+    representatives[codes[::-1]] = np.arange(num_assets)[::-1]
+    merged = columns[:, representatives]
+    if (columns - merged[:, codes]).count_nonzero():
+        return columns, np.ones(num_assets)
+    return merged, np.bincount(codes).astype(float)
+
+
+def relaxation_is_feasible(rows: List[LinearRows], min_count: int, max_count: int, num_assets: int) -> bool:
+    """
+    Returns whether the LP relaxation of the rows, with x in [0, 1] and a selected count within bounds, is feasible.
+
+    Args:
+        rows (List[LinearRows]): The rows of the constraints.
+        min_count (int): The minimum selected count.
+        max_count (int): The maximum selected count.
+        num_assets (int): The number of assets.
+
+    Returns:
+        bool: False if the relaxation is proven infeasible.
+    """
+    from scipy.optimize import linprog
+
+    stacked = LinearRows.stack(rows) if rows else LinearRows(sp.csr_matrix((0, num_assets)), np.zeros(0), np.zeros(0))
+    coefficients, sizes = _merge_identical_assets(stacked.coefficients)
+    num_groups = len(sizes)
+    # The variables are the number of assets selected in every group and the selected count n,
+    # every row side reads a @ x - count * n <= bound
+    blocks = []
+    bounds = []
+    for sign, row_bounds, count_coefficients in [(-1.0, stacked.lower, stacked.lower_count), (1.0, stacked.upper, stacked.upper_count)]:
+        finite = np.flatnonzero(np.isfinite(row_bounds))
+        blocks.append(sp.hstack([sign * coefficients[finite], sp.csc_matrix(-sign * count_coefficients[finite, None])]))
+        bounds.append(sign * row_bounds[finite])
+    count_row = sp.csr_matrix(np.concatenate([np.ones(num_groups), [-1.0]]))
+    solution = linprog(np.zeros(num_groups + 1), A_ub=sp.vstack(blocks, format="csr"), b_ub=np.concatenate(bounds),
+                       A_eq=count_row, b_eq=np.zeros(1), bounds=[(0.0, size) for size in sizes] + [(min_count, max_count)],
+                       method="highs")
+    # Other statuses, e.g. numerical difficulties, do not prove anything
+    return solution.status != 2
+
+
+def find_conflict(constraints: List[Constraint], df: pd.DataFrame) -> Optional[List[int]]:
+    """
+    Returns a minimal subset of the constraints that no nonempty selection satisfies, if the pre-check proves one.
+
+    A subset conflicts when no count is allowed by all the count masks, see count_mask, or when the LP
+    relaxation of its rows is infeasible over the allowed counts. The conflicting subset found is reduced
+    by a deletion filter: every constraint is dropped in turn and kept out if the others still conflict,
+    so that removing any constraint of the result makes the pre-check pass. Constraints without linear rows
+    are not checked. The pre-check only proves conflicts: a problem passing it may still have no nonempty
+    solution.
+
+    Args:
+        constraints (List[Constraint]): The constraints of the problem.
+        df (pd.DataFrame): The DataFrame containing asset data.
+
+    Returns:
+        Optional[List[int]]: The positions of the conflicting constraints, or None if no conflict was found.
+    """
+    num_assets = len(df)
+    if not num_assets:
+        return None
+    rows: Dict[int, LinearRows] = {}
+    for index, constraint in enumerate(constraints):
+        constraint_rows = constraint.linear_rows(df)
+        if constraint_rows is not None:
+            rows[index] = constraint_rows
+    # Rows without asset coefficients, e.g. MaxAssetsConstraint, only bound the count and are checked first,
+    # so that the masks of the other constraints are only computed up to the largest count allowed
+    count_only = {index for index, constraint_rows in rows.items() if not constraint_rows.coefficients.nnz}
+    masks: Dict[int, np.ndarray] = {}
+
+    def mask_of(index: int, max_count: int) -> np.ndarray:
+        if index not in masks or len(masks[index]) <= max_count:
+            masks[index] = count_mask(rows[index], num_assets, max_count)
+        return masks[index][:max_count + 1]
+
+    def conflicts(indices: List[int]) -> bool:
+        mask = np.ones(num_assets + 1, dtype=bool)
+        # The empty selection satisfies the mean constraints, the pre-check looks for a nonempty one
+        mask[0] = False
+        for index in sorted(indices, key=lambda index: index not in count_only):
+            allowed = np.flatnonzero(mask)
+            if not len(allowed):
+                return True
+            mask = mask[:allowed[-1] + 1] & mask_of(index, int(allowed[-1]))
+        allowed = np.flatnonzero(mask)
+        if not len(allowed):
+            return True
+        return not relaxation_is_feasible([rows[index] for index in indices], int(allowed[0]), int(allowed[-1]), num_assets)
+
+    indices = list(rows)
+    if not conflicts(indices):
+        return None
+    for index in list(indices):
+        remaining = [other for other in indices if other != index]
+        if conflicts(remaining):
+            indices = remaining
+    return indices
@@ -0,0 +1,357 @@
+"""This module contains the NumPy heuristic engine used by the Optimizer for large universes."""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from corefolio.constraint import Constraint, LinearRows
+
+# Slack tolerance when checking the mean constraints of a selection
+FEASIBILITY_TOLERANCE = 1e-9
+
+
+class RatioRows:
+    def __init__(self, coefficients: sp.csr_matrix, offsets: np.ndarray, max_assets: int) -> None:
+        """
+        Initializes the rows of a selection problem written as (coefficients - offsets) @ x >= 0 and sum(x) <= max_assets.
+
+        Every mean constraint bounds an average over the selected assets, so it is homogeneous
+        in the selection: row j requires sum_i x_i * (coefficients[j, i] - offsets[j]) >= 0.
+
+        Args:
+            coefficients (sp.csr_matrix): The (rows x assets) coefficient matrix.
+            offsets (np.ndarray): The offset of every row, multiplied by the selected count.
+            max_assets (int): The maximum number of assets to select.
+        """
+        self.coefficients = coefficients
+        self.offsets = offsets
+        self.max_assets = max_assets
+
+    @property
+    def num_rows(self) -> int:
+        """
+        Returns the number of mean constraint rows.
+
+        Returns:
+            int: The number of rows.
+        """
+        return len(self.offsets)
+
+    def slacks(self, selected: np.ndarray) -> np.ndarray:
+        """
+        Returns the slack of every row for a selection, negative slacks are violations.
+
+        Args:
+            selected (np.ndarray): The boolean selection mask.
+
+        Returns:
+            np.ndarray: The row slacks.
+        """
+        return self.coefficients @ selected.astype(float) - self.offsets * selected.sum()
+
+    def is_feasible(self, selected: np.ndarray) -> bool:
+        """
+        Returns whether a selection satisfies all the rows.
+
+        Args:
+            selected (np.ndarray): The boolean selection mask.
+
+        Returns:
+            bool: True if the selection is feasible.
+        """
+        return selected.sum() <= self.max_assets and bool(np.all(self.slacks(selected) >= -FEASIBILITY_TOLERANCE))
+
+    def dense_columns(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Returns the dense (rows x len(indices)) block of the rows for the given assets.
+
+        Args:
+            indices (np.ndarray): The asset positions.
+
+        Returns:
+            np.ndarray: The row coefficients of the assets, net of the offsets.
+        """
+        return self.coefficients[:, indices].toarray() - self.offsets[:, None]
+
+    def linear_rows(self) -> LinearRows:
+        """
+        Returns the rows as linear rows, including the row bounding the selected count.
+
+        Returns:
+            LinearRows: The rows coefficients @ x >= offsets * n and n <= max_assets.
+        """
+        num_rows, num_assets = self.coefficients.shape
+        rows = LinearRows(self.coefficients, np.zeros(num_rows), np.full(num_rows, np.inf), lower_count=self.offsets)
+        count_row = LinearRows(sp.csr_matrix((1, num_assets)), np.full(1, -np.inf), np.full(1, float(self.max_assets)),
+                               upper_count=np.full(1, -1.0))
+        return LinearRows.stack([rows, count_row])
+
+
+def build_ratio_rows(constraints: List[Constraint], df: pd.DataFrame) -> RatioRows:
+    """
+    Translates the linear rows of the constraints into ratio rows.
+
+    Rows without asset coefficients bound the selected count, the other rows must be homogeneous
+    in the selection, i.e. have zero bounds, which is the case of the mean constraints.
+
+    Args:
+        constraints (List[Constraint]): The constraints of the problem.
+        df (pd.DataFrame): The DataFrame containing asset data.
+
+    Returns:
+        RatioRows: The rows of the problem.
+
+    Raises:
+        NotImplementedError: If a constraint is not supported by the heuristic engine.
+    """
+    num_assets = len(df)
+    max_assets = num_assets
+    blocks = []
+    offsets = []
+    for constraint in constraints:
+        rows = constraint.linear_rows(df)
+        if rows is None:
+            raise NotImplementedError(
+                f"The heuristic engine does not support {type(constraint).__name__}.")
+        count_only = np.diff(rows.coefficients.indptr) == 0
+        # Every finite side of a row reads k * n >= b, with n the selected count, once the products are moved
+        # to the left: homogeneous rows have b = 0 and rows without asset coefficients bound n alone
+        sides = [(rows.lower, -rows.lower_count, 1.0), (-rows.upper, rows.upper_count, -1.0)]
+        for bounds, count_coefficients, sign in sides:
+            finite = np.isfinite(bounds)
+            for row in np.flatnonzero(count_only & finite):
+                coefficient, bound = count_coefficients[row], bounds[row]
+                if coefficient < 0:
+                    max_assets = min(max_assets, int(
+                        np.floor(bound / coefficient + FEASIBILITY_TOLERANCE)))
+                elif (coefficient == 0 and bound > 0) or (coefficient > 0 and bound / coefficient > 0):
+                    raise NotImplementedError(
+                        "The heuristic engine does not support lower bounds on the number of selected assets.")
+            bounded = np.flatnonzero(~count_only & finite)
+            if np.any(bounds[bounded] != 0):
+                raise NotImplementedError(
+                    f"The heuristic engine does not support the rows of {type(constraint).__name__}.")
+            blocks.append(sign * rows.coefficients[bounded])
+            offsets.append(-count_coefficients[bounded])
+    if not blocks:
+        return RatioRows(sp.csr_matrix((0, num_assets)), np.zeros(0), max_assets)
+    return RatioRows(sp.vstack(blocks, format="csr"), np.concatenate(offsets).astype(float), max_assets)
+
+
+def solve_top_k(scores: np.ndarray, max_assets: int) -> np.ndarray:
+    """
+    Selects the assets with the largest positive scores, which is optimal without mean constraints.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset.
+        max_assets (int): The maximum number of assets to select.
+
+    Returns:
+        np.ndarray: The boolean selection mask.
+    """
+    selected = np.zeros(len(scores), dtype=bool)
+    max_assets = min(max(int(max_assets), 0), len(scores))
+    if max_assets == 0:
+        return selected
+    if max_assets < len(scores):
+        candidates = np.argpartition(-scores, max_assets - 1)[:max_assets]
+    else:
+        candidates = np.arange(len(scores))
+    selected[candidates[scores[candidates] > 0]] = True
+    return selected
+
+
+def _best_prefix(scores: np.ndarray, rows: RatioRows, order: np.ndarray) -> Tuple[Optional[np.ndarray], float]:
+    """
+    Returns the best feasible prefix of an ordering of the assets.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset.
+        rows (RatioRows): The rows of the problem.
+        order (np.ndarray): The asset positions, in the order they are added.
+
+    Returns:
+        Tuple[Optional[np.ndarray], float]: The selection mask of the best feasible prefix, or None, and its objective.
+    """
+    cumulative_slacks = np.cumsum(rows.dense_columns(order), axis=1)
+    feasible = np.all(cumulative_slacks >= -FEASIBILITY_TOLERANCE, axis=0)
+    if not feasible.any():
+        return None, 0.0
+    objectives = np.where(feasible, np.cumsum(scores[order]), -np.inf)
+    length = int(np.argmax(objectives)) + 1
+    selected = np.zeros(len(scores), dtype=bool)
+    selected[order[:length]] = True
+    return selected, float(objectives[length - 1])
+
+
+def _construct(scores: np.ndarray, rows: RatioRows, priorities: np.ndarray, max_candidates: int = 2000) -> Tuple[np.ndarray, float]:
+    """
+    Builds a selection one asset at a time, adding the asset that leaves the smallest violation.
+
+    Ties, and in particular the assets keeping a feasible selection feasible, are broken by priority.
+    The best feasible intermediate selection is returned.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset.
+        rows (RatioRows): The rows of the problem.
+        priorities (np.ndarray): The priority of every asset, e.g. its reduced score.
+        max_candidates (int): The number of highest-priority assets considered.
+
+    Returns:
+        Tuple[np.ndarray, float]: The best feasible selection mask and its objective.
+    """
+    num_assets = len(scores)
+    max_assets = min(rows.max_assets, num_assets)
+    num_candidates = min(num_assets, max(max_candidates, 4 * max_assets))
+    candidates = np.argsort(-priorities, kind="stable")[:num_candidates]
+    columns = rows.dense_columns(candidates)
+    # Rows are compared on a common scale so that large numerical columns do not dominate
+    scales = np.maximum(np.abs(columns).max(axis=1, initial=0.0), 1e-12)
+    columns = columns / scales[:, None]
+
+    available = np.ones(len(candidates), dtype=bool)
+    slacks = np.zeros(rows.num_rows)
+    objective = 0.0
+    best_selected, best_objective = np.zeros(num_assets, dtype=bool), 0.0
+    path = []
+    for _ in range(max_assets):
+        violations = np.maximum(-(slacks[:, None] + columns), 0.0).sum(axis=0)
+        violations[~available] = np.inf
+        least_violation = violations.min()
+        if not np.isfinite(least_violation):
+            break
+        ties = np.flatnonzero(violations <= least_violation + FEASIBILITY_TOLERANCE)
+        position = ties[np.argmax(priorities[candidates[ties]])]
+        available[position] = False
+        slacks += columns[:, position]
+        objective += scores[candidates[position]]
+        path.append(candidates[position])
+        if least_violation <= FEASIBILITY_TOLERANCE and objective > best_objective:
+            best_selected = np.zeros(num_assets, dtype=bool)
+            best_selected[path] = True
+            best_objective = objective
+    return best_selected, best_objective
+
+
+def _local_search(scores: np.ndarray, rows: RatioRows, selected: np.ndarray, max_candidates: int = 1000, max_rounds: int = 100) -> np.ndarray:
+    """
+    Improves a feasible selection by adding, dropping and swapping assets while it stays feasible.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset.
+        rows (RatioRows): The rows of the problem.
+        selected (np.ndarray): The feasible boolean selection mask.
+        max_candidates (int): The number of best unselected assets considered for additions and swaps.
+        max_rounds (int): The maximum number of improving moves.
+
+    Returns:
+        np.ndarray: The improved selection mask.
+    """
+    selected = selected.copy()
+    for _ in range(max_rounds):
+        slacks = rows.slacks(selected)
+        inside = np.flatnonzero(selected)
+        outside = np.flatnonzero(~selected)
+        if len(outside) > max_candidates:
+            outside = outside[np.argpartition(-scores[outside], max_candidates - 1)[:max_candidates]]
+        outside_columns = rows.dense_columns(outside)
+        inside_columns = rows.dense_columns(inside)
+
+        best_gain, best_move = 0.0, None
+        if len(inside) < rows.max_assets and len(outside):
+            additions = np.all(slacks[:, None] + outside_columns >= -FEASIBILITY_TOLERANCE, axis=0)
+            gains = np.where(additions, scores[outside], -np.inf)
+            position = int(np.argmax(gains))
+            if gains[position] > best_gain:
+                best_gain, best_move = gains[position], ([], [outside[position]])
+        if len(inside):
+            removals = np.all(slacks[:, None] - inside_columns >= -FEASIBILITY_TOLERANCE, axis=0)
+            gains = np.where(removals, -scores[inside], -np.inf)
+            position = int(np.argmax(gains))
+            if gains[position] > best_gain:
+                best_gain, best_move = gains[position], ([inside[position]], [])
+        for position, asset in enumerate(inside):
+            if not len(outside):
+                break
+            swapped_slacks = (slacks - inside_columns[:, position])[:, None] + outside_columns
+            swaps = np.all(swapped_slacks >= -FEASIBILITY_TOLERANCE, axis=0)
+            gains = np.where(swaps, scores[outside] - scores[asset], -np.inf)
+            candidate = int(np.argmax(gains))
+            if gains[candidate] > best_gain:
+                best_gain, best_move = gains[candidate], ([asset], [outside[candidate]])
+
+        if best_move is None:
+            break
+        selected[best_move[0]] = False
+        selected[best_move[1]] = True
+    return selected
+
+
+def solve_greedy(scores: np.ndarray, rows: RatioRows, iterations: int = 200, initial: Optional[np.ndarray] = None) -> Tuple[np.ndarray, float]:
+    """
+    Solves the selection problem with a Lagrangian heuristic followed by local swaps.
+
+    The mean constraint rows are relaxed with nonnegative multipliers updated by subgradient steps.
+    Every relaxed problem is a top-k problem whose value bounds the optimum from above; since its
+    feasible set is totally unimodular, the best multipliers give the LP relaxation bound. The
+    assets ordered by reduced score provide feasible prefixes and a violation-driven construction,
+    the best of which is then improved by local search.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset.
+        rows (RatioRows): The rows of the problem.
+        iterations (int): The maximum number of subgradient iterations.
+        initial (Optional[np.ndarray]): A feasible selection mask used as the initial incumbent.
+
+    Returns:
+        Tuple[np.ndarray, float]: The boolean selection mask and the upper bound on the optimal objective.
+    """
+    num_assets = len(scores)
+    max_assets = min(max(int(rows.max_assets), 0), num_assets)
+    if rows.num_rows == 0:
+        selected = solve_top_k(scores, max_assets)
+        return selected, float(scores[selected].sum())
+
+    # Selecting no asset is always feasible
+    best_selected, best_objective = np.zeros(num_assets, dtype=bool), 0.0
+    if initial is not None and rows.is_feasible(initial):
+        best_selected = _local_search(scores, rows, initial)
+        best_objective = float(scores[best_selected].sum())
+    best_bound, best_reduced_scores = np.inf, scores
+    multipliers = np.zeros(rows.num_rows)
+    step_scale, stalled = 2.0, 0
+    transposed = rows.coefficients.T.tocsr()
+    for _ in range(iterations):
+        reduced_scores = scores + transposed @ multipliers - multipliers @ rows.offsets
+        relaxed = solve_top_k(reduced_scores, max_assets)
+        bound = float(reduced_scores[relaxed].sum())
+        if bound < best_bound - 1e-12:
+            best_bound, best_reduced_scores, stalled = bound, reduced_scores, 0
+        else:
+            stalled += 1
+            if stalled >= 10:
+                step_scale, stalled = step_scale / 2, 0
+
+        if max_assets > 0:
+            order = np.argsort(-reduced_scores, kind="stable")[:max_assets]
+            selected, objective = _best_prefix(scores, rows, order)
+            if selected is not None and objective > best_objective:
+                best_selected, best_objective = selected, objective
+
+        if best_bound - best_objective <= 1e-9 * max(1.0, abs(best_bound)):
+            break
+        subgradient = rows.slacks(relaxed)
+        norm = float(subgradient @ subgradient)
+        if norm == 0.0 or step_scale < 1e-6:
+            break
+        step = step_scale * (bound - best_objective) / norm
+        multipliers = np.maximum(0.0, multipliers - step * subgradient)
+
+    if max_assets > 0:
+        selected, objective = _construct(scores, rows, best_reduced_scores)
+        if objective > best_objective:
+            best_selected, best_objective = selected, objective
+    best_selected = _local_search(scores, rows, best_selected)
+    return best_selected, max(best_bound, float(scores[best_selected].sum()))
@@ -0,0 +1,74 @@
+"""This module contains the OptimizerHook class, which is used to observe the optimizations of an Optimizer."""
+
+from typing import Any, Callable, Optional
+
+
+class OptimizerHook:
+    """
+    Base class of the hooks notified by the Optimizer, e.g. to push metrics to a telemetry system.
+
+    All methods do nothing by default, so that subclasses only override the events they need.
+    """
+
+    def on_start(self, optimizer: Any) -> None:
+        """
+        Called when an optimization starts.
+
+        Args:
+            optimizer (Optimizer): The Optimizer running the optimization.
+        """
+
+    def on_phase(self, optimizer: Any, phase: str, seconds: float) -> None:
+        """
+        Called when a phase of the optimization completes.
+
+        Args:
+            optimizer (Optimizer): The Optimizer running the optimization.
+            phase (str): The phase name, e.g. 'prepare', 'canonicalization' or 'solver'.
+            seconds (float): The time spent in the phase, in seconds.
+        """
+
+    def on_result(self, optimizer: Any, result: Any) -> None:
+        """
+        Called when an optimization completes.
+
+        Args:
+            optimizer (Optimizer): The Optimizer running the optimization.
+            result (OptimizationResult): The result of the optimization.
+        """
+
+
+class CallbackHook(OptimizerHook):
+    def __init__(self, on_phase: Optional[Callable[[str, float], None]] = None, on_result: Optional[Callable[[Any], None]] = None) -> None:
+        """
+        Initializes the CallbackHook with plain callables.
+
+        Args:
+            on_phase (Optional[Callable[[str, float], None]]): Called with the phase name and its duration in seconds.
+            on_result (Optional[Callable[[OptimizationResult], None]]): Called with the result of every optimization.
+        """
+        self._on_phase = on_phase
+        self._on_result = on_result
+
+    def on_phase(self, optimizer: Any, phase: str, seconds: float) -> None:
+        """
+        Forwards the phase duration to the callback.
+
+        Args:
+            optimizer (Optimizer): The Optimizer running the optimization.
+            phase (str): The phase name.
+            seconds (float): The time spent in the phase, in seconds.
+        """
+        if self._on_phase is not None:
+            self._on_phase(phase, seconds)
+
+    def on_result(self, optimizer: Any, result: Any) -> None:
+        """
+        Forwards the result to the callback.
+
+        Args:
+            optimizer (Optimizer): The Optimizer running the optimization.
+            result (OptimizationResult): The result of the optimization.
+        """
+        if self._on_result is not None:
+            self._on_result(result)
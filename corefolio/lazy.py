@@ -0,0 +1,54 @@
+"""This module contains the LazyModule class, which defers the import of heavy dependencies until they are used,
+and the lazy cvxpy module shared by corefolio."""
+
+import importlib
+from types import ModuleType
+from typing import Any, List
+
+
+class LazyModule:
+    def __init__(self, name: str) -> None:
+        """
+        Initializes a LazyModule, a stand-in for a module that is imported on first attribute access.
+
+        Args:
+            name (str): The module name, e.g. 'cvxpy'.
+        """
+        self._name = name
+
+    def _load(self) -> ModuleType:
+        """
+        Imports the module, which is only done once by the import system.
+
+        Returns:
+            ModuleType: The module.
+        """
+        return importlib.import_module(self._name)
+
+    def __getattr__(self, attribute: str) -> Any:
+        """
+        Returns an attribute of the module, importing it if needed.
+
+        Args:
+            attribute (str): The attribute name.
+
+        Returns:
+            Any: The attribute.
+        """
+        return getattr(self._load(), attribute)
+
+    def __dir__(self) -> List[str]:
+        """
+        Returns the attributes of the module, importing it if needed.
+
+        Returns:
+            List[str]: The attribute names.
+        """
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        return f"LazyModule({self._name!r})"
+
+
+# cvxpy is imported when a problem is first built, so that importing corefolio stays fast
+cp = LazyModule("cvxpy")
@@ -1,15 +1,106 @@
 """This module contains the Optimizer class, which is responsible for optimizing the portfolio."""
 
-import cvxpy as cp
+from __future__ import annotations
+
+import time
+import warnings
+from concurrent.futures import Executor
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
-from corefolio.constraint import Constraint
+from corefolio.asynchronous import run_async
+from corefolio.batch import Scenario, run_scenarios
+from corefolio.cache import ResultCache, _array_digest, result_key
+from corefolio.constraint import Constraint, LinearRows, MaxAssetsConstraint, ParameterUpdater
+from corefolio.decomposition import run_decomposition
+from corefolio.feasibility import find_conflict
+from corefolio.hooks import OptimizerHook
+from corefolio.heuristic import build_ratio_rows, solve_greedy
+from corefolio.lazy import cp
+from corefolio.presolve import Reduction, presolve
+from corefolio.problem_store import ARTIFACT_SOLVER, ProblemStore, problem_key
+from corefolio.result import OptimizationResult
+from corefolio.solver import SolverOptions, TimeLimitReached
+from corefolio.sweep import ParameterKey, SweepPoint, run_sweep
 from corefolio.universe import Universe
+from corefolio.weights import WeightOptions
+
+# Solver whose CVXPY interface passes the variable values as a MIP start
+WARM_START_SOLVER = "GUROBI"
+
+# Assets whose weight is below this value are not selected in the weighted mode
+WEIGHT_TOLERANCE = 1e-6
+
+
+class _PhaseTimer:
+    def __init__(self, optimizer: "Optimizer") -> None:
+        """
+        Initializes the timer recording the duration of the phases of an optimization.
+
+        Args:
+            optimizer (Optimizer): The Optimizer whose hooks are notified of every phase.
+        """
+        self._optimizer = optimizer
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block as a phase.
+
+        Args:
+            name (str): The phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Records the duration of a phase and notifies the hooks.
+
+        Args:
+            name (str): The phase name.
+            seconds (float): The time spent in the phase, in seconds.
+        """
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for hook in self._optimizer.hooks:
+            hook.on_phase(self._optimizer, name, seconds)
+
+
+class _CompiledProblem:
+    def __init__(self, key: Hashable, problem: cp.Problem, variables: cp.Variable, updaters: List[ParameterUpdater]) -> None:
+        """
+        Initializes a compiled problem whose scalar constraint parameters and bounds are cp.Parameter objects.
+
+        Args:
+            key (Hashable): The structure key the problem was built for.
+            problem (cp.Problem): The parameterized problem.
+            variables (cp.Variable): The decision variables.
+            updaters (List[ParameterUpdater]): The constraint parameter updaters.
+        """
+        self.key = key
+        self.problem = problem
+        self.variables = variables
+        self.updaters = updaters
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Refreshes the parameter values from the current constraint configuration.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+        """
+        for updater in self.updaters:
+            updater(df)
 
 
 class Optimizer:
-    def __init__(self, universe: Universe, constraints: List[Constraint], sense: str = "maximize", target_column: str = "value") -> None:
+    def __init__(self, universe: Universe, constraints: List[Constraint], sense: str = "maximize", target_column: str = "value", compiled: bool = False, method: str = "mip", solver_options: Optional[SolverOptions] = None, hooks: Optional[List[OptimizerHook]] = None, weight_options: Optional[WeightOptions] = None, presolve: bool = False, result_cache: Optional[ResultCache] = None, problem_store: Optional[ProblemStore] = None, feasibility_check: bool = False) -> None:
         """
         Initializes the Optimizer with a Universe, Constraints, optimization sense, and target column.
 
@@ -18,14 +109,78 @@ class Optimizer:
             constraints (List[Constraint]): The list of Constraints to apply during optimization.
             sense (str): The optimization sense, either 'maximize' or 'minimize'.
             target_column (str): The column name to be used for the optimization target.
+            compiled (bool): Whether to build the problem once with cp.Parameter objects for the scalar constraint
+                parameters and bounds, and only update the parameter values on subsequent calls with the same data.
+            method (str): The solving method: 'mip' solves the boolean problem with CVXPY, 'greedy' uses
+                the NumPy heuristic engine and 'auto' uses the heuristic engine for pure top-k problems,
+                which it solves exactly, and the MIP otherwise.
+            solver_options (Optional[SolverOptions]): The solver name, limits and fallback solvers used for the MIP.
+            hooks (Optional[List[OptimizerHook]]): The hooks notified of the phases and results of the optimizations.
+            weight_options (Optional[WeightOptions]): Switches to the weighted mode, which optimizes long-only,
+                fully invested continuous weights with an optional risk penalty instead of a boolean selection.
+                Cardinality constraints apply to a boolean selection linked to the weights. Weighted problems
+                are solved with the 'mip' method and rebuilt on every call.
+            presolve (bool): Whether to remove the assets that an optimal selection does not need and the redundant
+                rows before building the MIP, see corefolio.presolve. It applies to non-compiled boolean problems
+                whose constraints all support the heuristic engine, the other problems are built in full.
+            result_cache (Optional[ResultCache]): The cache returning the stored result of a problem with the same
+                data and configuration instead of solving it again. Warm-started solves, the weighted mode and
+                constraints without a cache key bypass the cache.
+            problem_store (Optional[ProblemStore]): The on-disk store of canonicalized compiled problems, shared by
+                processes: a compiled boolean problem is canonicalized once per structure, exported to the store and
+                solved from its stored data with scipy.optimize.milp, see corefolio.problem_store. The other
+                problems, and all problems when a solver other than SCIPY is configured, are solved without the store.
+            feasibility_check (bool): Whether to check the constraints of boolean problems for conflicts before
+                solving, see corefolio.feasibility. When no nonempty selection can satisfy them, the result has the
+                'infeasible' status and lists a minimal subset of conflicting constraints instead of solving.
 
         Raises:
-            ValueError: If the sense is not 'maximize' or 'minimize'.
+            ValueError: If the sense is not 'maximize' or 'minimize', the method is not supported,
+                or the greedy method is used in the weighted mode.
         """
         self.universe = universe
         self.constraints = constraints
         self.sense = self._parse_sense(sense)
         self.target_column = target_column
+        self.compiled = compiled
+        self.method = self._parse_method(method)
+        self.solver_options = solver_options or SolverOptions()
+        self.hooks = list(hooks or [])
+        self.weight_options = weight_options
+        self.presolve = presolve
+        self.result_cache = result_cache
+        self.problem_store = problem_store
+        self.feasibility_check = feasibility_check
+        if weight_options is not None and self.method == "greedy":
+            raise ValueError(
+                "The greedy method does not support the weighted mode.")
+        self._compiled_problem: Optional[_CompiledProblem] = None
+
+    def __getstate__(self) -> dict:
+        """
+        Returns the state used to pickle and copy the Optimizer, without the compiled problem.
+
+        Returns:
+            dict: The Optimizer state.
+        """
+        state = self.__dict__.copy()
+        # Compiled problems are rebuilt lazily by the copies
+        state["_compiled_problem"] = None
+        return state
+
+    @property
+    def required_columns(self) -> List[str]:
+        """
+        Returns the Universe columns read by the optimization: the ID column, the target column
+        and the columns of the constraints.
+
+        Returns:
+            List[str]: The column names, without duplicates.
+        """
+        names = [self.universe.id_column, self.target_column]
+        for constraint in self.constraints:
+            names.extend(constraint.columns)
+        return list(dict.fromkeys(names))
 
     def _parse_sense(self, sense: str) -> int:
         """
@@ -46,6 +201,24 @@ class Optimizer:
                 "Invalid sense value. Choose 'maximize' or 'minimize'.")
         return sense_map[sense]
 
+    def _parse_method(self, method: str) -> str:
+        """
+        Parses the solving method.
+
+        Args:
+            method (str): The solving method, either 'mip', 'greedy' or 'auto'.
+
+        Returns:
+            str: The parsed method.
+
+        Raises:
+            ValueError: If the method is not 'mip', 'greedy' or 'auto'.
+        """
+        if method not in ["mip", "greedy", "auto"]:
+            raise ValueError(
+                "Invalid method value. Choose 'mip', 'greedy' or 'auto'.")
+        return method
+
     def _create_decision_variables(self, num_assets: int) -> cp.Variable:
         """
         Creates decision variables for the optimization problem.
@@ -58,12 +231,12 @@ class Optimizer:
         """
         return cp.Variable(num_assets, boolean=True)
 
-    def _create_objective(self, values: pd.Series, x: cp.Variable) -> cp.Maximize:
+    def _create_objective(self, values: Union[np.ndarray, cp.Parameter], x: cp.Variable) -> cp.Maximize:
         """
         Creates the objective function for the optimization problem.
 
         Args:
-            values (pd.Series): The asset values.
+            values (Union[np.ndarray, cp.Parameter]): The asset values.
             x (cp.Variable): The decision variables.
 
         Returns:
@@ -71,36 +244,841 @@ class Optimizer:
         """
         return cp.Maximize(self.sense * values @ x)
 
-    def optimize(self) -> List[int]:
+    def _structure_key(self, df: pd.DataFrame, values: np.ndarray) -> Optional[Hashable]:
         """
-        Optimizes the portfolio based on the given Universe and Constraints.
+        Returns the key identifying the structure of the problem built from the given data.
+
+        The per-asset data are constants of the compiled problem, so the key includes a digest of the asset values
+        and the constraint structure keys include a digest of the columns they read.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
 
         Returns:
-            List[int]: The list of selected asset IDs.
+            Optional[Hashable]: The structure key, or None if a constraint is not parameterized.
+        """
+        constraint_keys = []
+        for constraint in self.constraints:
+            constraint_key = constraint.structure_key(df)
+            if constraint_key is None:
+                return None
+            # The parameter updaters read from the constraint instances themselves
+            constraint_keys.append((id(constraint), constraint_key))
+        return (df.shape, tuple(df.columns), self.sense, _array_digest(values), tuple(constraint_keys))
+
+    def _compile_problem(self, key: Hashable, df: pd.DataFrame, values: np.ndarray, timer: _PhaseTimer) -> _CompiledProblem:
+        """
+        Builds the optimization problem with cp.Parameter objects for the scalar constraint parameters and bounds.
+
+        The asset values and the columns are constants: a parameter per asset multiplying the decision variables
+        makes the canonicalization quadratic in the number of assets. The constraints are applied one by one with
+        apply_parameterized_constraint and their linear rows are not stacked.
+
+        Args:
+            key (Hashable): The structure key of the problem.
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            _CompiledProblem: The compiled problem.
+        """
+        with timer.phase("variables"):
+            x = self._create_decision_variables(len(df))
+        with timer.phase("objective"):
+            objective = self._create_objective(values, x)
+
+        constraints = []
+        updaters = []
+        for index, constraint in enumerate(self.constraints):
+            with timer.phase(self._constraint_phase(index, constraint)):
+                applied_constraints, updater = constraint.apply_parameterized_constraint(
+                    x, df)
+            constraints.extend(applied_constraints)
+            updaters.append(updater)
+
+        with timer.phase("problem"):
+            problem = cp.Problem(objective, constraints)
+        return _CompiledProblem(key, problem, x, updaters)
+
+    def _get_compiled_problem(self, df: pd.DataFrame, values: np.ndarray, timer: _PhaseTimer) -> Optional[_CompiledProblem]:
+        """
+        Returns the cached compiled problem updated with the current data, compiling it if needed.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            Optional[_CompiledProblem]: The compiled problem, or None if a constraint is not parameterized.
         """
-        df = self.universe.to_dataframe()
-        ids = df[self.universe.id_column].tolist()
-        values = df[self.target_column].values
+        key = self._structure_key(df, values)
+        if key is None:
+            self._compiled_problem = None
+            return None
+        if self._compiled_problem is None or self._compiled_problem.key != key:
+            self._compiled_problem = self._compile_problem(
+                key, df, values, timer)
+        else:
+            with timer.phase("update_parameters"):
+                self._compiled_problem.update(df)
+        return self._compiled_problem
 
+    def _constraint_phase(self, index: int, constraint: Constraint) -> str:
+        """
+        Returns the name of the phase applying a constraint.
+
+        Args:
+            index (int): The position of the constraint.
+            constraint (Constraint): The constraint.
+
+        Returns:
+            str: The phase name.
+        """
+        return f"constraint:{index}:{type(constraint).__name__}"
+
+    def _apply_constraints(self, indexed_constraints: List[Tuple[int, Constraint]], variables: cp.Variable, df: pd.DataFrame, timer: _PhaseTimer) -> List[cp.Constraint]:
+        """
+        Applies constraints to the decision variables, stacking the linear rows of the constraints
+        supporting them into a single block.
+
+        Args:
+            indexed_constraints (List[Tuple[int, Constraint]]): The constraints and their positions.
+            variables (cp.Variable): The decision variables.
+            df (pd.DataFrame): The DataFrame containing asset data.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            List[cp.Constraint]: The list of constraints.
+        """
+        constraints = []
+        rows = []
+        for index, constraint in indexed_constraints:
+            with timer.phase(self._constraint_phase(index, constraint)):
+                constraint_rows = constraint.linear_rows(df)
+                if constraint_rows is None:
+                    constraints.extend(
+                        constraint.apply_constraint(variables, df))
+                else:
+                    rows.append(constraint_rows)
+        if rows:
+            with timer.phase("stack_rows"):
+                constraints.extend(LinearRows.stack(rows).apply(variables))
+        return constraints
+
+    def _build_problem(self, df: pd.DataFrame, values: np.ndarray, timer: _PhaseTimer) -> Tuple[cp.Problem, cp.Variable]:
+        """
+        Builds the optimization problem, reusing the compiled problem when enabled.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            Tuple[cp.Problem, cp.Variable]: The problem and its decision variables.
+        """
+        if self.weight_options is not None:
+            return self._build_weighted_problem(df, values, timer)
+
+        if self.compiled:
+            compiled_problem = self._get_compiled_problem(df, values, timer)
+            if compiled_problem is not None:
+                return compiled_problem.problem, compiled_problem.variables
+        return self._build_constant_problem(df, values, timer)
+
+    def _build_constant_problem(self, df: pd.DataFrame, values: np.ndarray, timer: _PhaseTimer) -> Tuple[cp.Problem, cp.Variable]:
+        """
+        Builds the optimization problem with the data as constants, without parameters.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            Tuple[cp.Problem, cp.Variable]: The problem and its decision variables.
+        """
         # Define decision variables
-        x = self._create_decision_variables(len(ids))
+        with timer.phase("variables"):
+            x = self._create_decision_variables(len(df))
 
         # Define objective
-        objective = self._create_objective(values, x)
+        with timer.phase("objective"):
+            objective = self._create_objective(values, x)
 
         # Define constraints
-        constraints = []
-        for constraint in self.constraints:
-            constraints.extend(constraint.apply_constraint(x, df))
+        constraints = self._apply_constraints(
+            list(enumerate(self.constraints)), x, df, timer)
+
+        with timer.phase("problem"):
+            problem = cp.Problem(objective, constraints)
+        return problem, x
+
+    def _presolve(self, df: pd.DataFrame, values: np.ndarray) -> Optional[Reduction]:
+        """
+        Runs the presolve stage on the rows of the constraints.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
+
+        Returns:
+            Optional[Reduction]: The reduced problem, or None if a constraint is not supported by the heuristic engine.
+        """
+        try:
+            rows = build_ratio_rows(self.constraints, df)
+        except NotImplementedError:
+            return None
+        return presolve(self.sense * values, rows)
+
+    def _build_reduced_problem(self, reduction: Reduction, values: np.ndarray, timer: _PhaseTimer) -> Tuple[cp.Problem, cp.Variable]:
+        """
+        Builds the optimization problem over the assets kept by the presolve stage.
+
+        Args:
+            reduction (Reduction): The reduced problem.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            Tuple[cp.Problem, cp.Variable]: The problem and its decision variables, one per kept asset.
+        """
+        with timer.phase("variables"):
+            x = self._create_decision_variables(len(reduction.kept))
+        with timer.phase("objective"):
+            objective = self._create_objective(values[reduction.kept], x)
+        with timer.phase("stack_rows"):
+            constraints = reduction.rows.linear_rows().apply(x)
+        with timer.phase("problem"):
+            problem = cp.Problem(objective, constraints)
+        return problem, x
+
+    def _build_weighted_problem(self, df: pd.DataFrame, values: np.ndarray, timer: _PhaseTimer) -> Tuple[cp.Problem, cp.Variable]:
+        """
+        Builds the weighted problem: long-only weights summing to one, the risk penalty of the risk model,
+        and a boolean selection linked to the weights by big-M constraints when a constraint is a cardinality one.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            Tuple[cp.Problem, cp.Variable]: The problem and its weights.
+
+        Raises:
+            ValueError: If the risk model does not have one row per asset.
+        """
+        options = self.weight_options
+        with timer.phase("variables"):
+            w = cp.Variable(len(df), nonneg=True)
+            z = None
+            if any(constraint.cardinality for constraint in self.constraints):
+                z = self._create_decision_variables(len(df))
+
+        with timer.phase("objective"):
+            constraints = [cp.sum(w) == 1]
+            if z is not None:
+                constraints.append(w <= options.max_weight * z)
+            elif options.max_weight < 1:
+                constraints.append(w <= options.max_weight)
+            objective = self.sense * (values @ w)
+            if options.risk_model is not None:
+                if options.risk_model.num_assets != len(df):
+                    raise ValueError(
+                        "The risk model must have one row per asset of the Universe.")
+                variance, risk_constraints = options.risk_model.risk(w)
+                objective = objective - options.risk_aversion * variance
+                constraints.extend(risk_constraints)
+
+        indexed_constraints = list(enumerate(self.constraints))
+        constraints.extend(self._apply_constraints(
+            [(index, constraint) for index, constraint in indexed_constraints if not constraint.cardinality], w, df, timer))
+        if z is not None:
+            constraints.extend(self._apply_constraints(
+                [(index, constraint) for index, constraint in indexed_constraints if constraint.cardinality], z, df, timer))
+
+        with timer.phase("problem"):
+            problem = cp.Problem(cp.Maximize(objective), constraints)
+        return problem, w
+
+    def solve(self) -> OptimizationResult:
+        """
+        Optimizes the portfolio and returns the detailed result.
+
+        Returns:
+            OptimizationResult: The selected asset IDs, solver status and objective value.
+        """
+        return self._solve()
+
+    def _solve(self, initial_ids: Optional[Iterable[Any]] = None) -> OptimizationResult:
+        """
+        Optimizes the portfolio, optionally warm-starting from a selection of asset IDs, and notifies the hooks.
+
+        Args:
+            initial_ids (Optional[Iterable[Any]]): The asset IDs of the warm start selection.
+
+        Returns:
+            OptimizationResult: The selected asset IDs, solver status, objective value and timings.
+        """
+        start = time.perf_counter()
+        for hook in self.hooks:
+            hook.on_start(self)
+        timer = _PhaseTimer(self)
+        key = None
+        result = None
+        if self.result_cache is not None and initial_ids is None:
+            with timer.phase("cache"):
+                key = result_key(self)
+                result = self.result_cache.get(key) if key is not None else None
+        if result is not None:
+            result.cached = True
+        else:
+            result = self._run(timer, initial_ids)
+            if key is not None and result.status != "error":
+                self.result_cache.put(key, result)
+        result.timings = timer.timings
+        result.wall_time = time.perf_counter() - start
+        for hook in self.hooks:
+            hook.on_result(self, result)
+        return result
+
+    def _run(self, timer: _PhaseTimer, initial_ids: Optional[Iterable[Any]] = None) -> OptimizationResult:
+        """
+        Runs the phases of the optimization.
+
+        Args:
+            timer (_PhaseTimer): The timer of the optimization.
+            initial_ids (Optional[Iterable[Any]]): The asset IDs of the warm start selection.
+
+        Returns:
+            OptimizationResult: The selected asset IDs, solver status and objective value.
+        """
+        with timer.phase("prepare"):
+            df = self.universe.frame
+            id_values = self.universe.column(self.universe.id_column)
+            ids = id_values.tolist()
+            values = np.asarray(self.universe.column(
+                self.target_column), dtype=float)
+            initial = None
+            # Warm starts are boolean selections, which do not apply to weights
+            if initial_ids is not None and self.weight_options is None:
+                initial = np.isin(id_values, list(initial_ids))
+                if not self._is_feasible_selection(df, initial):
+                    initial = None
+
+        if self.feasibility_check and self.weight_options is None:
+            with timer.phase("feasibility"):
+                conflict = find_conflict(self.constraints, df)
+            if conflict is not None:
+                return OptimizationResult([], "infeasible", conflicting_constraints=conflict)
+
+        if self.weight_options is None and (self.method == "greedy" or (self.method == "auto" and self._is_top_k())):
+            return self._solve_heuristic(df, ids, values, timer, initial)
+
+        reduction = None
+        if self.presolve and self.weight_options is None and not self.compiled:
+            with timer.phase("presolve"):
+                reduction = self._presolve(df, values)
+        if reduction is None:
+            problem, x = self._build_problem(df, values, timer)
+            positions = np.arange(len(ids))
+        else:
+            positions = reduction.kept
+            if reduction.is_top_k or not len(positions):
+                # The presolve solved the problem, the kept assets are the optimal selection
+                with timer.phase("extract"):
+                    return OptimizationResult([ids[i] for i in positions], "optimal", float(values[positions].sum()), method="mip",
+                                              gap=0.0, removed_variables=len(ids) - len(positions), removed_rows=reduction.removed_rows)
+            problem, x = self._build_reduced_problem(reduction, values, timer)
+            if initial is not None:
+                # A warm start selecting a removed asset does not belong to the reduced problem
+                initial = initial[positions] if initial.sum() == initial[positions].sum() else None
 
         # Solve problem
-        problem = cp.Problem(objective, constraints)
-        problem.solve()
+        try:
+            if reduction is None:
+                result = self._solve_stored(problem, x, ids, values, timer)
+                if result is not None:
+                    return result
+            solver, warm_start = self._timed_solve(problem, x, timer, initial)
+        except TimeLimitReached as error:
+            if self.weight_options is not None:
+                raise cp.SolverError(str(error)) from None
+            # No incumbent was found within the time limit, the heuristic selection is the best available
+            try:
+                return self._solve_heuristic(df, ids, values, timer, initial)
+            except NotImplementedError:
+                raise cp.SolverError(str(error)) from None
 
         # Get results
-        if problem.status in ["infeasible", "infeasible_inaccurate"]:
-            return []
+        with timer.phase("extract"):
+            removed = {} if reduction is None else {
+                "removed_variables": len(ids) - len(positions), "removed_rows": reduction.removed_rows}
+            if problem.status in ["infeasible", "infeasible_inaccurate"] or x.value is None:
+                return OptimizationResult([], problem.status, method="mip", solver=solver, **removed)
+
+            if self.weight_options is not None:
+                return self._weighted_result(ids, values, x.value, problem, solver)
+
+            # With a time limit, the solution is the best incumbent found
+            selected = positions[x.value > 0.5]
+            selected_ids = [ids[i] for i in selected]
+
+            return OptimizationResult(selected_ids, problem.status, float(values[selected].sum()), method="mip", gap=self._mip_gap(problem), warm_start=warm_start, solver=solver, **removed)
+
+    def _solve_stored(self, problem: cp.Problem, x: cp.Variable, ids: List[Any], values: np.ndarray, timer: _PhaseTimer) -> Optional[OptimizationResult]:
+        """
+        Solves the compiled problem from the data stored in the problem store, exporting it first if needed.
+
+        Args:
+            problem (cp.Problem): The problem to solve.
+            x (cp.Variable): The decision variables.
+            ids (List[Any]): The asset IDs.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+
+        Returns:
+            Optional[OptimizationResult]: The result, or None if the problem is not a compiled problem with a store,
+            another solver than ARTIFACT_SOLVER is configured, or ARTIFACT_SOLVER failed and fallback solvers are configured.
+
+        Raises:
+            TimeLimitReached: If no solution was found within the time limit.
+            cp.SolverError: If the solver fails.
+        """
+        if self.problem_store is None or self._compiled_problem is None or self._compiled_problem.problem is not problem:
+            return None
+        chain = self._solver_chain(problem)
+        if chain[0] != ARTIFACT_SOLVER:
+            warnings.warn(f"The problem store solves with {ARTIFACT_SOLVER}, the problem is solved with "
+                          f"{chain[0] or 'the default solver'} without the store.")
+            return None
+        with timer.phase("artifact"):
+            key = problem_key(self, self.universe.frame)
+            artifact = self.problem_store.get(key, problem, ids)
+        if artifact is None:
+            with timer.phase("canonicalization"):
+                artifact = self.problem_store.put(key, problem, x, ids)
+        with timer.phase("solver"):
+            try:
+                status, solution, gap = artifact.solve([parameter.value for parameter in problem.parameters()], self.solver_options)
+            except cp.SolverError:
+                if len(chain) == 1:
+                    raise
+                # The fallback solvers are tried through CVXPY
+                return None
+
+        with timer.phase("extract"):
+            if solution is None:
+                return OptimizationResult([], status, method="mip", solver=ARTIFACT_SOLVER)
+            selected = np.flatnonzero(solution > 0.5)
+            return OptimizationResult([ids[i] for i in selected], status, float(values[selected].sum()), method="mip", gap=gap, solver=ARTIFACT_SOLVER)
+
+    def _weighted_result(self, ids: List[Any], values: np.ndarray, weights: np.ndarray, problem: cp.Problem, solver: Optional[str]) -> OptimizationResult:
+        """
+        Creates the result of a weighted problem.
+
+        Args:
+            ids (List[Any]): The asset IDs.
+            values (np.ndarray): The asset values.
+            weights (np.ndarray): The optimal weights.
+            problem (cp.Problem): The solved problem.
+            solver (Optional[str]): The name of the solver used.
+
+        Returns:
+            OptimizationResult: The result, with the weights and the portfolio variance.
+        """
+        weights = np.clip(weights, 0.0, None)
+        selected = np.flatnonzero(weights > WEIGHT_TOLERANCE)
+        risk_model = self.weight_options.risk_model
+        return OptimizationResult(
+            [ids[i] for i in selected], problem.status, float(values @ weights), method="mip",
+            gap=self._mip_gap(problem), solver=solver, weights={ids[i]: float(weights[i]) for i in selected},
+            risk=risk_model.variance(weights) if risk_model is not None else None)
+
+    def _solver_chain(self, problem: cp.Problem) -> List[Optional[str]]:
+        """
+        Returns the solvers to try for a problem, in order. None stands for the CVXPY default solver.
+
+        Without a configured solver, the mixed-integer problems of an Optimizer with a problem store are solved
+        with ARTIFACT_SOLVER, the solver of the stored problems, whether the store is used or not.
+
+        Args:
+            problem (cp.Problem): The problem to solve.
+
+        Returns:
+            List[Optional[str]]: The solver names.
+
+        Raises:
+            cp.SolverError: If none of the requested solvers is installed.
+        """
+        chain = self.solver_options.solver_chain(problem.is_mixed_integer())
+        if chain == [None] and self.problem_store is not None and problem.is_mixed_integer() and ARTIFACT_SOLVER in cp.installed_solvers():
+            return [ARTIFACT_SOLVER]
+        return chain
+
+    def _solve_problem(self, problem: cp.Problem, x: cp.Variable, initial: Optional[np.ndarray] = None) -> Tuple[Optional[str], bool]:
+        """
+        Solves the problem with the configured solvers, trying the fallback solvers when a solver fails.
+
+        Args:
+            problem (cp.Problem): The problem to solve.
+            x (cp.Variable): The decision variables.
+            initial (Optional[np.ndarray]): A feasible selection mask used as a warm start.
+
+        Returns:
+            Tuple[Optional[str], bool]: The name of the solver used and whether it was warm-started.
+
+        Raises:
+            TimeLimitReached: If a solver reaches the time limit without a solution, the other solvers are not tried.
+            cp.SolverError: If all the solvers fail.
+        """
+        chain = self._solver_chain(problem)
+        if initial is not None and chain == [None] and WARM_START_SOLVER in cp.installed_solvers():
+            chain = [WARM_START_SOLVER, None]
+
+        errors = []
+        for solver in chain:
+            warm_start = initial is not None and solver == WARM_START_SOLVER
+            if warm_start:
+                x.value = initial.astype(float)
+            start = time.perf_counter()
+            try:
+                problem.solve(solver=solver, warm_start=warm_start,
+                              **self.solver_options.solve_kwargs(solver))
+            except cp.SolverError as error:
+                # The interfaces report a time limit without a solution as a solver failure
+                if self.solver_options.reached_time_limit(time.perf_counter() - start):
+                    raise TimeLimitReached(f"{solver or 'default'}: {error}") from error
+                errors.append(f"{solver or 'default'}: {error}")
+                continue
+            if problem.status == "user_limit" and x.value is None:
+                raise TimeLimitReached(f"{problem.solver_stats.solver_name}: no solution was found within the limits.")
+            return problem.solver_stats.solver_name, warm_start
+        raise cp.SolverError("All solvers failed. " + " ".join(errors))
+
+    def _timed_solve(self, problem: cp.Problem, x: cp.Variable, timer: _PhaseTimer, initial: Optional[np.ndarray] = None) -> Tuple[Optional[str], bool]:
+        """
+        Solves the problem, recording the canonicalization and solver phases.
+
+        Args:
+            problem (cp.Problem): The problem to solve.
+            x (cp.Variable): The decision variables.
+            timer (_PhaseTimer): The timer of the optimization.
+            initial (Optional[np.ndarray]): A selection mask used as a warm start.
 
-        selected_ids = [ids[i] for i in range(len(ids)) if x.value[i] > 0.5]
+        Returns:
+            Tuple[Optional[str], bool]: The name of the solver used and whether it was warm-started.
+
+        Raises:
+            TimeLimitReached: If a solver reaches the time limit without a solution.
+            cp.SolverError: If all the solvers fail.
+        """
+        solve_start = time.perf_counter()
+        solver, warm_start = self._solve_problem(problem, x, initial)
+        solve_time = time.perf_counter() - solve_start
+        canonicalization_time = min(problem.compilation_time or 0.0, solve_time)
+        timer.record("canonicalization", canonicalization_time)
+        timer.record("solver", solve_time - canonicalization_time)
+        return solver, warm_start
+
+    def _mip_gap(self, problem: cp.Problem) -> Optional[float]:
+        """
+        Returns the relative MIP gap reported by the solver, if available.
+
+        Args:
+            problem (cp.Problem): The solved problem.
 
-        return selected_ids
+        Returns:
+            Optional[float]: The relative MIP gap.
+        """
+        extra_stats = problem.solver_stats.extra_stats if problem.solver_stats else None
+        if extra_stats is None:
+            return None
+        for name in ["mip_gap", "MIPGap"]:
+            try:
+                gap = extra_stats[name] if isinstance(
+                    extra_stats, dict) else getattr(extra_stats, name)
+            except (AttributeError, KeyError):
+                continue
+            if gap is not None:
+                return float(gap)
+        return None
+
+    def _is_feasible_selection(self, df: pd.DataFrame, selected: np.ndarray) -> bool:
+        """
+        Returns whether a selection satisfies all the constraints.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            selected (np.ndarray): The boolean selection mask.
+
+        Returns:
+            bool: True if the selection is feasible.
+        """
+        try:
+            return build_ratio_rows(self.constraints, df).is_feasible(selected)
+        except NotImplementedError:
+            pass
+        x = cp.Variable(len(selected))
+        x.value = selected.astype(float)
+        try:
+            return all(applied_constraint.value()
+                       for constraint in self.constraints
+                       for applied_constraint in constraint.apply_constraint(x, df))
+        except ValueError:
+            # A constraint depends on auxiliary variables, whose values are unknown
+            return False
+
+    def _is_top_k(self) -> bool:
+        """
+        Returns whether the problem is a pure top-k problem, i.e. only has MaxAssetsConstraint constraints.
+
+        Returns:
+            bool: True if the problem is a pure top-k problem.
+        """
+        return all(isinstance(constraint, MaxAssetsConstraint) for constraint in self.constraints)
+
+    def _solve_heuristic(self, df: pd.DataFrame, ids: List[int], values: np.ndarray, timer: _PhaseTimer, initial: Optional[np.ndarray] = None) -> OptimizationResult:
+        """
+        Solves the problem with the NumPy heuristic engine, without building a CVXPY problem.
+
+        Args:
+            df (pd.DataFrame): The DataFrame containing asset data.
+            ids (List[int]): The asset IDs.
+            values (np.ndarray): The asset values.
+            timer (_PhaseTimer): The timer of the optimization.
+            initial (Optional[np.ndarray]): A feasible selection mask used as the initial incumbent.
+
+        Returns:
+            OptimizationResult: The result, with the optimality gap against the LP relaxation bound.
+        """
+        scores = self.sense * values
+        with timer.phase("heuristic_rows"):
+            rows = build_ratio_rows(self.constraints, df)
+        with timer.phase("heuristic"):
+            selected, bound = solve_greedy(scores, rows, initial=initial)
+
+        with timer.phase("extract"):
+            objective = float(scores[selected].sum())
+            gap = max(bound - objective, 0.0) / max(abs(bound), 1e-12)
+            status = "optimal" if gap <= 1e-9 else "feasible"
+            selected_ids = [ids[i] for i in np.flatnonzero(selected)]
+
+            return OptimizationResult(selected_ids, status, float(values[selected].sum()), method="greedy", gap=gap, warm_start=initial is not None)
+
+    def optimize(self) -> List[int]:
+        """
+        Optimizes the portfolio based on the given Universe and Constraints.
+
+        Returns:
+            List[int]: The list of selected asset IDs.
+        """
+        return self.solve().selected_ids
+
+    async def optimize_async(self, executor: Optional[Executor] = None, timeout: Optional[float] = None, coalesce: bool = True) -> OptimizationResult:
+        """
+        Optimizes the portfolio in an executor without blocking the event loop.
+
+        A copy of the Optimizer is built and solved in the executor, so compiled problems are not reused across
+        calls. Concurrent calls with the same data and configuration share a single solve, see
+        corefolio.asynchronous.run_async. With a process executor, the hooks are notified of the result only.
+
+        Args:
+            executor (Optional[Executor]): The thread or process executor, defaults to the default executor of the loop.
+            timeout (Optional[float]): The time to wait for the result, in seconds. Waits indefinitely if None.
+            coalesce (bool): Whether to share the solve with concurrent identical calls.
+
+        Returns:
+            OptimizationResult: The selected asset IDs, solver status, objective value and timings.
+
+        Raises:
+            asyncio.TimeoutError: If the result is not available within the timeout.
+        """
+        return await run_async(self, executor, timeout, coalesce)
+
+    def reoptimize(self, previous_selection: Union[OptimizationResult, Iterable[Any]], updated_universe: Optional[Universe] = None) -> OptimizationResult:
+        """
+        Re-optimizes the portfolio after a Universe update, warm-starting from the previous selection.
+
+        The previous selection is matched to the updated Universe by ID: delisted assets are dropped and
+        new assets start unselected. The warm start is only used if it satisfies the constraints, and
+        for the MIP if a solver accepting initial values is installed, otherwise the problem is solved cold.
+        For the MIP, result.warm_start means that the selection was passed as a MIP start to such a solver
+        (WARM_START_SOLVER), for the greedy method that it seeded the heuristic search.
+
+        Args:
+            previous_selection (Union[OptimizationResult, Iterable[Any]]): The previous result or selected asset IDs.
+            updated_universe (Optional[Universe]): The updated Universe, which replaces the current one.
+
+        Returns:
+            OptimizationResult: The result, recording whether the warm start was used.
+        """
+        if isinstance(previous_selection, OptimizationResult):
+            previous_selection = previous_selection.selected_ids
+        if updated_universe is not None:
+            self.universe = updated_universe
+        return self._solve(initial_ids=previous_selection)
+
+    def optimize_pool(self, k: int, min_hamming_distance: int = 1) -> List[OptimizationResult]:
+        """
+        Optimizes the portfolio k times, returning the best selection and the best alternatives to it.
+
+        The problem is built once, with the data as constants even for a compiled Optimizer, and k - 1 cut rows
+        C @ x >= d whose coefficients are parameters, zero until used. After every solve, the next row becomes a
+        cut excluding the selections within the minimum Hamming distance of the new solution, i.e. differing from
+        it by fewer assets added or removed, so that the problem is canonicalized once and only the parameter
+        values change between the solves. With a distance of 1, the cuts only exclude the previous solutions and
+        the pool holds the k best selections. The pool always solves the MIP cold, since the cuts exclude the
+        previous solution, without the presolve stage, and the hooks are notified of every solve.
+
+        Args:
+            k (int): The maximum number of selections.
+            min_hamming_distance (int): The minimum number of assets by which every selection differs from the previous ones.
+
+        Returns:
+            List[OptimizationResult]: The selections, from the best to the worst. Fewer than k are returned when
+            the problem has no other feasible selection.
+
+        Raises:
+            ValueError: If k or the distance is smaller than 1, or the Optimizer is in the weighted mode.
+        """
+        if k < 1 or min_hamming_distance < 1:
+            raise ValueError("The pool size and the minimum Hamming distance must be at least 1.")
+        if self.weight_options is not None:
+            raise ValueError("The solution pool does not support the weighted mode.")
+
+        start = time.perf_counter()
+        for hook in self.hooks:
+            hook.on_start(self)
+        timer = _PhaseTimer(self)
+        with timer.phase("prepare"):
+            df = self.universe.frame
+            ids = self.universe.column(self.universe.id_column).tolist()
+            values = np.asarray(self.universe.column(
+                self.target_column), dtype=float)
+        problem, x = self._build_constant_problem(df, values, timer)
+        if k > 1:
+            with timer.phase("problem"):
+                cut_coefficients = cp.Parameter((k - 1, len(ids)), value=np.zeros((k - 1, len(ids))))
+                cut_bounds = cp.Parameter(k - 1, value=np.zeros(k - 1))
+                problem = cp.Problem(problem.objective, problem.constraints + [cut_coefficients @ x >= cut_bounds])
+
+        results = []
+        selected = None
+        while len(results) < k:
+            if results:
+                start = time.perf_counter()
+                for hook in self.hooks:
+                    hook.on_start(self)
+                timer = _PhaseTimer(self)
+                with timer.phase("update_parameters"):
+                    coefficients, bound = self._diversity_cut(selected, min_hamming_distance)
+                    cut_coefficients.value[len(results) - 1] = coefficients
+                    cut_bounds.value[len(results) - 1] = bound
+            try:
+                solver, warm_start = self._timed_solve(problem, x, timer)
+            except TimeLimitReached as error:
+                raise cp.SolverError(str(error)) from None
+
+            with timer.phase("extract"):
+                if problem.status in ["infeasible", "infeasible_inaccurate"] or x.value is None:
+                    result = None
+                else:
+                    selected = x.value > 0.5
+                    result = OptimizationResult([ids[i] for i in np.flatnonzero(selected)], problem.status, float(values[selected].sum()), method="mip",
+                                                gap=self._mip_gap(problem), warm_start=warm_start, solver=solver)
+            if result is None:
+                # The earlier selections exhaust the feasible ones
+                break
+            result.timings = timer.timings
+            result.wall_time = time.perf_counter() - start
+            for hook in self.hooks:
+                hook.on_result(self, result)
+            results.append(result)
+        return results
+
+    def _diversity_cut(self, selected: np.ndarray, distance: int) -> Tuple[np.ndarray, float]:
+        """
+        Returns the row c @ x >= d of the cut excluding the selections within a Hamming distance of a selection.
+
+        The Hamming distance to the selection S is the number of assets of S not selected plus the number of
+        assets outside S selected, i.e. |S| - sum(x[S]) + sum(x[not S]).
+
+        Args:
+            selected (np.ndarray): The boolean selection mask.
+            distance (int): The minimum Hamming distance to the selection.
+
+        Returns:
+            Tuple[np.ndarray, float]: The coefficients c and the bound d of the cut.
+        """
+        return 1.0 - 2.0 * selected, float(distance - int(selected.sum()))
+
+    def optimize_many(self, scenarios: Sequence[Scenario], max_workers: Optional[int] = None) -> List[OptimizationResult]:
+        """
+        Optimizes the portfolio under several scenarios, in parallel across processes.
+
+        The Universe is shipped once to every worker process as a columnar payload and each worker
+        reuses a compiled problem across the scenarios it solves.
+
+        Args:
+            scenarios (Sequence[Scenario]): The scenarios to optimize.
+            max_workers (Optional[int]): The number of worker processes. Defaults to the number of CPUs;
+                1 solves the scenarios sequentially in the current process.
+
+        Returns:
+            List[OptimizationResult]: The results, in the order of the scenarios.
+        """
+        return run_scenarios(self, scenarios, max_workers)
+
+    def optimize_groups(self, group_column: str, allocation: str = "lagrangian", max_workers: Optional[int] = None, iterations: int = 20) -> OptimizationResult:
+        """
+        Optimizes the portfolio group by group, e.g. per sector or region, in parallel across processes.
+
+        The constraints other than MaxAssetsConstraint apply within every group of the Universe partitioned by
+        the group column, and the maximum number of assets is shared across the groups. Every group is solved
+        as a small independent problem with a budget allocated by a master, see corefolio.decomposition, and the
+        selections are merged back.
+
+        Args:
+            group_column (str): The column partitioning the Universe.
+            allocation (str): The budget allocation: 'proportional' to the group sizes, or 'lagrangian', which
+                prices the selected assets and reports the gap against the Lagrangian bound.
+            max_workers (Optional[int]): The number of worker processes. Defaults to the number of CPUs;
+                1 solves the groups sequentially in the current process.
+            iterations (int): The maximum number of price bisection steps of the Lagrangian allocation.
+
+        Returns:
+            OptimizationResult: The merged result, with status 'feasible' when its optimality is not proven.
+
+        Raises:
+            ValueError: If the allocation is not supported or the Optimizer is in the weighted mode.
+            NotImplementedError: If a cardinality constraint is not a MaxAssetsConstraint.
+        """
+        return run_decomposition(self, group_column, allocation, max_workers, iterations)
+
+    def sweep(self, param_grid: Mapping[ParameterKey, Iterable[Any]], max_workers: int = 1) -> Iterator[SweepPoint]:
+        """
+        Optimizes the portfolio at every point of a grid of constraint parameters, e.g. to build trade-off curves.
+
+        The problem is compiled once with cp.Parameter objects and the grid is walked in boustrophedon order,
+        so that every solve only differs from the previous one by one step of one parameter and is warm-started
+        from its selection. The constraints are restored to their values once the sweep is over.
+
+        Args:
+            param_grid (Mapping[ParameterKey, Iterable[Any]]): The values of every parameter, keyed by a constraint
+                of the Optimizer and a parameter name, e.g. {(max_assets_constraint, 'max_assets'): range(5, 201)}.
+            max_workers (int): The number of worker processes, each sweeping contiguous slices of the grid.
+                1 sweeps sequentially in the current process.
+
+        Returns:
+            Iterator[SweepPoint]: The results, streamed as they are solved. corefolio.sweep.to_frame collects
+            them into a DataFrame.
+
+        Raises:
+            ValueError: If a constraint does not belong to the Optimizer, a parameter cannot be set or has no values.
+        """
+        return run_sweep(self, param_grid, max_workers)
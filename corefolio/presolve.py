@@ -0,0 +1,246 @@
+"""This module contains the Reduction class and the presolve stage shrinking the selection problem before the MIP."""
+
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from corefolio.heuristic import FEASIBILITY_TOLERANCE, RatioRows
+
+# Maximum number of passes of the reductions, every pass can enable the others
+MAX_PRESOLVE_ROUNDS = 10
+
+# Multiplier mixing the row index of an entry into the hash of its value
+_ROW_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# Salt of the second hash of the entries, which makes collisions of the column hashes negligible
+_SECOND_SALT = np.uint64(0xD6E8FEB86659FD93)
+
+
+class Reduction:
+    def __init__(self, kept: np.ndarray, rows: RatioRows, removed_rows: int) -> None:
+        """
+        Initializes a Reduction, i.e. the selection problem restricted to the assets that may be selected.
+
+        Args:
+            kept (np.ndarray): The positions of the kept assets in the Universe, in increasing order.
+            rows (RatioRows): The rows of the reduced problem, over the kept assets, without the redundant rows.
+            removed_rows (int): The number of redundant rows removed.
+        """
+        self.kept = kept
+        self.rows = rows
+        self.removed_rows = removed_rows
+
+    @property
+    def is_top_k(self) -> bool:
+        """
+        Returns whether the reduced problem is solved by selecting all the kept assets, which is the case
+        when no row is left and there are at most max_assets assets.
+
+        Returns:
+            bool: True if the kept assets are the optimal selection.
+        """
+        return self.rows.num_rows == 0 and len(self.kept) <= self.rows.max_assets
+
+
+class _Block:
+    def __init__(self, coefficients: sp.csr_matrix, offsets: np.ndarray) -> None:
+        """
+        Initializes the contributions of a block of rows and assets, kept sparse.
+
+        The contribution of an asset to a row is its coefficient net of the row offset: the stored entries
+        contribute data - offset, and the assets without an entry in the row all contribute -offset.
+
+        Args:
+            coefficients (sp.csr_matrix): The (rows x assets) coefficients of the block.
+            offsets (np.ndarray): The offset of every row.
+        """
+        coefficients = sp.csr_matrix(coefficients)
+        coefficients.eliminate_zeros()
+        self.coefficients = coefficients
+        self.offsets = offsets
+        self.entry_rows = np.repeat(np.arange(coefficients.shape[0]), np.diff(coefficients.indptr))
+        self.entry_contributions = coefficients.data - offsets[self.entry_rows]
+        # Number of assets without an entry, and their common contribution, by row
+        self.num_implicit = coefficients.shape[1] - np.diff(coefficients.indptr)
+        self.implicit_contributions = -offsets
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        Returns the number of rows and assets of the block.
+
+        Returns:
+            Tuple[int, int]: The shape.
+        """
+        return self.coefficients.shape
+
+    def row_any(self, entries: np.ndarray, implicit: np.ndarray) -> np.ndarray:
+        """
+        Returns the rows where an entry or an implicit contribution meets a condition.
+
+        Args:
+            entries (np.ndarray): The condition on every stored entry.
+            implicit (np.ndarray): The condition on the implicit contribution of every row.
+
+        Returns:
+            np.ndarray: The boolean mask of the rows.
+        """
+        return (np.bincount(self.entry_rows[entries], minlength=self.shape[0]) > 0) | (implicit & (self.num_implicit > 0))
+
+    def column_any(self, entries: np.ndarray, implicit: np.ndarray) -> np.ndarray:
+        """
+        Returns the assets with an entry or an implicit contribution meeting a condition.
+
+        Args:
+            entries (np.ndarray): The condition on every stored entry.
+            implicit (np.ndarray): The condition on the implicit contribution of every row.
+
+        Returns:
+            np.ndarray: The boolean mask of the assets.
+        """
+        num_assets = self.shape[1]
+        indices = self.coefficients.indices
+        explicit = np.bincount(indices[entries], minlength=num_assets) > 0
+        # An asset has an implicit contribution in a row unless it has an entry there
+        entries_in_rows = np.bincount(indices[implicit[self.entry_rows]], minlength=num_assets)
+        return explicit | (entries_in_rows < np.count_nonzero(implicit))
+
+    def top_sums(self, num_terms: int) -> np.ndarray:
+        """
+        Returns the sum of the num_terms largest positive contributions of every row.
+
+        Args:
+            num_terms (int): The number of terms.
+
+        Returns:
+            np.ndarray: The sum of every row.
+        """
+        num_rows, num_assets = self.shape
+        num_terms = min(num_terms, num_assets)
+        if num_terms <= 0:
+            return np.zeros(num_rows)
+        positive = self.entry_contributions > 0
+        rows, values = self.entry_rows[positive], self.entry_contributions[positive]
+        order = np.lexsort((-values, rows))
+        rows, values = rows[order], values[order]
+        counts = np.bincount(rows, minlength=num_rows)
+        ranks = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        # The largest terms are the entries above the implicit contribution, then the implicit contributions,
+        # then the other entries
+        fill = np.maximum(self.implicit_contributions, 0.0)
+        above = np.minimum(np.bincount(rows, weights=values > fill[rows], minlength=num_rows).astype(int), num_terms)
+        filled = np.where(fill > 0, np.minimum(self.num_implicit, num_terms - above), 0)
+        taken = above + np.minimum(counts - above, num_terms - above - filled)
+        return np.bincount(rows, weights=np.where(ranks < taken[rows], values, 0.0), minlength=num_rows) + filled * fill
+
+    def column_groups(self) -> np.ndarray:
+        """
+        Returns a group label per asset, equal for the assets with the same contributions to every row.
+
+        The columns are compared by two order-independent 64-bit hashes of their entries, i.e. of their
+        row indices and values.
+
+        Returns:
+            np.ndarray: The group of every asset.
+        """
+        columns = self.coefficients.tocsc()
+        columns.sort_indices()
+        value_hashes = pd.util.hash_array(columns.data)
+        first = pd.util.hash_array(value_hashes + columns.indices.astype(np.uint64) * _ROW_MULTIPLIER)
+        second = pd.util.hash_array(first ^ _SECOND_SALT)
+        sums = np.zeros((2, columns.shape[1]), dtype=np.uint64)
+        nonempty = np.flatnonzero(np.diff(columns.indptr))
+        if len(nonempty):
+            # The empty columns between two nonempty ones have no entries, so the segments end at the next nonempty column
+            sums[:, nonempty] = np.add.reduceat(np.vstack([first, second]), columns.indptr[nonempty], axis=1)
+        keys = np.column_stack([sums[0], sums[1], np.diff(columns.indptr).astype(np.uint64)])
+        _, groups = np.unique(keys, axis=0, return_inverse=True)
+        return groups.ravel()
+
+
+def _top_per_group(scores: np.ndarray, groups: np.ndarray, max_assets: int) -> np.ndarray:
+    """
+    Returns the assets ranked below max_assets by score among the assets of the same group.
+
+    Assets with the same contributions to every row are interchangeable in the constraints, so an
+    optimal selection never needs more than max_assets of them and takes the best ones.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset.
+        groups (np.ndarray): The group of every asset.
+        max_assets (int): The maximum number of assets to select.
+
+    Returns:
+        np.ndarray: The boolean mask of the dominated assets.
+    """
+    order = np.lexsort((-scores, groups))
+    sorted_groups = groups[order]
+    starts = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+    ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.r_[starts, len(order)]))
+    dominated = np.zeros(len(scores), dtype=bool)
+    dominated[order[ranks >= max_assets]] = True
+    return dominated
+
+
+def presolve(scores: np.ndarray, rows: RatioRows) -> Reduction:
+    """
+    Removes the assets that an optimal selection does not need and the rows that every selection satisfies.
+
+    Every row reads c @ x >= 0 with c the contributions of the assets, i.e. their coefficients net of the offset.
+    The contributions are kept sparse, as stored entries and the common contribution of the assets without
+    an entry in a row. The reductions are:
+
+    - an asset whose contribution to a row cannot be offset by the max_assets - 1 largest positive
+      contributions of that row is never feasible;
+    - an asset with a nonpositive score and no positive contribution is never needed;
+    - among assets with the same contributions, only the max_assets best scores are needed;
+    - a row with nonnegative contributions for all the kept assets is redundant;
+    - without rows, only the max_assets best positive scores are needed, which solves the problem.
+
+    No asset is fixed to be selected. The rows of a numerical MeanConstraint bounded on both sides have
+    opposite contributions, so an asset only dominates the assets of the same value in both rows, and these
+    rows are only reduced by the first and the third rules.
+
+    Args:
+        scores (np.ndarray): The objective coefficient of every asset, to be maximized.
+        rows (RatioRows): The rows of the problem.
+
+    Returns:
+        Reduction: The kept assets and the reduced rows.
+    """
+    max_assets = min(max(int(rows.max_assets), 0), len(scores))
+    coefficients = sp.csr_matrix(rows.coefficients)
+    kept = np.arange(len(scores))
+    active_rows = np.arange(rows.num_rows)
+    for _ in range(MAX_PRESOLVE_ROUNDS):
+        num_kept, num_rows = len(kept), len(active_rows)
+        block_scores = scores[kept]
+
+        keep = np.ones(len(kept), dtype=bool)
+        if len(active_rows):
+            block = _Block(coefficients[active_rows][:, kept], rows.offsets[active_rows])
+            reachable = block.top_sums(max_assets - 1)
+            keep &= ~block.column_any(block.entry_contributions + reachable[block.entry_rows] < -FEASIBILITY_TOLERANCE,
+                                      block.implicit_contributions + reachable < -FEASIBILITY_TOLERANCE)
+            keep &= (block_scores > 0) | block.column_any(block.entry_contributions > FEASIBILITY_TOLERANCE,
+                                                          block.implicit_contributions > FEASIBILITY_TOLERANCE)
+            keep &= ~_top_per_group(block_scores, block.column_groups(), max_assets)
+            kept = kept[keep]
+            block = _Block(coefficients[active_rows][:, kept], rows.offsets[active_rows])
+            active_rows = active_rows[block.row_any(block.entry_contributions < -FEASIBILITY_TOLERANCE,
+                                                    block.implicit_contributions < -FEASIBILITY_TOLERANCE)]
+
+        if not len(active_rows):
+            kept = kept[scores[kept] > 0]
+            if len(kept) > max_assets:
+                best = np.argsort(-scores[kept], kind="stable")[:max_assets]
+                kept = np.sort(kept[best])
+            break
+        if len(kept) == num_kept and len(active_rows) == num_rows:
+            break
+
+    reduced_rows = RatioRows(sp.csr_matrix(coefficients[active_rows][:, kept]), rows.offsets[active_rows], max_assets)
+    return Reduction(kept, reduced_rows, rows.num_rows - len(active_rows))
@@ -0,0 +1,376 @@
+"""This module contains the ProblemStore class, which persists canonicalized problems on disk across processes."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from corefolio.cache import _array_digest
+from corefolio.lazy import cp
+from corefolio.solver import SolverOptions, TimeLimitReached
+
+# Version of the layout of the artifact files, an artifact written with another layout is discarded
+FORMAT_VERSION = 2
+
+# The artifacts hold the problem data of the CVXPY interface of this solver, and are solved with scipy.optimize.milp
+ARTIFACT_SOLVER = "SCIPY"
+
+# Status of the result of scipy.optimize.milp, by status code
+_MILP_STATUS = {0: "optimal", 1: "user_limit", 2: "infeasible", 3: "unbounded"}
+
+# Arrays of an artifact, stored as one .npy file each
+_ARRAYS = ["c_data", "c_indices", "c_indptr", "a_data", "a_indices", "a_indptr", "matrix_indices", "matrix_indptr",
+           "boolean", "integer", "ids"]
+
+
+@functools.lru_cache(maxsize=None)
+def _versions() -> Dict[str, str]:
+    """
+    Returns the versions an artifact is valid for.
+
+    corefolio is identified by a digest of its sources when it is not installed, e.g. in a development checkout.
+
+    Returns:
+        Dict[str, str]: The artifact format, corefolio and cvxpy versions.
+    """
+    versions = {"format": str(FORMAT_VERSION), "cvxpy": metadata.version("cvxpy")}
+    try:
+        versions["corefolio"] = metadata.version("corefolio")
+    except metadata.PackageNotFoundError:
+        digest = hashlib.blake2b(digest_size=16)
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                with open(os.path.join(directory, name), "rb") as file:
+                    digest.update(file.read())
+        versions["corefolio"] = f"source:{digest.hexdigest()}"
+    return versions
+
+
+def _ids_digest(ids: Sequence[Any]) -> str:
+    """
+    Returns the digest of the asset IDs mapped to the decision variables of an artifact.
+
+    Args:
+        ids (Sequence[Any]): The asset IDs, by decision variable.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return _array_digest(np.asarray(ids))
+
+
+def problem_key(optimizer: Any, df: pd.DataFrame) -> Optional[str]:
+    """
+    Returns the structural hash of the compiled problem of an Optimizer: the shape and columns of the data, the
+    sense, the target values and the structure keys of the constraints, see Constraint.structure_key. The per-asset
+    data are constants of the compiled problem and part of the key, the scalar constraint parameters and bounds are
+    parameter values, so they are not.
+
+    Args:
+        optimizer (Optimizer): The Optimizer.
+        df (pd.DataFrame): The DataFrame containing asset data.
+
+    Returns:
+        Optional[str]: The key, or None if a constraint is not parameterized.
+    """
+    constraint_keys = []
+    for constraint in optimizer.constraints:
+        constraint_key = constraint.structure_key(df)
+        if constraint_key is None:
+            return None
+        constraint_keys.append(constraint_key)
+    values = _array_digest(np.asarray(df[optimizer.target_column], dtype=float))
+    payload = repr((df.shape, tuple(df.columns), optimizer.sense, values, tuple(constraint_keys)))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+class ProblemArtifact:
+    def __init__(self, path: str, manifest: Dict[str, Any]) -> None:
+        """
+        Initializes a ProblemArtifact, i.e. the canonicalized data of a compiled problem, memory-mapped from disk.
+
+        The artifact maps the vector of parameter values of the problem to the data of the conic form
+        minimize c'z subject to A z + b in K, with K the zero cone for the first rows and the nonnegative
+        orthant for the others, as canonicalized by CVXPY for ARTIFACT_SOLVER.
+
+        Args:
+            path (str): The directory of the artifact.
+            manifest (Dict[str, Any]): The manifest of the artifact.
+        """
+        self.path = path
+        self.manifest = manifest
+        self._arrays = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+                        for name in _ARRAYS if os.path.exists(os.path.join(path, f"{name}.npy"))}
+
+    @property
+    def parameter_shapes(self) -> List[Tuple[int, ...]]:
+        """
+        Returns the shapes of the parameters of the problem, in the order of cp.Problem.parameters.
+
+        Returns:
+            List[Tuple[int, ...]]: The parameter shapes.
+        """
+        return [tuple(shape) for shape in self.manifest["parameter_shapes"]]
+
+    @property
+    def ids(self) -> Optional[np.ndarray]:
+        """
+        Returns the asset IDs of the Universe the artifact was exported from, by decision variable.
+
+        Returns:
+            Optional[np.ndarray]: The IDs, or None if they could not be stored without pickling.
+        """
+        return self._arrays.get("ids")
+
+    def _parameter_vector(self, parameter_values: Sequence[Any]) -> np.ndarray:
+        """
+        Returns the parameter vector of the canonicalization, including its constant slot.
+
+        Args:
+            parameter_values (Sequence[Any]): The parameter values, in the order of cp.Problem.parameters.
+
+        Returns:
+            np.ndarray: The parameter vector.
+
+        Raises:
+            ValueError: If the values do not have the shapes of the parameters.
+        """
+        shapes = self.parameter_shapes
+        if len(parameter_values) != len(shapes):
+            raise ValueError(f"The problem has {len(shapes)} parameters, {len(parameter_values)} values were given.")
+        vector = np.zeros(self.manifest["parameter_size"] + 1)
+        for position, column, size in self.manifest["parameter_slots"]:
+            value = np.asarray(parameter_values[position], dtype=float)
+            if value.shape != shapes[position]:
+                raise ValueError(f"Invalid shape {value.shape} for parameter {position}, expected {shapes[position]}.")
+            vector[column:column + size] = value.flatten(order="F")
+        vector[self.manifest["constant_column"]] = 1.0
+        return vector
+
+    def problem_data(self, parameter_values: Sequence[Any]) -> Tuple[np.ndarray, sp.csc_matrix, np.ndarray]:
+        """
+        Applies parameter values to the canonicalized problem.
+
+        Args:
+            parameter_values (Sequence[Any]): The parameter values, in the order of cp.Problem.parameters.
+
+        Returns:
+            Tuple[np.ndarray, sp.csc_matrix, np.ndarray]: The objective coefficients c and the constraint data A and b.
+        """
+        vector = self._parameter_vector(parameter_values)
+        arrays = self._arrays
+        num_variables = self.manifest["num_variables"]
+        c_tensor = sp.csc_matrix((arrays["c_data"], arrays["c_indices"], arrays["c_indptr"]),
+                                 shape=tuple(self.manifest["c_shape"]))
+        c = np.asarray(c_tensor @ vector).ravel()[:num_variables]
+        num_rows = self.manifest["num_rows"]
+        if not num_rows:
+            return c, sp.csc_matrix((0, num_variables)), np.zeros(0)
+        # The reduced tensor gives the nonzeros of [A b] in CSC order, as in cvxpy.reductions.utilities.ReducedMat
+        a_tensor = sp.csr_matrix((arrays["a_data"], arrays["a_indices"], arrays["a_indptr"]),
+                                 shape=tuple(self.manifest["a_shape"]))
+        matrix = sp.csc_matrix((a_tensor @ vector, arrays["matrix_indices"], arrays["matrix_indptr"]),
+                               shape=(num_rows, num_variables + 1))
+        return c, matrix[:, :-1].tocsc(), matrix[:, -1].toarray().ravel()
+
+    def solve(self, parameter_values: Sequence[Any], solver_options: Optional[SolverOptions] = None) -> Tuple[str, Optional[np.ndarray], Optional[float]]:
+        """
+        Solves the problem for parameter values with scipy.optimize.milp, without CVXPY.
+
+        Args:
+            parameter_values (Sequence[Any]): The parameter values, in the order of cp.Problem.parameters.
+            solver_options (Optional[SolverOptions]): The time limit, MIP gap, verbosity and ARTIFACT_SOLVER options
+                of the solve.
+
+        Returns:
+            Tuple[str, Optional[np.ndarray], Optional[float]]: The status, the values of the decision variables,
+            or None if no solution was found, and the relative MIP gap.
+
+        Raises:
+            TimeLimitReached: If no solution was found within the time limit.
+            cp.SolverError: If the solver fails.
+        """
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        solver_options = solver_options or SolverOptions()
+        c, matrix, offset = self.problem_data(parameter_values)
+        num_variables = len(c)
+        num_equalities = self.manifest["num_equalities"]
+        constraints = []
+        # The rows in the zero cone are equalities A z + b = 0, the other ones inequalities A z + b >= 0
+        if num_equalities:
+            constraints.append(LinearConstraint(-matrix[:num_equalities], offset[:num_equalities], offset[:num_equalities]))
+        if matrix.shape[0] > num_equalities:
+            constraints.append(LinearConstraint(-matrix[num_equalities:], ub=offset[num_equalities:]))
+        integrality = np.zeros(num_variables)
+        lower = np.full(num_variables, -np.inf)
+        upper = np.full(num_variables, np.inf)
+        for name in ["boolean", "integer"]:
+            integrality[self._arrays[name]] = 1
+        lower[self._arrays["boolean"]] = 0.0
+        upper[self._arrays["boolean"]] = 1.0
+
+        # The options are the ones CVXPY passes to scipy.optimize.milp for ARTIFACT_SOLVER
+        options: Dict[str, Any] = {"disp": solver_options.verbose,
+                                   **solver_options.solve_kwargs(ARTIFACT_SOLVER).get("scipy_options", {})}
+        solution = milp(c, constraints=constraints, integrality=integrality, bounds=Bounds(lower, upper), options=options)
+
+        status = _MILP_STATUS.get(solution.status)
+        if status == "user_limit" and solution.x is None:
+            raise TimeLimitReached(f"{ARTIFACT_SOLVER}: {solution.message}")
+        if status is None:
+            raise cp.SolverError(f"{ARTIFACT_SOLVER}: {solution.message}")
+        if solution.x is None:
+            return status, None, None
+        start = self.manifest["variable_offset"]
+        gap = getattr(solution, "mip_gap", None)
+        return status, solution.x[start:start + self.manifest["num_assets"]], None if gap is None else float(gap)
+
+
+class ProblemStore:
+    def __init__(self, path: str) -> None:
+        """
+        Initializes the ProblemStore, a directory of canonicalized compiled problems shared across processes.
+
+        Every artifact is a directory named after the structural hash of its problem, see problem_key, holding
+        a manifest and the problem data as .npy files, which are memory-mapped when loaded. Artifacts written by
+        another version of corefolio or cvxpy are discarded and exported again.
+
+        Args:
+            path (str): The directory of the store, created if needed.
+        """
+        self._path = path
+        os.makedirs(path, exist_ok=True)
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the directory of the store.
+
+        Returns:
+            str: The directory.
+        """
+        return self._path
+
+    def get(self, key: str, problem: Optional[cp.Problem] = None, ids: Optional[Sequence[Any]] = None) -> Optional[ProblemArtifact]:
+        """
+        Returns the artifact stored under a key, if it is valid.
+
+        Args:
+            key (str): The structural hash of the problem.
+            problem (Optional[cp.Problem]): The compiled problem the artifact is loaded for, whose parameters
+                must have the shapes of the stored ones.
+            ids (Optional[Sequence[Any]]): The asset IDs the artifact is loaded for, by decision variable, which
+                must be the stored ones.
+
+        Returns:
+            Optional[ProblemArtifact]: The artifact, or None if it is missing or was discarded.
+        """
+        directory = os.path.join(self._path, key)
+        try:
+            with open(os.path.join(directory, "manifest.json")) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return None
+        artifact = None
+        if manifest.get("versions") == _versions():
+            artifact = ProblemArtifact(directory, manifest)
+            if problem is not None and artifact.parameter_shapes != [parameter.shape for parameter in problem.parameters()]:
+                artifact = None
+            elif ids is not None and manifest.get("ids_digest") != _ids_digest(ids):
+                # The artifact was exported from another Universe of the same structure
+                artifact = None
+        if artifact is None:
+            shutil.rmtree(directory, ignore_errors=True)
+        return artifact
+
+    def put(self, key: str, problem: cp.Problem, variables: cp.Variable, ids: Optional[Sequence[Any]] = None) -> ProblemArtifact:
+        """
+        Canonicalizes a compiled problem and stores its data under a key.
+
+        The artifact is written to a temporary directory and moved in place, so that concurrent processes
+        never read a partial artifact.
+
+        Args:
+            key (str): The structural hash of the problem.
+            problem (cp.Problem): The compiled problem.
+            variables (cp.Variable): The decision variables, one per asset.
+            ids (Optional[Sequence[Any]]): The asset IDs, by decision variable.
+
+        Returns:
+            ProblemArtifact: The stored artifact.
+        """
+        data, _, _ = problem.get_problem_data(ARTIFACT_SOLVER)
+        program = data[cp.settings.PARAM_PROB]
+        constant_id = cp.lin_ops.lin_op.CONSTANT_ID
+        positions = {parameter.id: position for position, parameter in enumerate(problem.parameters())}
+        c_tensor = sp.csc_matrix(program.c)
+        program.reduced_A.cache()
+        num_rows = int(program.constr_size)
+        arrays = {"c_data": c_tensor.data, "c_indices": c_tensor.indices, "c_indptr": c_tensor.indptr,
+                  "boolean": np.array([int(index[0]) for index in program.x.boolean_idx], dtype=np.int64),
+                  "integer": np.array([int(index[0]) for index in program.x.integer_idx], dtype=np.int64)}
+        a_shape = [0, 0]
+        if num_rows:
+            a_tensor = sp.csr_matrix(program.reduced_A.reduced_mat)
+            matrix_indices, matrix_indptr, _ = program.reduced_A.problem_data_index
+            arrays.update({"a_data": a_tensor.data, "a_indices": a_tensor.indices, "a_indptr": a_tensor.indptr,
+                           "matrix_indices": matrix_indices, "matrix_indptr": matrix_indptr})
+            a_shape = list(a_tensor.shape)
+        if ids is not None:
+            id_array = np.asarray(ids)
+            if id_array.dtype != object:
+                arrays["ids"] = id_array
+
+        manifest = {
+            "key": key,
+            "versions": _versions(),
+            "parameter_shapes": [list(parameter.shape) for parameter in problem.parameters()],
+            "parameter_slots": [[positions[parameter_id], int(column), int(program.param_id_to_size[parameter_id])]
+                                for parameter_id, column in program.param_id_to_col.items() if parameter_id != constant_id],
+            "parameter_size": int(program.total_param_size),
+            "constant_column": int(program.param_id_to_col[constant_id]),
+            "num_variables": int(program.x.size),
+            "variable_offset": int(program.var_id_to_col[variables.id]),
+            "num_assets": int(variables.size),
+            "num_rows": num_rows,
+            "num_equalities": int(program.cone_dims.zero),
+            "c_shape": list(c_tensor.shape),
+            "a_shape": a_shape,
+            "ids_digest": None if ids is None else _ids_digest(ids),
+        }
+
+        directory = os.path.join(self._path, key)
+        staging = tempfile.mkdtemp(prefix=f".{key}-", dir=self._path)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(staging, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+            with open(os.path.join(staging, "manifest.json"), "w") as file:
+                json.dump(manifest, file)
+            shutil.rmtree(directory, ignore_errors=True)
+            try:
+                os.rename(staging, directory)
+            except OSError:
+                # Another process stored the artifact first
+                pass
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return ProblemArtifact(directory, manifest)
+
+    def clear(self) -> None:
+        """
+        Removes all the artifacts.
+        """
+        for name in os.listdir(self._path):
+            shutil.rmtree(os.path.join(self._path, name), ignore_errors=True)
@@ -0,0 +1,62 @@
+"""This module contains the OptimizationResult class, which describes the outcome of an optimization."""
+
+from typing import Any, Dict, List, Optional
+
+
+class OptimizationResult:
+    def __init__(self, selected_ids: List[Any], status: str, objective_value: Optional[float] = None, wall_time: Optional[float] = None, error: Optional[str] = None, method: Optional[str] = None, gap: Optional[float] = None, warm_start: bool = False, solver: Optional[str] = None, timings: Optional[Dict[str, float]] = None, weights: Optional[Dict[Any, float]] = None, risk: Optional[float] = None, removed_variables: Optional[int] = None, removed_rows: Optional[int] = None, cached: bool = False, conflicting_constraints: Optional[List[int]] = None) -> None:
+        """
+        Initializes the OptimizationResult.
+
+        Args:
+            selected_ids (List[Any]): The list of selected asset IDs.
+            status (str): The solver status, or 'error' if the optimization raised an exception.
+            objective_value (Optional[float]): The sum of the target values of the selected assets,
+                weighted by their weights in the weighted mode.
+            wall_time (Optional[float]): The total time spent in the optimization, in seconds.
+            error (Optional[str]): The error message if the optimization raised an exception.
+            method (Optional[str]): The method used to solve the problem, 'mip' or 'greedy'.
+            gap (Optional[float]): The relative optimality gap of the selection, when known.
+            warm_start (bool): Whether the solve was warm-started from a previous selection.
+            solver (Optional[str]): The name of the solver used for the MIP.
+            timings (Optional[Dict[str, float]]): The time spent in every phase of the optimization, in seconds:
+                'cache', 'prepare', 'feasibility', 'presolve', 'variables', 'objective', 'constraint:<index>:<class name>', 'stack_rows', 'problem',
+                'update_parameters', 'artifact', 'canonicalization', 'solver', 'heuristic_rows', 'heuristic' and 'extract'.
+            weights (Optional[Dict[Any, float]]): The weight of every selected asset, in the weighted mode.
+            risk (Optional[float]): The portfolio variance under the risk model, in the weighted mode.
+            removed_variables (Optional[int]): The number of assets removed by the presolve stage, when it ran.
+            removed_rows (Optional[int]): The number of redundant rows removed by the presolve stage, when it ran.
+            cached (bool): Whether the result was returned by the result cache of the Optimizer.
+            conflicting_constraints (Optional[List[int]]): The positions of a minimal subset of conflicting constraints,
+                when the feasibility pre-check proved that no nonempty selection satisfies the constraints.
+        """
+        self.selected_ids = selected_ids
+        self.status = status
+        self.objective_value = objective_value
+        self.wall_time = wall_time
+        self.error = error
+        self.method = method
+        self.gap = gap
+        self.warm_start = warm_start
+        self.solver = solver
+        self.timings = dict(timings or {})
+        self.weights = weights
+        self.risk = risk
+        self.removed_variables = removed_variables
+        self.removed_rows = removed_rows
+        self.cached = cached
+        self.conflicting_constraints = conflicting_constraints
+
+    @property
+    def is_feasible(self) -> bool:
+        """
+        Returns whether a feasible selection was found.
+
+        Returns:
+            bool: True if the status is optimal, or a heuristic or time-limited solution is available.
+        """
+        return self.status in ["optimal", "optimal_inaccurate", "user_limit", "feasible"]
+
+    def __repr__(self) -> str:
+        return (f"OptimizationResult(status={self.status!r}, objective_value={self.objective_value!r}, "
+                f"selected_ids={self.selected_ids!r})")
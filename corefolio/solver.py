@@ -0,0 +1,159 @@
+"""This module contains the SolverOptions class, which configures the solvers used by the Optimizer."""
+
+from __future__ import annotations
+
+import warnings
+from typing import Any, Dict, List, Optional, Sequence
+
+from corefolio.lazy import cp
+
+# Installed MIP solvers are tried in this order when options are set without a solver name
+MIP_SOLVER_PREFERENCE = ["GUROBI", "CPLEX", "MOSEK", "XPRESS",
+                         "COPT", "SCIP", "HIGHS", "CBC", "SCIPY", "GLPK_MI"]
+
+# Installed solvers tried in this order for continuous problems, e.g. the weighted mode without cardinality
+# constraints: the interior-point methods scale better than the CVXPY default on large factor models
+CONTINUOUS_SOLVER_PREFERENCE = ["CLARABEL", "MOSEK", "GUROBI", "CPLEX", "ECOS", "SCS"]
+
+
+class TimeLimitReached(Exception):
+    """Raised when a solver reaches the time limit without finding a feasible solution."""
+
+
+class SolverOptions:
+    def __init__(self, solver: Optional[str] = None, time_limit: Optional[float] = None, mip_gap: Optional[float] = None, threads: Optional[int] = None, verbose: bool = False, fallback_solvers: Optional[Sequence[str]] = None, solver_kwargs: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Initializes the SolverOptions.
+
+        Args:
+            solver (Optional[str]): The name of the preferred CVXPY solver, e.g. 'GUROBI' or 'SCIPY'.
+            time_limit (Optional[float]): The wall time limit of a solve, in seconds.
+            mip_gap (Optional[float]): The relative MIP gap at which the solver stops.
+            threads (Optional[int]): The number of threads used by the solver.
+            verbose (bool): Whether the solver prints its log.
+            fallback_solvers (Optional[Sequence[str]]): The solvers tried, in order, when the preferred one
+                is not installed or fails.
+            solver_kwargs (Optional[Dict[str, Dict[str, Any]]]): Additional keyword arguments passed to
+                cp.Problem.solve, by solver name.
+        """
+        self.solver = solver
+        self.time_limit = time_limit
+        self.mip_gap = mip_gap
+        self.threads = threads
+        self.verbose = verbose
+        self.fallback_solvers = list(fallback_solvers or [])
+        self.solver_kwargs = dict(solver_kwargs or {})
+
+    @property
+    def has_limits(self) -> bool:
+        """
+        Returns whether a time limit, MIP gap or thread count is set.
+
+        Returns:
+            bool: True if a limit is set.
+        """
+        return self.time_limit is not None or self.mip_gap is not None or self.threads is not None
+
+    def reached_time_limit(self, elapsed: float) -> bool:
+        """
+        Returns whether a solve running for some time was stopped by the time limit.
+
+        Args:
+            elapsed (float): The wall time of the solve, in seconds.
+
+        Returns:
+            bool: True if a time limit is set and the solve lasted at least as long.
+        """
+        return self.time_limit is not None and elapsed >= self.time_limit
+
+    def solver_chain(self, mixed_integer: bool = True) -> List[Optional[str]]:
+        """
+        Returns the installed solvers to try, in order. None stands for the CVXPY default solver.
+
+        Args:
+            mixed_integer (bool): Whether the problem has integer variables, which selects the default
+                solver when no solver is named.
+
+        Returns:
+            List[Optional[str]]: The solver names.
+
+        Raises:
+            cp.SolverError: If none of the requested solvers is installed.
+        """
+        installed = cp.installed_solvers()
+        requested = ([self.solver] if self.solver else []) + self.fallback_solvers
+        if requested:
+            chain = [solver for solver in requested if solver in installed]
+            if not chain:
+                raise cp.SolverError(
+                    f"None of the solvers {requested} is installed.")
+            return chain
+        if not mixed_integer:
+            return [solver for solver in CONTINUOUS_SOLVER_PREFERENCE if solver in installed][:1] or [None]
+        if self.has_limits:
+            # The options are translated per solver, so the default solver has to be resolved
+            return [solver for solver in MIP_SOLVER_PREFERENCE if solver in installed][:1] or [None]
+        return [None]
+
+    def solve_kwargs(self, solver: Optional[str]) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments of cp.Problem.solve for a solver.
+
+        Args:
+            solver (Optional[str]): The solver name, None for the CVXPY default solver.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments.
+        """
+        kwargs: Dict[str, Any] = {"verbose": self.verbose}
+        if solver is not None:
+            kwargs.update(self._translate(solver))
+            for name, value in self.solver_kwargs.get(solver, {}).items():
+                if isinstance(value, dict) and isinstance(kwargs.get(name), dict):
+                    value = {**kwargs[name], **value}
+                kwargs[name] = value
+        return kwargs
+
+    def _translate(self, solver: str) -> Dict[str, Any]:
+        """
+        Translates the time limit, MIP gap and thread count into the solver-specific options.
+
+        Args:
+            solver (str): The solver name.
+
+        Returns:
+            Dict[str, Any]: The solver-specific keyword arguments.
+        """
+        names = _OPTION_NAMES.get(solver)
+        if names is None:
+            if self.has_limits:
+                warnings.warn(
+                    f"Solver options are not supported for {solver} and are ignored.")
+            return {}
+        group, time_limit, mip_gap, threads = names
+        options = {}
+        for name, value in [(time_limit, self.time_limit), (mip_gap, self.mip_gap), (threads, self.threads)]:
+            if value is None:
+                continue
+            if name is None:
+                warnings.warn(f"{solver} does not support this solver option and it is ignored.")
+                continue
+            options[name] = value
+        if group is None:
+            return options
+        # Some solvers take their options in a dedicated dictionary, which they may modify
+        return {group: options}
+
+
+# Per solver: the dictionary holding the options, if any, and the time limit, MIP gap and thread count names
+_OPTION_NAMES = {
+    "SCIPY": ("scipy_options", "time_limit", "mip_rel_gap", None),
+    "HIGHS": (None, "time_limit", "mip_rel_gap", "threads"),
+    "GUROBI": (None, "TimeLimit", "MIPGap", "Threads"),
+    "CPLEX": ("cplex_params", "timelimit", "mip.tolerances.mipgap", "threads"),
+    "MOSEK": ("mosek_params", "MSK_DPAR_OPTIMIZER_MAX_TIME", "MSK_DPAR_MIO_TOL_REL_GAP", "MSK_IPAR_NUM_THREADS"),
+    "SCIP": ("scip_params", "limits/time", "limits/gap", "parallel/maxnthreads"),
+    "CBC": (None, "maximumSeconds", "allowableFractionGap", "numberThreads"),
+    "COPT": (None, "TimeLimit", "RelGap", "Threads"),
+    "CLARABEL": (None, "time_limit", None, "max_threads"),
+}
@@ -0,0 +1,250 @@
+"""This module contains the SweepPoint class and the helpers used to sweep constraint parameters over a grid."""
+
+import copy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from corefolio.batch import _UniversePayload, _initialize_worker, _worker_state, _worker_template
+from corefolio.constraint import Constraint
+from corefolio.result import OptimizationResult
+
+# A grid key is a constraint of the Optimizer and the name of one of its parameters, e.g. 'max_assets'
+ParameterKey = Tuple[Constraint, str]
+
+
+class SweepPoint:
+    def __init__(self, parameters: Dict[str, Any], result: OptimizationResult) -> None:
+        """
+        Initializes a SweepPoint, i.e. the result of the optimization at one point of a parameter grid.
+
+        Args:
+            parameters (Dict[str, Any]): The parameter values, by label. The label is the parameter name,
+                suffixed with the constraint position when several constraints share the name, e.g. 'tolerance[1]'.
+            result (OptimizationResult): The result of the optimization.
+        """
+        self.parameters = parameters
+        self.result = result
+
+    def __repr__(self) -> str:
+        return f"SweepPoint(parameters={self.parameters!r}, result={self.result!r})"
+
+
+def _snake_order(lengths: Sequence[int]) -> List[Tuple[int, ...]]:
+    """
+    Returns the indices of a grid in boustrophedon order, so that consecutive points only differ
+    by one step of one parameter.
+
+    Args:
+        lengths (Sequence[int]): The number of values of every parameter.
+
+    Returns:
+        List[Tuple[int, ...]]: The grid indices, in sweep order.
+    """
+    if not lengths:
+        return [()]
+    inner = _snake_order(lengths[1:])
+    order = []
+    for index in range(lengths[0]):
+        rows = inner if index % 2 == 0 else inner[::-1]
+        order.extend((index,) + rest for rest in rows)
+    return order
+
+
+def _is_settable(constraint: Constraint, name: str) -> bool:
+    """
+    Returns whether a constraint parameter can be assigned to: a property with a setter or a data attribute.
+
+    Args:
+        constraint (Constraint): The constraint.
+        name (str): The parameter name.
+
+    Returns:
+        bool: True if the parameter can be set.
+    """
+    attribute = getattr(type(constraint), name, None)
+    if isinstance(attribute, property):
+        return attribute.fset is not None
+    if name in vars(constraint):
+        return not callable(vars(constraint)[name])
+    return attribute is not None and not callable(attribute)
+
+
+def _resolve_grid(constraints: List[Constraint], param_grid: Mapping[ParameterKey, Iterable[Any]]) -> Tuple[List[Tuple[int, str]], List[str], List[List[Any]]]:
+    """
+    Resolves the keys of a parameter grid to constraint positions, which are preserved across processes.
+
+    Args:
+        constraints (List[Constraint]): The constraints of the Optimizer.
+        param_grid (Mapping[ParameterKey, Iterable[Any]]): The values of every parameter.
+
+    Returns:
+        Tuple[List[Tuple[int, str]], List[str], List[List[Any]]]: The constraint positions and parameter names,
+        the parameter labels and the parameter values.
+
+    Raises:
+        ValueError: If a constraint does not belong to the Optimizer, a parameter cannot be set or has no values.
+    """
+    keys = []
+    grids = []
+    for (constraint, name), values in param_grid.items():
+        positions = [index for index, candidate in enumerate(
+            constraints) if candidate is constraint]
+        if not positions:
+            raise ValueError(
+                f"{type(constraint).__name__} is not a constraint of the Optimizer.")
+        if not _is_settable(constraint, name):
+            raise ValueError(
+                f"{type(constraint).__name__} has no settable parameter '{name}'.")
+        values = list(values)
+        if not values:
+            raise ValueError(f"Parameter '{name}' has no values.")
+        keys.append((positions[0], name))
+        grids.append(values)
+
+    names = [name for _, name in keys]
+    labels = [name if names.count(name) == 1 else f"{name}[{index}]"
+              for index, name in keys]
+    return keys, labels, grids
+
+
+def _solve_points(optimizer: Any, keys: List[Tuple[int, str]], labels: List[str], points: Sequence[Tuple[Any, ...]]) -> Iterator[SweepPoint]:
+    """
+    Solves the grid points in order, warm-starting every solve from the previous selection.
+
+    Args:
+        optimizer (Optimizer): The Optimizer, whose constraints are modified.
+        keys (List[Tuple[int, str]]): The constraint positions and parameter names.
+        labels (List[str]): The parameter labels.
+        points (Sequence[Tuple[Any, ...]]): The parameter values of every point.
+
+    Yields:
+        SweepPoint: The result of every point.
+    """
+    previous = None
+    for values in points:
+        for (index, name), value in zip(keys, values):
+            setattr(optimizer.constraints[index], name, value)
+        initial_ids = previous.selected_ids if previous is not None and previous.is_feasible else None
+        previous = optimizer._solve(initial_ids=initial_ids)
+        yield SweepPoint(dict(zip(labels, values)), previous)
+
+
+def _solve_slice(keys: List[Tuple[int, str]], labels: List[str], points: Sequence[Tuple[Any, ...]]) -> List[SweepPoint]:
+    """
+    Solves a slice of the grid with the Optimizer of the current worker process.
+
+    Args:
+        keys (List[Tuple[int, str]]): The constraint positions and parameter names.
+        labels (List[str]): The parameter labels.
+        points (Sequence[Tuple[Any, ...]]): The parameter values of every point of the slice.
+
+    Returns:
+        List[SweepPoint]: The results of the slice.
+    """
+    return list(_solve_points(_worker_state["optimizer"], keys, labels, points))
+
+
+def run_sweep(optimizer: Any, param_grid: Mapping[ParameterKey, Iterable[Any]], max_workers: int = 1) -> Iterator[SweepPoint]:
+    """
+    Solves the Optimizer at every point of a parameter grid, streaming the results.
+
+    Args:
+        optimizer (Optimizer): The Optimizer defining the Universe, constraints and settings.
+        param_grid (Mapping[ParameterKey, Iterable[Any]]): The values of every parameter.
+        max_workers (int): The number of worker processes. 1 solves the points sequentially in the current process.
+
+    Returns:
+        Iterator[SweepPoint]: The result of every point, in sweep order when sequential and in completion order otherwise.
+
+    Raises:
+        ValueError: If a constraint does not belong to the Optimizer, a parameter cannot be set or has no values.
+    """
+    # The grid is resolved eagerly so that invalid grids fail before the first result is requested
+    keys, labels, grids = _resolve_grid(optimizer.constraints, param_grid)
+    points = [tuple(grid[index] for grid, index in zip(grids, indices))
+              for indices in _snake_order([len(grid) for grid in grids])]
+    if max_workers == 1:
+        return _sweep_sequentially(optimizer, keys, labels, points)
+    return _sweep_in_parallel(optimizer, keys, labels, points, max_workers)
+
+
+def _sweep_sequentially(optimizer: Any, keys: List[Tuple[int, str]], labels: List[str], points: Sequence[Tuple[Any, ...]]) -> Iterator[SweepPoint]:
+    """
+    Solves the grid points in the current process with a compiled copy of the Optimizer.
+
+    Args:
+        optimizer (Optimizer): The Optimizer, whose constraints are restored once the sweep is over.
+        keys (List[Tuple[int, str]]): The constraint positions and parameter names.
+        labels (List[str]): The parameter labels.
+        points (Sequence[Tuple[Any, ...]]): The parameter values of every point.
+
+    Yields:
+        SweepPoint: The result of every point, in sweep order.
+    """
+    sweeper = copy.copy(optimizer)
+    sweeper.compiled = True
+    originals = [getattr(optimizer.constraints[index], name)
+                 for index, name in keys]
+    try:
+        yield from _solve_points(sweeper, keys, labels, points)
+    finally:
+        for (index, name), value in zip(keys, originals):
+            setattr(optimizer.constraints[index], name, value)
+
+
+def _sweep_in_parallel(optimizer: Any, keys: List[Tuple[int, str]], labels: List[str], points: Sequence[Tuple[Any, ...]], max_workers: int) -> Iterator[SweepPoint]:
+    """
+    Solves contiguous slices of the grid points across worker processes.
+
+    Args:
+        optimizer (Optimizer): The Optimizer, whose hooks are notified of the results.
+        keys (List[Tuple[int, str]]): The constraint positions and parameter names.
+        labels (List[str]): The parameter labels.
+        points (Sequence[Tuple[Any, ...]]): The parameter values of every point.
+        max_workers (int): The number of worker processes.
+
+    Yields:
+        SweepPoint: The result of every point, slice by slice in completion order.
+    """
+    # Contiguous slices keep the warm starts between neighbors within every slice
+    num_slices = min(len(points), 4 * max_workers)
+    slices = [[points[i] for i in indices]
+              for indices in np.array_split(np.arange(len(points)), num_slices)]
+    payload = _UniversePayload(optimizer.universe)
+    template = _worker_template(optimizer)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_initialize_worker, initargs=(template, payload)) as executor:
+        futures = [executor.submit(_solve_slice, keys, labels, points_slice)
+                   for points_slice in slices]
+        try:
+            for future in as_completed(futures):
+                for point in future.result():
+                    for hook in optimizer.hooks:
+                        hook.on_result(optimizer, point.result)
+                    yield point
+        finally:
+            # The pending slices are dropped when the caller stops consuming the results
+            for future in futures:
+                future.cancel()
+
+
+def to_frame(points: Iterable[SweepPoint]) -> pd.DataFrame:
+    """
+    Collects sweep results into a DataFrame with one row per point.
+
+    Args:
+        points (Iterable[SweepPoint]): The sweep results.
+
+    Returns:
+        pd.DataFrame: The parameter values, status, objective value, number of selected assets, gap,
+        warm start flag, wall time and selected IDs of every point.
+    """
+    rows = []
+    for point in points:
+        result = point.result
+        rows.append({**point.parameters, "status": result.status, "objective_value": result.objective_value,
+                     "num_selected": len(result.selected_ids), "gap": result.gap, "warm_start": result.warm_start,
+                     "wall_time": result.wall_time, "selected_ids": result.selected_ids})
+    return pd.DataFrame(rows)
@@ -1,58 +1,154 @@
 """This module contains the Universe class."""
 
+import importlib
+import os
+import numpy as np
 import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 
 class Universe:
-    def __init__(self, df: pd.DataFrame, id_column: str = "ID") -> None:
+    def __init__(self, df: pd.DataFrame, id_column: str = "ID", validate: bool = True, columns: Optional[Iterable[str]] = None) -> None:
         """
         Initializes the Universe with a DataFrame and an ID column.
 
         Args:
-            df (pd.DataFrame): The DataFrame containing asset data.
+            df (pd.DataFrame): The DataFrame containing asset data. It is not modified.
             id_column (str): The column name to be used as the ID column.
+            validate (bool): Whether to validate the DataFrame. Disable it for frames coming from
+                an already validated pipeline.
+            columns (Optional[Iterable[str]]): The columns checked for NaN values, e.g. the
+                Optimizer.required_columns. Defaults to all of them. The ID column is always checked.
 
         Raises:
             ValueError: If the DataFrame contains NaN values or duplicate IDs.
         """
-        self._validate_dataframe(df, id_column)
+        if id_column not in df.columns:
+            # A shallow copy shares the caller's columns without adding the ID column to its frame
+            df = df.copy(deep=False)
+            df[id_column] = np.arange(1, len(df) + 1)
         self._df = df
         self._id_column = id_column
-        self._number_of_assets = df[id_column].nunique()
+        self._columns: Dict[str, np.ndarray] = {}
+        self._frame: Optional[pd.DataFrame] = None
+        if validate:
+            self.validate(columns)
+        # The IDs are unique, so the number of assets does not need another hashing pass
+        self._number_of_assets = len(df)
 
-    def _validate_dataframe(self, df: pd.DataFrame, id_column: str) -> None:
+    def validate(self, columns: Optional[Iterable[str]] = None) -> None:
         """
-        Validates the DataFrame for NaN values and duplicate IDs.
+        Validates the Universe data for NaN values and duplicate IDs.
 
         Args:
-            df (pd.DataFrame): The DataFrame to validate.
-            id_column (str): The column name to be used as the ID column.
+            columns (Optional[Iterable[str]]): The columns checked for NaN values, defaults to all of them.
+                The ID column is always checked.
 
         Raises:
             ValueError: If the DataFrame contains NaN values or duplicate IDs.
         """
-        if df.isna().any().any():
+        names = list(self._df.columns) if columns is None else [
+            self._id_column] + [name for name in columns if name != self._id_column]
+        if any(_has_nan(self._df[name]) for name in names):
             raise ValueError("DataFrame contains NaN values.")
 
-        if id_column not in df.columns:
-            df[id_column] = range(1, len(df) + 1)
-
-        if df[id_column].duplicated().any():
+        if _has_duplicates(self._df[self._id_column].to_numpy()):
             raise ValueError("DataFrame contains duplicate IDs.")
 
     @classmethod
-    def from_dataframe(cls, df: pd.DataFrame, id_column: str = "ID") -> "Universe":
+    def from_dataframe(cls, df: pd.DataFrame, id_column: str = "ID", validate: bool = True, columns: Optional[Iterable[str]] = None) -> "Universe":
         """
         Creates a Universe instance from a DataFrame.
 
         Args:
             df (pd.DataFrame): The DataFrame containing asset data.
             id_column (str): The column name to be used as the ID column.
+            validate (bool): Whether to validate the DataFrame.
+            columns (Optional[Iterable[str]]): The columns checked for NaN values, defaults to all of them.
+
+        Returns:
+            Universe: A new Universe instance.
+        """
+        return cls(df, id_column, validate, columns)
+
+    @classmethod
+    def from_parquet(cls, path: Union[str, os.PathLike], columns: Optional[Iterable[str]] = None, id_column: str = "ID", validate: bool = True) -> "Universe":
+        """
+        Creates a Universe instance from a Parquet file, memory-mapping the file and reading only the
+        projected columns. Requires pyarrow.
+
+        Args:
+            path (Union[str, os.PathLike]): The Parquet file path.
+            columns (Optional[Iterable[str]]): The columns to load, e.g. the target column and the columns of
+                the constraints. The ID column is always loaded. Defaults to all of them.
+            id_column (str): The column name to be used as the ID column.
+            validate (bool): Whether to validate the loaded columns.
+
+        Returns:
+            Universe: A new Universe instance.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        pq = _import_pyarrow("parquet")
+        projection = _projection(pq.read_schema(path).names, columns, id_column)
+        table = pq.read_table(path, columns=projection, memory_map=True)
+        return cls(_table_to_dataframe(table), id_column, validate)
+
+    @classmethod
+    def from_arrow(cls, source: Any, columns: Optional[Iterable[str]] = None, id_column: str = "ID", validate: bool = True) -> "Universe":
+        """
+        Creates a Universe instance from an Arrow table or a memory-mapped Arrow IPC (Feather V2) file.
+        Columns without missing values are not copied. Requires pyarrow.
+
+        Args:
+            source (Any): A pyarrow.Table or the path of an Arrow IPC file.
+            columns (Optional[Iterable[str]]): The columns to load. The ID column is always loaded.
+                Defaults to all of them.
+            id_column (str): The column name to be used as the ID column.
+            validate (bool): Whether to validate the loaded columns.
 
         Returns:
             Universe: A new Universe instance.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        pa = _import_pyarrow()
+        if isinstance(source, pa.Table):
+            table = source
+        else:
+            # The record batches reference the mapped file, so the columns are only paged in when read
+            table = pa.ipc.open_file(pa.memory_map(os.fspath(source), "r")).read_all()
+        table = table.select(_projection(table.column_names, columns, id_column))
+        return cls(_table_to_dataframe(table), id_column, validate)
+
+    @classmethod
+    def from_npy(cls, directory: Union[str, os.PathLike], columns: Optional[Iterable[str]] = None, id_column: str = "ID", validate: bool = True) -> "Universe":
         """
-        return cls(df, id_column)
+        Creates a Universe instance from a directory holding one '<column>.npy' file per column,
+        memory-mapping the projected columns.
+
+        Args:
+            directory (Union[str, os.PathLike]): The directory path.
+            columns (Optional[Iterable[str]]): The columns to load. The ID column is always loaded.
+                Defaults to all of them.
+            id_column (str): The column name to be used as the ID column.
+            validate (bool): Whether to validate the loaded columns.
+
+        Returns:
+            Universe: A new Universe instance.
+
+        Raises:
+            ValueError: If the columns do not have the same length.
+        """
+        available = sorted(name[:-len(".npy")]
+                           for name in os.listdir(directory) if name.endswith(".npy"))
+        data = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+                for name in _projection(available, columns, id_column)}
+        if len({len(values) for values in data.values()}) > 1:
+            raise ValueError("All columns must have the same length.")
+        return cls(pd.DataFrame(data, copy=False), id_column, validate)
 
     def to_dataframe(self) -> pd.DataFrame:
         """
@@ -63,6 +159,42 @@ class Universe:
         """
         return self._df.copy()
 
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a read-only NumPy view of a column without copying the Universe data.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            np.ndarray: A non-writeable array with the column values.
+
+        Raises:
+            KeyError: If the column does not exist.
+        """
+        if name not in self._columns:
+            values = self._df[name].to_numpy().view()
+            values.flags.writeable = False
+            self._columns[name] = values
+        return self._columns[name]
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        Returns a cached DataFrame backed by the read-only column views.
+
+        Unlike to_dataframe(), no data is copied: the values cannot be assigned to,
+        and the frame is shared by all callers so it must not be modified otherwise.
+
+        Returns:
+            pd.DataFrame: A read-only view of the Universe data.
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {name: self.column(name) for name in self._df.columns},
+                index=self._df.index, copy=False)
+        return self._frame
+
     @property
     def df(self) -> pd.DataFrame:
         """
@@ -92,3 +224,110 @@ class Universe:
             int: The number of unique assets.
         """
         return self._number_of_assets
+
+
+def _has_nan(series: pd.Series) -> bool:
+    """
+    Checks a column for missing values without materializing a boolean frame.
+
+    Args:
+        series (pd.Series): The column.
+
+    Returns:
+        bool: True if the column contains a missing value.
+    """
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype):
+        if dtype.kind in "iub":
+            # Integer and boolean columns cannot hold missing values
+            return False
+        if dtype.kind in "fc":
+            return bool(np.isnan(series.to_numpy()).any())
+        if dtype.kind in "mM":
+            return bool(np.isnat(series.to_numpy()).any())
+    return bool(series.hasnans)
+
+
+def _has_duplicates(ids: np.ndarray) -> bool:
+    """
+    Checks the IDs for duplicates in at most one hashing pass.
+
+    Args:
+        ids (np.ndarray): The IDs.
+
+    Returns:
+        bool: True if an ID appears more than once.
+    """
+    if ids.dtype.kind in "iuf" and np.all(ids[1:] > ids[:-1]):
+        # Strictly increasing numerical IDs, e.g. generated ones, are unique without hashing
+        return False
+    return len(pd.unique(ids)) != len(ids)
+
+
+def _import_pyarrow(module: Optional[str] = None) -> Any:
+    """
+    Imports pyarrow, which is an optional dependency.
+
+    Args:
+        module (Optional[str]): The pyarrow submodule to import, e.g. 'parquet'.
+
+    Returns:
+        Any: The pyarrow module or submodule.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    try:
+        return importlib.import_module("pyarrow" if module is None else f"pyarrow.{module}")
+    except ImportError as error:
+        raise ImportError(
+            "pyarrow is required to load Arrow and Parquet files, install it with 'pip install corefolio[arrow]'.") from error
+
+
+def _projection(available: List[str], columns: Optional[Iterable[str]], id_column: str) -> List[str]:
+    """
+    Returns the columns to load: the requested ones, plus the ID column if available.
+
+    Args:
+        available (List[str]): The columns of the file.
+        columns (Optional[Iterable[str]]): The requested columns, None for all of them.
+        id_column (str): The ID column name.
+
+    Returns:
+        List[str]: The columns to load, in the file order.
+
+    Raises:
+        KeyError: If a requested column does not exist.
+    """
+    if columns is None:
+        return list(available)
+    requested = set(columns)
+    missing = requested.difference(available)
+    if missing:
+        raise KeyError(f"Columns not found: {sorted(missing)}.")
+    requested.add(id_column)
+    return [name for name in available if name in requested]
+
+
+def _table_to_dataframe(table: Any) -> pd.DataFrame:
+    """
+    Converts an Arrow table to a DataFrame, without copying the single-chunk numerical columns
+    that have no missing values.
+
+    Args:
+        table (pyarrow.Table): The table.
+
+    Returns:
+        pd.DataFrame: The DataFrame, whose zero-copy columns are read-only.
+    """
+    data = {}
+    for name, column in zip(table.column_names, table.columns):
+        if column.num_chunks == 1 and column.null_count == 0:
+            try:
+                data[name] = column.chunk(0).to_numpy(zero_copy_only=True)
+                continue
+            except Exception:
+                # Strings, booleans and other types without a NumPy layout are converted
+                pass
+        data[name] = column.to_pandas().to_numpy()
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,126 @@
+"""This module contains the FactorRiskModel and WeightOptions classes, which configure the weighted mode of the Optimizer."""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from corefolio.lazy import cp
+
+
+class FactorRiskModel:
+    def __init__(self, loadings: Any, factor_covariance: Any, specific_variance: Any) -> None:
+        """
+        Initializes the FactorRiskModel, i.e. the asset covariance B F B' + D given as its factors.
+
+        Args:
+            loadings (Any): The (assets x factors) loadings matrix B, dense or scipy.sparse,
+                in the order of the Universe assets.
+            factor_covariance (Any): The (factors x factors) factor covariance matrix F.
+            specific_variance (Any): The specific variance of every asset, the diagonal of D.
+
+        Raises:
+            ValueError: If the shapes do not match, a specific variance is negative or
+                the factor covariance is not symmetric positive semidefinite.
+        """
+        self._loadings = sp.csr_matrix(loadings) if sp.issparse(
+            loadings) else np.asarray(loadings, dtype=float)
+        self._factor_covariance = np.asarray(factor_covariance, dtype=float)
+        self._specific_variance = np.asarray(specific_variance, dtype=float)
+
+        num_assets, num_factors = self._loadings.shape
+        if self._factor_covariance.shape != (num_factors, num_factors):
+            raise ValueError(
+                "The factor covariance must be a square matrix with one row per factor.")
+        if self._specific_variance.shape != (num_assets,):
+            raise ValueError(
+                "The specific variance must have one value per asset.")
+        if np.any(self._specific_variance < 0):
+            raise ValueError("The specific variance must be nonnegative.")
+        if not np.allclose(self._factor_covariance, self._factor_covariance.T):
+            raise ValueError("The factor covariance must be symmetric.")
+
+        # F = R'R, so that the factor risk is the sum of squares of R applied to the factor exposures
+        eigenvalues, eigenvectors = np.linalg.eigh(self._factor_covariance)
+        if eigenvalues.size and eigenvalues.min() < -1e-10 * max(eigenvalues.max(), 1.0):
+            raise ValueError(
+                "The factor covariance must be positive semidefinite.")
+        self._factor_root = np.sqrt(
+            np.clip(eigenvalues, 0.0, None))[:, None] * eigenvectors.T
+
+    @property
+    def num_assets(self) -> int:
+        """
+        Returns the number of assets of the model.
+
+        Returns:
+            int: The number of assets.
+        """
+        return self._loadings.shape[0]
+
+    @property
+    def num_factors(self) -> int:
+        """
+        Returns the number of factors of the model.
+
+        Returns:
+            int: The number of factors.
+        """
+        return self._loadings.shape[1]
+
+    def risk(self, weights: cp.Expression) -> Tuple[cp.Expression, List[cp.Constraint]]:
+        """
+        Returns the portfolio variance of the weights as a sparse CVXPY expression.
+
+        The factor exposures are auxiliary variables, so the problem holds the loadings and the
+        factor covariance only and never the dense (assets x assets) covariance.
+
+        Args:
+            weights (cp.Expression): The asset weights.
+
+        Returns:
+            Tuple[cp.Expression, List[cp.Constraint]]: The variance and the constraints defining the exposures.
+        """
+        exposures = cp.Variable(self.num_factors)
+        constraints = [exposures == self._loadings.T @ weights]
+        variance = cp.sum_squares(self._factor_root @ exposures) + cp.sum_squares(
+            cp.multiply(np.sqrt(self._specific_variance), weights))
+        return variance, constraints
+
+    def variance(self, weights: np.ndarray) -> float:
+        """
+        Returns the portfolio variance of the weights.
+
+        Args:
+            weights (np.ndarray): The asset weights.
+
+        Returns:
+            float: The variance.
+        """
+        exposures = self._loadings.T @ weights
+        return float(exposures @ self._factor_covariance @ exposures + self._specific_variance @ (weights ** 2))
+
+
+class WeightOptions:
+    def __init__(self, risk_model: Optional[FactorRiskModel] = None, risk_aversion: float = 1.0, max_weight: float = 1.0) -> None:
+        """
+        Initializes the WeightOptions, which switch the Optimizer to long-only, fully invested continuous weights.
+
+        Args:
+            risk_model (Optional[FactorRiskModel]): The risk model whose variance is penalized in the objective.
+            risk_aversion (float): The multiplier of the variance in the objective.
+            max_weight (float): The maximum weight of an asset. With a MaxAssetsConstraint, it is also the
+                big-M linking the weight of an asset to its boolean selection.
+
+        Raises:
+            ValueError: If the risk aversion is negative or the maximum weight is not in (0, 1].
+        """
+        if risk_aversion < 0:
+            raise ValueError("The risk aversion must be nonnegative.")
+        if not 0 < max_weight <= 1:
+            raise ValueError("The maximum weight must be in (0, 1].")
+        self.risk_model = risk_model
+        self.risk_aversion = risk_aversion
+        self.max_weight = max_weight
@@ -0,0 +1,211 @@
+"""Tests for the asynchronous optimization API."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from corefolio import asynchronous
+from corefolio.asynchronous import _in_flight
+from corefolio.constraint import MaxAssetsConstraint
+from corefolio.hooks import CallbackHook, OptimizerHook
+from corefolio.optimizer import Optimizer
+from corefolio.universe import Universe
+
+
+class SlowConstraint(MaxAssetsConstraint):
+    """A MaxAssetsConstraint whose rows take a while to build, waiting on an event when one is given."""
+
+    def __init__(self, max_assets, delay, event=None):
+        super().__init__(max_assets)
+        self.delay = delay
+        self.event = event
+
+    def linear_rows(self, df):
+        if self.event is not None:
+            self.event.wait(5)
+        time.sleep(self.delay)
+        return super().linear_rows(df)
+
+    def cache_key(self):
+        return ("SlowConstraint", self.max_assets)
+
+
+class CountingHook(OptimizerHook):
+    """A hook counting the optimizations started."""
+
+    def __init__(self):
+        self.starts = 0
+
+    def on_start(self, optimizer):
+        self.starts += 1
+
+
+def _universe():
+    return Universe(pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]}))
+
+
+def test_optimize_async_returns_result():
+    """
+    Test that optimize_async solves the problem in the default executor.
+    """
+    optimizer = Optimizer(_universe(), [MaxAssetsConstraint(max_assets=2)])
+    result = asyncio.run(optimizer.optimize_async())
+    assert result.status == "optimal"
+    assert sorted(result.selected_ids) == [3, 4]
+
+
+def test_optimize_async_coalesces_identical_requests():
+    """
+    Test that concurrent identical requests share a single solve and receive their own copy of the result.
+    """
+    hook = CountingHook()
+    optimizers = [Optimizer(_universe(), [SlowConstraint(2, 0.2)], hooks=[hook]) for _ in range(5)]
+
+    async def main():
+        return await asyncio.gather(*(optimizer.optimize_async() for optimizer in optimizers))
+
+    results = asyncio.run(main())
+    assert hook.starts == 1
+    assert all(sorted(result.selected_ids) == [3, 4] for result in results)
+    assert len({id(result) for result in results}) == 5
+    assert not _in_flight
+
+
+def test_optimize_async_does_not_coalesce_different_requests():
+    """
+    Test that requests with different constraint configurations are solved separately.
+    """
+    hook = CountingHook()
+    optimizers = [Optimizer(_universe(), [SlowConstraint(max_assets, 0.05)], hooks=[hook]) for max_assets in [1, 2]]
+
+    async def main():
+        return await asyncio.gather(*(optimizer.optimize_async() for optimizer in optimizers))
+
+    first, second = asyncio.run(main())
+    assert hook.starts == 2
+    assert len(first.selected_ids) == 1
+    assert len(second.selected_ids) == 2
+
+
+def test_optimize_async_timeout_keeps_loop_responsive():
+    """
+    Test that a timed out request raises asyncio.TimeoutError while the event loop keeps running.
+    """
+    optimizer = Optimizer(_universe(), [SlowConstraint(2, 0.5)])
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.gather(optimizer.optimize_async(executor, timeout=0.1), ticker())
+
+    asyncio.run(main())
+    assert len(ticks) == 5
+
+
+def test_optimize_async_cancels_pending_solve():
+    """
+    Test that cancelling the only request waiting for a queued solve cancels the solve.
+    """
+    hook = CountingHook()
+    event = threading.Event()
+    blocking = Optimizer(_universe(), [SlowConstraint(1, 0.0, event)])
+    queued = Optimizer(_universe(), [MaxAssetsConstraint(max_assets=2)], hooks=[hook])
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            running = asyncio.ensure_future(blocking.optimize_async(executor))
+            pending = asyncio.ensure_future(queued.optimize_async(executor))
+            await asyncio.sleep(0.05)
+            pending.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await pending
+            event.set()
+            await running
+
+    asyncio.run(main())
+    assert hook.starts == 0
+    assert not _in_flight
+
+
+def test_optimize_async_identical_request_after_cancel_is_solved():
+    """
+    Test that a request arriving right after the cancellation of an identical request starts a new solve.
+    """
+    hook = CountingHook()
+    event = threading.Event()
+    blocking = Optimizer(_universe(), [SlowConstraint(1, 0.0, event)])
+    queued = Optimizer(_universe(), [MaxAssetsConstraint(max_assets=2)], hooks=[hook])
+
+    async def main():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            running = asyncio.ensure_future(blocking.optimize_async(executor))
+            cancelled = asyncio.ensure_future(queued.optimize_async(executor))
+            await asyncio.sleep(0.05)
+            cancelled.cancel()
+            retried = asyncio.ensure_future(queued.optimize_async(executor))
+            with pytest.raises(asyncio.CancelledError):
+                await cancelled
+            event.set()
+            await running
+            return await retried
+
+    result = asyncio.run(main())
+    assert sorted(result.selected_ids) == [3, 4]
+    assert hook.starts == 1
+    assert not _in_flight
+
+
+def test_optimize_async_computes_key_off_the_loop(monkeypatch):
+    """
+    Test that the result key is not computed on the event loop thread.
+    """
+    optimizer = Optimizer(_universe(), [MaxAssetsConstraint(max_assets=2)])
+    threads = []
+
+    def slow_key(optimizer):
+        threads.append(threading.get_ident())
+        time.sleep(0.2)
+        return "key"
+
+    monkeypatch.setattr(asynchronous, "result_key", slow_key)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def main():
+        return await asyncio.gather(optimizer.optimize_async(), ticker())
+
+    result, _ = asyncio.run(main())
+    assert sorted(result.selected_ids) == [3, 4]
+    assert threads and threads[0] != threading.get_ident()
+    assert ticks[-1] - ticks[0] < 0.15
+
+
+def test_optimize_async_process_executor_notifies_hooks():
+    """
+    Test that a process executor solves the problem and that the hooks are notified of the result.
+    """
+    results = []
+    optimizer = Optimizer(_universe(), [MaxAssetsConstraint(max_assets=2)],
+                          hooks=[CallbackHook(on_result=results.append)])
+
+    async def main():
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            return await optimizer.optimize_async(executor, timeout=60)
+
+    result = asyncio.run(main())
+    assert sorted(result.selected_ids) == [3, 4]
+    assert len(results) == 1
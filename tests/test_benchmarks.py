@@ -0,0 +1,76 @@
+"""Smoke tests for the benchmark suite."""
+
+import json
+
+from benchmarks.run import compare, main, run_all
+from benchmarks.synthetic import make_constraints, make_frame
+
+
+def test_synthetic_universe():
+    """
+    Test that the synthetic universe matches its constraints.
+    """
+    df = make_frame(50, num_categories=3, num_numeric=2)
+    assert list(df.columns) == ["ID", "value",
+                                "category", "numeric_0", "numeric_1"]
+    assert df["category"].nunique() == 3
+    assert len(make_constraints(50, num_numeric=2)) == 4
+
+
+def test_run_all_records_timings_and_memory():
+    """
+    Test that every benchmark reports its phase timings and peak memory.
+    """
+    results = run_all([60], repeats=1, max_solve_size=60)
+    assert results["metadata"]["repeats"] == 1
+    names = {record["benchmark"] for record in results["results"]}
+    assert {"universe", "mean_constraint_categorical", "optimizer_mip"} <= names
+    for record in results["results"]:
+        assert record["timings"]["total"] >= 0
+        assert record["peak_memory_bytes"] > 0
+
+    mip = next(record for record in results["results"]
+               if record["benchmark"] == "optimizer_mip")
+    assert {"build", "canonicalization", "solver"} <= set(mip["timings"])
+
+
+def test_large_universes_are_not_solved():
+    """
+    Test that only the construction is measured above the maximum solve size.
+    """
+    results = run_all([60], repeats=1, max_solve_size=10,
+                      names=["optimizer_mip", "optimizer_compiled_resolve"])
+    assert [record["benchmark"] for record in results["results"]] == [
+        "optimizer_mip", "optimizer_mip"]
+    assert "solver" not in results["results"][0]["timings"]
+
+
+def test_compare_detects_regressions(tmp_path):
+    """
+    Test the comparison against a baseline results file.
+    """
+    record = {"benchmark": "universe", "num_assets": 10, "parameters": {},
+              "timings": {"construct": 0.01, "total": 0.01}, "peak_memory_bytes": 1}
+    baseline = {"results": [record]}
+    slower = {"results": [
+        {**record, "timings": {"construct": 0.02, "total": 0.011}}]}
+    assert len(compare(slower, baseline, threshold=1.5)) == 1
+    assert compare(baseline, baseline, threshold=1.5) == []
+
+    output = tmp_path / "results.json"
+    baseline_path = tmp_path / "baseline.json"
+    assert main(["--sizes", "20", "--repeats", "1", "--benchmarks", "universe",
+                 "--output", str(output)]) == 0
+    baseline_path.write_text(output.read_text())
+    assert json.loads(output.read_text())["results"][0]["num_assets"] == 20
+    assert main(["--sizes", "20", "--repeats", "1", "--benchmarks", "universe", "--output", str(output),
+                 "--compare", str(baseline_path), "--threshold", "1000"]) == 0
+
+
+def test_import_benchmark_runs_once():
+    """
+    Test that the import benchmark measures the import stages once, independently of the universe sizes.
+    """
+    results = run_all([20, 40], repeats=1, names=["import"])
+    assert [record["num_assets"] for record in results["results"]] == [0]
+    assert set(results["results"][0]["timings"]) == {"package", "universe", "optimizer", "cvxpy", "total"}
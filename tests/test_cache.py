@@ -0,0 +1,133 @@
+"""Tests for the ResultCache class."""
+
+import time
+
+import pandas as pd
+import pytest
+
+from corefolio.cache import ResultCache, result_key
+from corefolio.constraint import Constraint, MaxAssetsConstraint, MeanConstraint
+from corefolio.optimizer import Optimizer
+from corefolio.result import OptimizationResult
+from corefolio.universe import Universe
+
+
+class UncachedConstraint(Constraint):
+    """A constraint without a cache key."""
+
+    def apply_constraint(self, variables, df):
+        return []
+
+
+def _df():
+    return pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40], "other_value": [5, 5, 5, 5]})
+
+
+def test_optimizer_returns_cached_result():
+    """
+    Test that a repeated optimization is returned by the cache and that hits and misses are counted.
+    """
+    cache = ResultCache()
+    constraints = [MaxAssetsConstraint(max_assets=2), MeanConstraint("other_value")]
+    first = Optimizer(Universe(_df()), constraints, result_cache=cache).solve()
+    second = Optimizer(Universe(_df()), constraints, result_cache=cache).solve()
+    assert not first.cached
+    assert second.cached
+    assert second.selected_ids == first.selected_ids
+    assert second.objective_value == first.objective_value
+    assert "cache" in second.timings
+    assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+
+def test_result_key_depends_on_data_and_configuration():
+    """
+    Test that the key changes with the data, the constraint configuration and the sense.
+    """
+    constraint = MaxAssetsConstraint(max_assets=2)
+    optimizer = Optimizer(Universe(_df()), [constraint])
+    key = result_key(optimizer)
+    assert result_key(Optimizer(Universe(_df()), [MaxAssetsConstraint(max_assets=2)])) == key
+
+    constraint.max_assets = 3
+    assert result_key(optimizer) != key
+    constraint.max_assets = 2
+    assert result_key(Optimizer(Universe(_df()), [constraint], sense="minimize")) != key
+
+    df = _df()
+    df.loc[0, "value"] = 11
+    assert result_key(Optimizer(Universe(df), [constraint])) != key
+    # Columns the optimization does not read do not change the key
+    df = _df()
+    df["unused"] = 1
+    assert result_key(Optimizer(Universe(df), [constraint])) == key
+
+
+def test_result_key_is_none_without_constraint_cache_key():
+    """
+    Test that constraints without a cache key bypass the cache.
+    """
+    cache = ResultCache()
+    optimizer = Optimizer(Universe(_df()), [UncachedConstraint()], result_cache=cache)
+    assert result_key(optimizer) is None
+    optimizer.solve()
+    optimizer.solve()
+    assert cache.stats()["hits"] == 0
+
+
+def test_cache_evicts_least_recently_used():
+    """
+    Test that the memory store keeps the most recently used results.
+    """
+    cache = ResultCache(max_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.put(key, OptimizationResult([key], "optimal"))
+    assert cache.get("a") is None
+    assert cache.get("c").selected_ids == ["c"]
+
+
+def test_cache_expires_results():
+    """
+    Test that results older than the time to live are not returned.
+    """
+    cache = ResultCache(ttl=0.05)
+    cache.put("a", OptimizationResult([1], "optimal"))
+    assert cache.get("a") is not None
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_cache_disk_store(tmp_path):
+    """
+    Test that results are shared through the on-disk store and that it keeps at most max_disk_entries results.
+    """
+    path = tmp_path / "results.sqlite"
+    ResultCache(path=path).put("a", OptimizationResult([1, 2], "optimal", 3.0))
+
+    cache = ResultCache(path=path, max_disk_entries=1)
+    result = cache.get("a")
+    assert result.selected_ids == [1, 2]
+    assert cache.stats()["disk_hits"] == 1
+
+    cache.put("b", OptimizationResult([3], "optimal"))
+    assert ResultCache(path=path).get("a") is None
+    assert ResultCache(path=path).get("b").selected_ids == [3]
+
+
+def test_cache_returns_copies():
+    """
+    Test that modifying a returned result does not modify the cached one.
+    """
+    cache = ResultCache()
+    cache.put("a", OptimizationResult([1], "optimal"))
+    cache.get("a").selected_ids.append(2)
+    assert cache.get("a").selected_ids == [1]
+
+
+def test_cache_rejects_invalid_limits():
+    """
+    Test that invalid limits raise a ValueError.
+    """
+    with pytest.raises(ValueError):
+        ResultCache(max_entries=-1)
+    with pytest.raises(ValueError):
+        ResultCache(ttl=0)
@@ -1,9 +1,12 @@
 """Tests for the constraints module."""
 
 import cvxpy as cp
+import numpy as np
 import pandas as pd
+import pytest
+import scipy.sparse as sp
 
-from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.constraint import LinearRows, MaxAssetsConstraint, MeanConstraint, MultiMeanConstraint
 
 
 def test_apply_max_assets_constraint():
@@ -41,13 +44,14 @@ def test_apply_mean_constraint_numerical():
 def test_apply_mean_constraint_categorical():
     """
     Test the apply_constraint method of the MeanConstraint class with categorical data.
-    Ensures that the correct constraints are applied based on the category frequencies and tolerance.
+    Ensures that all categories are constrained by two vectorized constraints.
     """
     df = pd.DataFrame({"category": ["A", "A", "B", "B"]})
     x = cp.Variable(len(df), boolean=True)
     constraint = MeanConstraint(column_name="category", tolerance=0.01)
     applied_constraints = constraint.apply_constraint(x, df)
-    assert len(applied_constraints) == 4
+    assert len(applied_constraints) == 3
+    assert applied_constraints[1].shape == (2,)
 
 
 def test_apply_mean_constraint_min_max():
@@ -74,3 +78,121 @@ def test_mean_constraint_properties():
     assert constraint.tolerance == 0.01
     assert constraint.min_value == 15
     assert constraint.max_value == 35
+
+
+def test_apply_parameterized_max_assets_constraint():
+    """
+    Test the apply_parameterized_constraint method of the MaxAssetsConstraint class.
+    Ensures that the parameter follows the max_assets property.
+    """
+    x = cp.Variable(3, boolean=True)
+    constraint = MaxAssetsConstraint(max_assets=2)
+    applied_constraints, update = constraint.apply_parameterized_constraint(
+        x, pd.DataFrame())
+    assert applied_constraints[0].args[1].value == 2
+    constraint.max_assets = 1
+    update(pd.DataFrame())
+    assert applied_constraints[0].args[1].value == 1
+
+
+def test_mean_constraint_structure_key():
+    """
+    Test the structure_key method of the MeanConstraint class.
+    Ensures that the keys depend on the values, which are constants of the compiled problem, but not on the bounds.
+    """
+    constraint = MeanConstraint(column_name="value")
+    assert constraint.structure_key(pd.DataFrame({"value": [1, 2]})) != \
+        constraint.structure_key(pd.DataFrame({"value": [3, 4]}))
+    key = constraint.structure_key(pd.DataFrame({"value": [1, 2]}))
+    constraint.tolerance = 0.5
+    assert constraint.structure_key(pd.DataFrame({"value": [1, 2]})) == key
+    constraint = MeanConstraint(column_name="category")
+    assert constraint.structure_key(pd.DataFrame({"category": ["A", "B"]})) != \
+        constraint.structure_key(pd.DataFrame({"category": ["A", "C"]}))
+
+
+def test_mean_constraint_category_bounds():
+    """
+    Test the per-category bound overrides of the MeanConstraint class.
+    Ensures that overridden categories use the given bounds and the others use their frequency.
+    """
+    df = pd.DataFrame({"category": ["A", "A", "B", "C"]})
+    constraint = MeanConstraint(
+        column_name="category", tolerance=0.01, category_bounds={"B": (0.3, None), "D": (0.0, 1.0)})
+    _, categories, frequencies = constraint._one_hot(df)
+    min_values, max_values = constraint._category_bounds_array(
+        categories, frequencies)
+    assert list(categories) == ["A", "B", "C"]
+    assert min_values.tolist() == pytest.approx([0.49, 0.3, 0.24])
+    assert max_values.tolist() == pytest.approx([0.51, 0.26, 0.26])
+
+
+def test_linear_rows_validation_and_stack():
+    """
+    Test the shape validation and the stacking of LinearRows.
+    """
+    with pytest.raises(ValueError, match="one value per row"):
+        LinearRows(sp.csr_matrix((2, 3)), np.zeros(2), np.zeros(1))
+    with pytest.raises(ValueError, match="one value per row"):
+        LinearRows(sp.csr_matrix((2, 3)), np.zeros(2), np.zeros(2), lower_count=np.zeros(3))
+
+    first = LinearRows(sp.csr_matrix(np.ones((1, 3))), np.full(1, -np.inf), np.full(1, 2.0))
+    second = LinearRows(sp.csr_matrix(np.eye(3)[:2]), np.zeros(2), np.zeros(2), np.ones(2), np.ones(2))
+    stacked = LinearRows.stack([first, second])
+    assert stacked.num_rows == 3
+    assert stacked.coefficients.shape == (3, 3)
+    assert stacked.lower.tolist() == [-np.inf, 0.0, 0.0]
+    assert stacked.upper_count.tolist() == [0.0, 1.0, 1.0]
+
+
+def test_linear_rows_apply():
+    """
+    Test that the rows are applied as one lower-bounded and one upper-bounded block plus the count definition.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3], "value": [1.0, 2.0, 3.0], "category": ["A", "B", "A"]})
+    rows = LinearRows.stack([MaxAssetsConstraint(max_assets=2).linear_rows(df),
+                             MeanConstraint(column_name="value", min_value=1.5, max_value=2.5).linear_rows(df),
+                             MeanConstraint(column_name="category", tolerance=0.2).linear_rows(df)])
+    x = cp.Variable(3, boolean=True)
+    constraints = rows.apply(x)
+    assert len(constraints) == 3
+
+    for selection, feasible in [([1, 1, 0], True), ([1, 1, 1], False), ([1, 0, 0], False), ([0, 1, 1], True)]:
+        x.value = np.array(selection, dtype=float)
+        constraints[0].args[0].value = float(sum(selection))
+        assert all(constraint.value() for constraint in constraints) == feasible
+
+
+def test_multi_mean_constraint_linear_rows():
+    """
+    Test that the MultiMeanConstraint returns one homogeneous row per column with per-column bounds.
+    """
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [10.0, 20.0, 30.0]})
+    constraint = MultiMeanConstraint(["a", "b"], tolerance=0.5, bounds={"b": (None, 25.0)})
+    rows = constraint.linear_rows(df)
+    np.testing.assert_array_equal(rows.coefficients.toarray(), [[1.0, 2.0, 3.0], [10.0, 20.0, 30.0]])
+    np.testing.assert_array_equal(rows.lower, [0.0, 0.0])
+    np.testing.assert_array_equal(rows.lower_count, [1.5, 19.5])
+    np.testing.assert_array_equal(rows.upper_count, [2.5, 25.0])
+    assert constraint.columns == ["a", "b"]
+
+
+def test_multi_mean_constraint_shares_selected_count():
+    """
+    Test that the MultiMeanConstraint applies two matrix inequalities on a single selected count.
+    """
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [10.0, 20.0, 30.0], "c": [0.0, 1.0, 0.0]})
+    x = cp.Variable(3, boolean=True)
+    applied_constraints = MultiMeanConstraint(["a", "b", "c"]).apply_constraint(x, df)
+    assert len(applied_constraints) == 3
+    assert applied_constraints[1].shape == (3,)
+
+
+def test_multi_mean_constraint_rejects_categorical_columns():
+    """
+    Test that the MultiMeanConstraint raises a ValueError for non-numerical columns or without columns.
+    """
+    with pytest.raises(ValueError):
+        MultiMeanConstraint([])
+    with pytest.raises(ValueError, match="numerical"):
+        MultiMeanConstraint(["sector"]).linear_rows(pd.DataFrame({"sector": ["a", "b"]}))
@@ -0,0 +1,119 @@
+"""Tests for the group decomposition."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from corefolio.constraint import Constraint, MaxAssetsConstraint, MeanConstraint
+from corefolio.decomposition import proportional_budgets
+from corefolio.hooks import CallbackHook
+from corefolio.optimizer import Optimizer
+from corefolio.universe import Universe
+
+
+class PerGroupConstraint(Constraint):
+    """Applies the rows of a constraint within every group, as one monolithic problem."""
+
+    def __init__(self, constraint, group_column):
+        self.constraint = constraint
+        self.group_column = group_column
+
+    def apply_constraint(self, variables, df):
+        constraints = []
+        for positions in df.groupby(self.group_column).indices.values():
+            constraints.extend(self.constraint.linear_rows(df.iloc[positions]).apply(variables[positions]))
+        return constraints
+
+
+class MinAssetsConstraint(Constraint):
+    """A cardinality constraint the decomposition does not support."""
+
+    cardinality = True
+
+    def apply_constraint(self, variables, df):
+        return []
+
+
+def _df(num_assets=120, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"ID": range(num_assets), "value": rng.normal(size=num_assets),
+                         "score": rng.integers(0, 5, num_assets).astype(float),
+                         "sector": rng.choice(["a", "b", "c", "d"], num_assets)})
+
+
+def test_proportional_budgets():
+    """
+    Test that the budget is allocated by largest remainder, capped by the group sizes.
+    """
+    assert proportional_budgets(np.array([50, 30, 20]), 10).tolist() == [5, 3, 2]
+    assert proportional_budgets(np.array([5, 4, 1]), 4).tolist() == [2, 2, 0]
+    assert proportional_budgets(np.array([2, 1]), 10).tolist() == [2, 1]
+
+
+@pytest.mark.parametrize("sense", ["maximize", "minimize"])
+def test_lagrangian_decomposition_matches_monolithic_problem(sense):
+    """
+    Test that the Lagrangian decomposition reaches the optimum of the monolithic problem with per-group constraints.
+    """
+    df = _df()
+    mean = MeanConstraint("score", tolerance=0.3)
+    monolithic = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=9), PerGroupConstraint(mean, "sector")],
+                           sense=sense).solve()
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=9), mean], sense=sense).optimize_groups(
+        "sector", max_workers=1)
+    assert len(result.selected_ids) <= 9
+    assert result.objective_value == pytest.approx(monolithic.objective_value)
+    assert result.status == "optimal"
+    assert result.gap == pytest.approx(0.0, abs=1e-6)
+    assert result.method == "decomposition:lagrangian"
+
+
+def test_proportional_decomposition_respects_group_budgets():
+    """
+    Test that the proportional allocation selects at most the budget of every group.
+    """
+    df = _df()
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=8)]).optimize_groups(
+        "sector", allocation="proportional", max_workers=1)
+    # The groups are numbered in order of appearance
+    codes, _ = pd.factorize(df["sector"])
+    budgets = proportional_budgets(np.bincount(codes), 8)
+    counts = np.bincount(codes[np.isin(df["ID"], result.selected_ids)], minlength=len(budgets))
+    assert np.all(counts <= budgets)
+    assert result.status == "feasible"
+    assert result.gap is None
+
+
+def test_decomposition_in_worker_processes():
+    """
+    Test that the groups solved across processes give the sequential result and that the hooks are notified.
+    """
+    df = _df()
+    constraints = [MaxAssetsConstraint(max_assets=10), MeanConstraint("score", tolerance=0.5)]
+    results = []
+    sequential = Optimizer(Universe(df), constraints).optimize_groups("sector", max_workers=1)
+    parallel = Optimizer(Universe(df), constraints, hooks=[CallbackHook(on_result=results.append)]).optimize_groups(
+        "sector", max_workers=2)
+    assert parallel.objective_value == pytest.approx(sequential.objective_value)
+    assert results == [parallel]
+
+
+def test_decomposition_without_budget_solves_groups_independently():
+    """
+    Test that without MaxAssetsConstraint every group is solved exactly.
+    """
+    df = _df(40)
+    result = Optimizer(Universe(df), [MeanConstraint("score", tolerance=0.5)]).optimize_groups("sector", max_workers=1)
+    assert result.status == "optimal"
+    assert result.gap == 0.0
+
+
+def test_decomposition_rejects_unsupported_settings():
+    """
+    Test that unsupported allocations and cardinality constraints raise an error.
+    """
+    optimizer = Optimizer(Universe(_df(20)), [MaxAssetsConstraint(max_assets=2)])
+    with pytest.raises(ValueError):
+        optimizer.optimize_groups("sector", allocation="auction")
+    with pytest.raises(NotImplementedError):
+        Optimizer(Universe(_df(20)), [MinAssetsConstraint()]).optimize_groups("sector", max_workers=1)
@@ -0,0 +1,138 @@
+"""Tests for the feasibility pre-check."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from corefolio.cache import ResultCache
+from corefolio.constraint import LinearRows, MaxAssetsConstraint, MeanConstraint, MultiMeanConstraint
+from corefolio.feasibility import count_mask, find_conflict
+from corefolio.heuristic import build_ratio_rows
+from corefolio.optimizer import Optimizer
+from corefolio.universe import Universe
+
+
+def _df():
+    return pd.DataFrame({"ID": range(6), "value": [6.0, 5.0, 4.0, 3.0, 2.0, 1.0],
+                         "score": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0], "opposite": [-1.0, -2.0, -3.0, -4.0, -5.0, -6.0],
+                         "sector": ["a", "a", "b", "b", "c", "c"]})
+
+
+def test_mean_outside_column_range_conflicts():
+    """
+    Test that a mean bound outside the range of the column values is reported without solving.
+    """
+    optimizer = Optimizer(Universe(_df()), [MaxAssetsConstraint(max_assets=3), MeanConstraint("score", min_value=7.0)],
+                          feasibility_check=True)
+    result = optimizer.solve()
+    assert result.status == "infeasible"
+    assert not result.is_feasible
+    assert result.selected_ids == []
+    assert result.conflicting_constraints == [1]
+    assert "feasibility" in result.timings
+    assert "solver" not in result.timings
+
+
+def test_category_frequencies_conflict_with_max_assets():
+    """
+    Test that categories requiring more assets than allowed conflict with MaxAssetsConstraint, and that the
+    constraints not involved are left out of the conflict.
+    """
+    constraints = [MeanConstraint("score", tolerance=3.0), MaxAssetsConstraint(max_assets=2),
+                   MeanConstraint("sector", tolerance=0.1)]
+    result = Optimizer(Universe(_df()), constraints, feasibility_check=True).solve()
+    assert result.status == "infeasible"
+    assert result.conflicting_constraints == [1, 2]
+
+
+def test_lp_relaxation_detects_joint_conflict():
+    """
+    Test that constraints satisfiable one at a time but not together are detected by the LP relaxation.
+    """
+    constraints = [MeanConstraint("score", min_value=2.0), MeanConstraint("opposite", min_value=-1.5, max_value=-1.0)]
+    assert find_conflict(constraints[:1], _df()) is None
+    assert find_conflict(constraints[1:], _df()) is None
+    assert find_conflict(constraints, _df()) == [0, 1]
+
+
+def test_feasible_problem_is_solved():
+    """
+    Test that a feasible problem passes the pre-check and is solved as usual.
+    """
+    constraints = [MaxAssetsConstraint(max_assets=3), MeanConstraint("sector", tolerance=0.2)]
+    checked = Optimizer(Universe(_df()), constraints, feasibility_check=True).solve()
+    unchecked = Optimizer(Universe(_df()), constraints).solve()
+    assert checked.status == "optimal"
+    assert checked.conflicting_constraints is None
+    assert checked.objective_value == unchecked.objective_value
+
+
+def test_conflict_without_pre_check_returns_empty_selection():
+    """
+    Test that without the pre-check, conflicting constraints lead to the empty selection.
+    """
+    result = Optimizer(Universe(_df()), [MeanConstraint("score", min_value=7.0)]).solve()
+    assert result.selected_ids == []
+    assert result.conflicting_constraints is None
+
+
+def test_cached_pre_check_result_is_not_shared():
+    """
+    Test that a cached infeasible result of the pre-check is not returned to an Optimizer without the pre-check.
+    """
+    cache = ResultCache()
+    constraints = [MaxAssetsConstraint(max_assets=3), MeanConstraint("score", min_value=7.0)]
+    checked = Optimizer(Universe(_df()), constraints, feasibility_check=True, result_cache=cache).solve()
+    unchecked = Optimizer(Universe(_df()), constraints, result_cache=cache).solve()
+    assert checked.status == "infeasible"
+    assert not unchecked.cached
+    assert unchecked.status != "infeasible"
+    assert unchecked.conflicting_constraints is None
+
+
+def test_count_mask_of_partition_rows():
+    """
+    Test that the counts allowed by one-hot rows account for the integer number of assets taken from every set.
+    """
+    # Two sets of two assets, each with a share between 0.4 and 0.6
+    rows = LinearRows(np.array([[1.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 1.0]]), np.zeros(2), np.zeros(2),
+                      np.full(2, 0.4), np.full(2, 0.6))
+    assert count_mask(rows, 4).tolist() == [True, False, True, False, True]
+    assert count_mask(rows, 4, max_count=2).tolist() == [True, False, True]
+
+
+def test_conflicts_are_sound_and_minimal():
+    """
+    Test on random problems that every reported conflict has no nonempty feasible selection and is minimal,
+    compared with the enumeration of all the selections.
+    """
+    rng = np.random.default_rng(7)
+
+    def has_nonempty_selection(constraints, df):
+        rows = build_ratio_rows(constraints, df)
+        for size in range(1, len(df) + 1):
+            for subset in itertools.combinations(range(len(df)), size):
+                selected = np.zeros(len(df), dtype=bool)
+                selected[list(subset)] = True
+                if rows.is_feasible(selected):
+                    return True
+        return False
+
+    detected = 0
+    for _ in range(40):
+        df = pd.DataFrame({"ID": range(7), "a": rng.integers(0, 6, 7).astype(float), "b": rng.normal(size=7),
+                           "s": rng.choice(["x", "y", "z"], 7)})
+        constraints = [MaxAssetsConstraint(max_assets=int(rng.integers(0, 4))),
+                       MeanConstraint("a", tolerance=float(rng.uniform(0.0, 1.5))),
+                       MeanConstraint("s", tolerance=float(rng.uniform(0.0, 0.4))),
+                       MultiMeanConstraint(["a", "b"], tolerance=float(rng.uniform(0.0, 1.0)))]
+        conflict = find_conflict(constraints, df)
+        if conflict is None:
+            continue
+        detected += 1
+        subset = [constraints[index] for index in conflict]
+        assert not has_nonempty_selection(subset, df)
+        for position in range(len(subset)):
+            assert find_conflict(subset[:position] + subset[position + 1:], df) is None
+    assert detected > 0
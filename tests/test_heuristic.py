@@ -0,0 +1,79 @@
+"""Tests for the heuristic engine."""
+
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+
+from corefolio.constraint import Constraint, LinearRows, MaxAssetsConstraint, MeanConstraint
+from corefolio.heuristic import build_ratio_rows, solve_greedy
+
+
+class CountRowsConstraint(Constraint):
+    """A constraint bounding the selected count through rows without asset coefficients."""
+
+    def __init__(self, lower, upper, count_coefficient):
+        self.lower = lower
+        self.upper = upper
+        self.count_coefficient = count_coefficient
+
+    def apply_constraint(self, variables, df):
+        return []
+
+    def linear_rows(self, df):
+        # lower + c * n <= 0 <= upper + c * n
+        return LinearRows(sp.csr_matrix((1, len(df))), np.full(1, self.lower), np.full(1, self.upper),
+                          np.full(1, self.count_coefficient), np.full(1, self.count_coefficient))
+
+
+def _df():
+    return pd.DataFrame({"ID": [1, 2, 3, 4], "value": [1.0, 2.0, 3.0, 4.0]})
+
+
+def test_build_ratio_rows_from_constraints():
+    """
+    Test that the built-in constraints become a cardinality bound and homogeneous rows.
+    """
+    rows = build_ratio_rows([MaxAssetsConstraint(max_assets=3),
+                             MeanConstraint(column_name="value", min_value=2.0, max_value=3.0)], _df())
+    assert rows.max_assets == 3
+    assert rows.num_rows == 2
+    assert rows.is_feasible(np.array([False, True, True, False]))
+    assert not rows.is_feasible(np.array([True, False, False, False]))
+    assert not rows.is_feasible(np.array([True, True, True, True]))
+
+
+def test_build_ratio_rows_count_only_rows():
+    """
+    Test that rows without asset coefficients bound the selected count.
+    """
+    # -inf + n <= 0 <= 2.5 - n, i.e. n <= 2.5
+    rows = build_ratio_rows([CountRowsConstraint(-np.inf, 2.5, -1.0)], _df())
+    assert rows.max_assets == 2
+    assert rows.num_rows == 0
+    # -3 + n <= 0, i.e. n <= 3, from the lower side
+    rows = build_ratio_rows([CountRowsConstraint(-3.0, np.inf, 1.0)], _df())
+    assert rows.max_assets == 3
+
+
+def test_build_ratio_rows_lower_bound_on_count():
+    """
+    Test that a positive minimum number of selected assets is not supported by the heuristic engine.
+    """
+    # 0 <= -2 + n, i.e. n >= 2
+    with pytest.raises(NotImplementedError, match="lower bounds on the number of selected assets"):
+        build_ratio_rows([CountRowsConstraint(-np.inf, -2.0, 1.0)], _df())
+    with pytest.raises(NotImplementedError, match="does not support"):
+        build_ratio_rows([CountRowsConstraint(1.0, np.inf, 0.0)], _df())
+
+
+def test_solve_greedy_without_subgradient_iterations():
+    """
+    Test that the construction falls back to the plain scores when no subgradient step is taken.
+    """
+    rows = build_ratio_rows([MaxAssetsConstraint(max_assets=2),
+                             MeanConstraint(column_name="value", min_value=2.0, max_value=3.0)], _df())
+    selected, bound = solve_greedy(np.array([1.0, 2.0, 3.0, 4.0]), rows, iterations=0)
+    assert rows.is_feasible(selected)
+    assert selected.sum() == 2
+    assert bound >= 5.0
@@ -1,8 +1,16 @@
 """Tests for the Optimizer class."""
 
+import itertools
+
+import cvxpy as cp
+import numpy as np
 import pandas as pd
+import pytest
+import scipy.sparse as sp
 
-from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.batch import Scenario
+from corefolio.constraint import Constraint, LinearRows, MaxAssetsConstraint, MeanConstraint, MultiMeanConstraint
+from corefolio.hooks import CallbackHook, OptimizerHook
 from corefolio.universe import Universe
 from corefolio.optimizer import Optimizer
 
@@ -89,3 +97,457 @@ def test_optimizer_with_multiple_constraints():
     selected_ids = optimizer.optimize()
     assert len(selected_ids) <= 2
     assert all(id in df["ID"].values for id in selected_ids)
+
+
+def test_optimizer_compiled_matches_default():
+    """
+    Test the Optimizer class in compiled mode.
+    Ensures that the compiled problem selects the same assets as the default mode.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40], "other_value": [
+                      5, 5, 5, 5], "category": ["A", "A", "B", "B"]})
+    universe = Universe(df)
+    constraints = [
+        MaxAssetsConstraint(max_assets=2),
+        MeanConstraint(column_name="other_value", tolerance=0.01),
+        MeanConstraint(column_name="category", tolerance=0.01)
+    ]
+    default_ids = Optimizer(universe, constraints, sense="maximize",
+                            target_column="value").optimize()
+    compiled_ids = Optimizer(universe, constraints, sense="maximize",
+                             target_column="value", compiled=True).optimize()
+    assert sorted(compiled_ids) == sorted(default_ids)
+
+
+def test_optimizer_compiled_reuses_problem():
+    """
+    Test that the compiled problem is reused when only parameter values change.
+    Ensures that updated bounds are taken into account and that new target values rebuild the problem.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    max_assets = MaxAssetsConstraint(max_assets=2)
+    optimizer = Optimizer(Universe(df), [max_assets], sense="maximize",
+                          target_column="value", compiled=True)
+    assert sorted(optimizer.optimize()) == [3, 4]
+    problem = optimizer._compiled_problem.problem
+
+    max_assets.max_assets = 1
+    assert optimizer.optimize() == [4]
+    assert optimizer._compiled_problem.problem is problem
+
+    optimizer.universe = Universe(pd.DataFrame(
+        {"ID": [1, 2, 3, 4], "value": [40, 30, 20, 10]}))
+    assert optimizer.optimize() == [1]
+    assert optimizer._compiled_problem.problem is not problem
+
+
+def test_optimizer_compiled_invalidated_on_structure_change():
+    """
+    Test that the compiled problem is rebuilt when the universe shape changes.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    optimizer = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)],
+                          sense="maximize", target_column="value", compiled=True)
+    optimizer.optimize()
+    problem = optimizer._compiled_problem.problem
+
+    optimizer.universe = Universe(pd.DataFrame(
+        {"ID": [1, 2, 3], "value": [10, 20, 30]}))
+    assert sorted(optimizer.optimize()) == [2, 3]
+    assert optimizer._compiled_problem.problem is not problem
+
+
+def test_optimizer_compiled_canonicalization_scales_with_assets():
+    """
+    Test that a compiled problem over a large universe only has scalar and bound parameters.
+    Ensures that the canonicalization stays fast, a parameter per asset makes it quadratic in the number of assets.
+    """
+    num_assets = 20000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"ID": range(num_assets), "value": rng.normal(size=num_assets),
+                       "score": rng.integers(0, 5, num_assets).astype(float),
+                       "sector": rng.choice(["a", "b", "c"], num_assets)})
+    constraints = [MaxAssetsConstraint(max_assets=10), MeanConstraint("score", tolerance=0.3),
+                   MeanConstraint("sector", tolerance=0.2), MultiMeanConstraint(["score", "value"], tolerance=0.5)]
+    optimizer = Optimizer(Universe(df), constraints, compiled=True)
+    result = optimizer.solve()
+    assert result.status == "optimal"
+    assert all(parameter.size <= 3 for parameter in optimizer._compiled_problem.problem.parameters())
+    assert result.timings["canonicalization"] < 5.0
+
+
+def test_optimizer_with_category_bounds():
+    """
+    Test the Optimizer class with per-category bounds on a categorical MeanConstraint.
+    Ensures that a category can be excluded from the selection.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [
+                      10, 20, 30, 40], "category": ["A", "A", "B", "B"]})
+    constraints = [MeanConstraint(column_name="category", min_value=0.0, max_value=1.0,
+                                  category_bounds={"B": (None, 0.0)})]
+    for compiled in (False, True):
+        optimizer = Optimizer(Universe(df), constraints, sense="maximize",
+                              target_column="value", compiled=compiled)
+        assert sorted(optimizer.optimize()) == [1, 2]
+
+
+def test_optimizer_does_not_copy_universe(monkeypatch):
+    """
+    Test that the Optimizer reads the Universe through its read-only views.
+    Ensures that optimize() does not deep-copy the asset table.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [
+                      10, 20, 30, 40], "category": ["A", "A", "B", "B"]})
+    universe = Universe(df)
+
+    def fail():
+        raise AssertionError("to_dataframe() should not be called")
+
+    monkeypatch.setattr(universe, "to_dataframe", fail)
+    constraints = [MaxAssetsConstraint(max_assets=2),
+                   MeanConstraint(column_name="category", tolerance=0.01)]
+    optimizer = Optimizer(universe, constraints,
+                          sense="maximize", target_column="value")
+    assert len(optimizer.optimize()) == 2
+
+
+def test_optimizer_solve_returns_result():
+    """
+    Test the solve method of the Optimizer class.
+    Ensures that the result carries the selected IDs, status and objective value.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    optimizer = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)],
+                          sense="maximize", target_column="value")
+    result = optimizer.solve()
+    assert sorted(result.selected_ids) == [3, 4]
+    assert result.status == "optimal"
+    assert result.objective_value == pytest.approx(70)
+    assert result.wall_time > 0
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_optimizer_optimize_many(max_workers):
+    """
+    Test the optimize_many method of the Optimizer class.
+    Ensures that the scenarios are solved and returned in input order, and that errors are reported per scenario.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40], "other": [
+                      4, 3, 2, 1], "category": ["A", "A", "B", "B"]})
+    constraints = [MaxAssetsConstraint(max_assets=2),
+                   MeanConstraint(column_name="category", tolerance=0.01)]
+    optimizer = Optimizer(Universe(df), constraints,
+                          sense="maximize", target_column="value")
+    scenarios = [
+        Scenario(),
+        Scenario(sense="minimize"),
+        Scenario(target_column="other"),
+        Scenario(values={"value": [40, 30, 20, 10]}),
+        Scenario(target_column="missing"),
+    ]
+    results = optimizer.optimize_many(scenarios, max_workers=max_workers)
+    assert [sorted(result.selected_ids) for result in results[:4]] == [
+        [2, 4], [], [1, 3], [1, 3]]
+    assert results[4].status == "error"
+    assert "missing" in results[4].error
+    assert all(result.wall_time is not None for result in results)
+
+
+def test_optimizer_invalid_method():
+    """
+    Test that the Optimizer rejects unknown methods.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    with pytest.raises(ValueError, match="Invalid method value."):
+        Optimizer(Universe(df), [], method="simplex")
+
+
+def test_optimizer_auto_top_k_skips_cvxpy(monkeypatch):
+    """
+    Test the 'auto' method on a pure top-k problem.
+    Ensures that the problem is solved exactly by the heuristic engine without building a CVXPY problem.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, -20, 30, 40]})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("CVXPY should not be used")
+
+    monkeypatch.setattr(Optimizer, "_build_problem", fail)
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=3)],
+                       sense="maximize", target_column="value", method="auto").solve()
+    assert sorted(result.selected_ids) == [1, 3, 4]
+    assert result.method == "greedy"
+    assert result.status == "optimal"
+    assert result.gap == 0
+
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=3)],
+                       sense="minimize", target_column="value", method="auto").solve()
+    assert result.selected_ids == [2]
+
+
+def test_optimizer_greedy_with_mean_constraints():
+    """
+    Test the 'greedy' method with numerical and categorical MeanConstraint.
+    Ensures that the heuristic selection is feasible and close to the MIP optimum.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"value": rng.normal(1, 1, 300), "duration": rng.normal(5, 2, 300),
+                       "category": rng.integers(0, 4, 300).astype(str)})
+    universe = Universe(df)
+    constraints = [
+        MaxAssetsConstraint(max_assets=20),
+        MeanConstraint(column_name="duration", min_value=4.5, max_value=5.0),
+        MeanConstraint(column_name="category", tolerance=0.05)
+    ]
+    greedy = Optimizer(universe, constraints, target_column="value",
+                       method="greedy").solve()
+    mip = Optimizer(universe, constraints, target_column="value").solve()
+
+    frame = universe.to_dataframe()
+    selected = frame[np.isin(frame["ID"], greedy.selected_ids)]
+    assert 0 < len(selected) <= 20
+    assert 4.5 - 1e-9 <= selected["duration"].mean() <= 5.0 + 1e-9
+    assert greedy.objective_value <= mip.objective_value + 1e-6
+    assert greedy.objective_value >= 0.99 * mip.objective_value
+    assert 0 <= greedy.gap < 0.05
+
+
+def test_optimizer_reoptimize_warm_start(monkeypatch):
+    """
+    Test the reoptimize method of the Optimizer class.
+    Ensures that the previous selection is matched by ID, seeds the decision variables and is passed
+    as a warm start to the MIP-start-capable solver when feasible.
+    """
+    # Stand in for Gurobi with an installed solver and record what the solver receives
+    monkeypatch.setattr("corefolio.optimizer.WARM_START_SOLVER", "SCIPY")
+    calls = []
+    solve = cp.Problem.solve
+
+    def recording_solve(problem, *args, **kwargs):
+        calls.append((kwargs.get("solver"), kwargs.get("warm_start"),
+                      [None if variable.value is None else variable.value.copy() for variable in problem.variables()]))
+        return solve(problem, *args, **kwargs)
+
+    monkeypatch.setattr(cp.Problem, "solve", recording_solve)
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    optimizer = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)],
+                          sense="maximize", target_column="value")
+    previous = optimizer.solve()
+    assert not previous.warm_start
+    assert calls[-1][1] is False
+
+    updated = Universe(pd.DataFrame(
+        {"ID": [2, 3, 4, 5], "value": [20, 30, 40, 50]}))
+    result = optimizer.reoptimize(previous, updated)
+    assert result.warm_start
+    solver, warm_start, values = calls[-1]
+    assert solver == "SCIPY" and warm_start is True
+    # Assets 3 and 4 were selected and keep their selection in the updated universe
+    assert values[0].tolist() == [0.0, 1.0, 1.0, 0.0]
+    assert sorted(result.selected_ids) == [4, 5]
+
+    # Three assets do not satisfy the maximum number of assets
+    result = optimizer.reoptimize([2, 3, 4])
+    assert not result.warm_start
+    assert calls[-1][1] is False
+    assert sorted(result.selected_ids) == [4, 5]
+
+
+def test_optimizer_reoptimize_greedy():
+    """
+    Test the reoptimize method with the 'greedy' method.
+    Ensures that a feasible previous selection seeds the heuristic engine.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40],
+                       "category": ["A", "A", "B", "B"]})
+    constraints = [MaxAssetsConstraint(max_assets=2),
+                   MeanConstraint(column_name="category", tolerance=0.01)]
+    optimizer = Optimizer(Universe(df), constraints, sense="maximize",
+                          target_column="value", method="greedy")
+    result = optimizer.reoptimize([1, 3])
+    assert result.warm_start
+    assert sorted(result.selected_ids) == [2, 4]
+
+
+def test_optimizer_timings_and_hooks():
+    """
+    Test the timing breakdown of the result and the hooks of the Optimizer class.
+    Ensures that every phase is timed and reported to the hooks.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [
+                      10, 20, 30, 40], "category": ["A", "A", "B", "B"]})
+    phases = []
+    results = []
+
+    class RecordingHook(OptimizerHook):
+        def on_start(self, optimizer):
+            phases.append("start")
+
+    hooks = [RecordingHook(), CallbackHook(on_phase=lambda phase, seconds: phases.append(phase),
+                                           on_result=results.append)]
+    constraints = [MaxAssetsConstraint(max_assets=2),
+                   MeanConstraint(column_name="category", tolerance=0.01)]
+    optimizer = Optimizer(Universe(df), constraints, sense="maximize",
+                          target_column="value", hooks=hooks)
+    result = optimizer.solve()
+
+    assert set(result.timings) == {
+        "prepare", "variables", "objective", "constraint:0:MaxAssetsConstraint",
+        "constraint:1:MeanConstraint", "stack_rows", "problem", "canonicalization", "solver", "extract"}
+    assert all(seconds >= 0 for seconds in result.timings.values())
+    assert sum(result.timings.values()) <= result.wall_time
+    assert phases[0] == "start"
+    assert set(phases[1:]) == set(result.timings)
+    assert results == [result]
+
+    results.clear()
+    optimizer.optimize_many([Scenario(), Scenario()], max_workers=2)
+    assert len(results) == 2
+    assert "solver" in results[0].timings
+
+
+def test_optimizer_required_columns():
+    """
+    Test that the required columns are the ID, target and constraint columns, without duplicates.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40],
+                      "other_value": [1, 2, 3, 4], "unused": [None, 1, 2, 3]})
+    universe = Universe(df, validate=False)
+    optimizer = Optimizer(universe, [MaxAssetsConstraint(max_assets=2), MeanConstraint(column_name="other_value"),
+                                     MeanConstraint(column_name="value")], target_column="value")
+    assert optimizer.required_columns == ["ID", "value", "other_value"]
+    universe.validate(optimizer.required_columns)
+
+
+class MinSumConstraint(Constraint):
+    """A constraint only defined through linear rows: the selected sum of a column is at least a bound."""
+
+    def __init__(self, column_name, min_sum):
+        self.column_name = column_name
+        self.min_sum = min_sum
+
+    def apply_constraint(self, variables, df):
+        raise AssertionError("The Optimizer must stack the linear rows.")
+
+    def linear_rows(self, df):
+        values = sp.csr_matrix(df[self.column_name].to_numpy(dtype=float))
+        return LinearRows(values, np.full(1, self.min_sum), np.full(1, np.inf))
+
+
+def test_optimizer_stacks_custom_linear_rows():
+    """
+    Test that a custom constraint returning linear rows is stacked with the built-in ones.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40], "weight": [5.0, 1.0, 1.0, 1.0]})
+    constraints = [MaxAssetsConstraint(max_assets=2), MinSumConstraint("weight", 5.0)]
+    phases = []
+    optimizer = Optimizer(Universe(df), constraints, target_column="value",
+                          hooks=[CallbackHook(on_phase=lambda phase, seconds: phases.append(phase))])
+    assert sorted(optimizer.optimize()) == [1, 4]
+    assert "stack_rows" in phases
+    # The rows are not homogeneous in the selection, so the heuristic engine cannot use them
+    with pytest.raises(NotImplementedError):
+        Optimizer(Universe(df), constraints, target_column="value", method="greedy").optimize()
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_multi_mean_constraint_matches_mean_constraints(compiled):
+    """
+    Test that a MultiMeanConstraint selects the same portfolio as one MeanConstraint per column.
+    """
+    rng = np.random.default_rng(1)
+    columns = {f"c{i}": rng.normal(size=40) for i in range(5)}
+    df = pd.DataFrame({"ID": range(40), "value": rng.normal(size=40), **columns})
+    separate = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=6)] +
+                         [MeanConstraint(name, tolerance=0.3, max_value=0.1 if name == "c0" else None) for name in columns],
+                         compiled=compiled).solve()
+    combined = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=6),
+                                        MultiMeanConstraint(list(columns), tolerance=0.3, bounds={"c0": (None, 0.1)})],
+                         compiled=compiled).solve()
+    assert combined.status == "optimal"
+    assert combined.objective_value == pytest.approx(separate.objective_value)
+
+
+def _pool_universe():
+    rng = np.random.default_rng(3)
+    return Universe(pd.DataFrame({"ID": range(8), "value": rng.normal(size=8),
+                                  "score": rng.integers(0, 4, 8).astype(float)}))
+
+
+def test_optimize_pool_returns_k_best_selections():
+    """
+    Test that the pool holds the k best selections, compared with the enumeration of all the selections.
+    """
+    universe = _pool_universe()
+    values = universe.frame["value"].to_numpy()
+    objectives = sorted((values[list(subset)].sum() for size in range(4)
+                         for subset in itertools.combinations(range(8), size)), reverse=True)
+    results = Optimizer(universe, [MaxAssetsConstraint(max_assets=3)]).optimize_pool(5)
+    assert [result.objective_value for result in results] == pytest.approx(objectives[:5])
+    assert len({frozenset(result.selected_ids) for result in results}) == 5
+    assert all(result.status == "optimal" for result in results)
+    assert all("solver" in result.timings for result in results)
+
+
+def test_optimize_pool_respects_min_hamming_distance():
+    """
+    Test that the selections of the pool pairwise differ by at least the minimum Hamming distance and satisfy the constraints.
+    """
+    universe = _pool_universe()
+    constraints = [MaxAssetsConstraint(max_assets=4), MeanConstraint("score", tolerance=0.5)]
+    results = Optimizer(universe, constraints).optimize_pool(4, min_hamming_distance=3)
+    assert len(results) == 4
+    assert results[0].objective_value == pytest.approx(Optimizer(universe, constraints).solve().objective_value)
+    selections = [set(result.selected_ids) for result in results]
+    for first, second in itertools.combinations(selections, 2):
+        assert len(first ^ second) >= 3
+    scores = universe.frame.set_index("ID")["score"]
+    mean = scores.mean()
+    for selection in selections:
+        assert len(selection) <= 4
+        if selection:
+            assert abs(scores[list(selection)].mean() - mean) <= 0.5 + 1e-6
+
+
+def test_optimize_pool_canonicalizes_once(monkeypatch):
+    """
+    Test that the alternatives of the pool only update the cut parameters, without canonicalizing the problem again.
+    """
+    from cvxpy.reductions.solvers.solving_chain import SolvingChain
+
+    calls = []
+    apply = SolvingChain.apply
+
+    def counting_apply(self, *args, **kwargs):
+        calls.append(self)
+        return apply(self, *args, **kwargs)
+
+    monkeypatch.setattr(SolvingChain, "apply", counting_apply)
+    results = Optimizer(_pool_universe(), [MaxAssetsConstraint(max_assets=3)]).optimize_pool(4)
+    assert len(results) == 4
+    assert len(calls) == 1
+    assert not any(result.warm_start for result in results)
+
+
+def test_optimize_pool_stops_when_exhausted():
+    """
+    Test that the pool returns fewer than k selections when the problem has no other feasible selection, and notifies the hooks of every solve.
+    """
+    results = []
+    universe = Universe(pd.DataFrame({"ID": [1, 2, 3], "value": [3.0, 2.0, 1.0]}))
+    optimizer = Optimizer(universe, [MaxAssetsConstraint(max_assets=1)],
+                          hooks=[CallbackHook(on_result=results.append)])
+    pool = optimizer.optimize_pool(10)
+    assert [result.selected_ids for result in pool] == [[1], [2], [3], []]
+    assert results == pool
+
+
+def test_optimize_pool_rejects_invalid_settings():
+    """
+    Test that an invalid pool size or distance raises an error.
+    """
+    optimizer = Optimizer(_pool_universe(), [MaxAssetsConstraint(max_assets=2)])
+    with pytest.raises(ValueError):
+        optimizer.optimize_pool(0)
+    with pytest.raises(ValueError):
+        optimizer.optimize_pool(3, min_hamming_distance=0)
@@ -0,0 +1,46 @@
+"""Tests for the package namespace."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+import corefolio
+
+
+def _run(script):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(corefolio.__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    return subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True).stdout.split()
+
+
+def test_import_defers_dependencies():
+    """
+    Test that importing the package imports neither pandas nor cvxpy, and that building a Universe and
+    an Optimizer does not import cvxpy until a problem is solved.
+    """
+    output = _run("""
+import sys
+import corefolio
+print("pandas" in sys.modules, "cvxpy" in sys.modules)
+import pandas as pd
+from corefolio.constraint import MaxAssetsConstraint
+universe = corefolio.Universe(pd.DataFrame({"ID": [1, 2, 3], "value": [1.0, 2.0, 3.0]}))
+optimizer = corefolio.Optimizer(universe, [MaxAssetsConstraint(max_assets=1)], compiled=True)
+print("cvxpy" in sys.modules)
+print(optimizer.optimize()[0], "cvxpy" in sys.modules)
+""")
+    assert output == ["False", "False", "False", "3", "True"]
+
+
+def test_lazy_attributes():
+    """
+    Test that the public names are resolved on access and that unknown names raise an AttributeError.
+    """
+    from corefolio.optimizer import Optimizer
+
+    assert corefolio.Optimizer is Optimizer
+    assert set(corefolio.__all__) <= set(dir(corefolio))
+    with pytest.raises(AttributeError):
+        corefolio.Missing
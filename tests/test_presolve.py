@@ -0,0 +1,98 @@
+"""Tests for the presolve stage."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.heuristic import RatioRows, build_ratio_rows
+from corefolio.optimizer import Optimizer
+from corefolio.presolve import presolve
+from corefolio.universe import Universe
+
+
+def test_presolve_pure_top_k():
+    """
+    Test that without mean constraints the presolve keeps the best positive scores only and solves the problem.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4, 5], "value": [3.0, -1.0, 5.0, 4.0, 1.0]})
+    rows = build_ratio_rows([MaxAssetsConstraint(max_assets=2)], df)
+    reduction = presolve(df["value"].to_numpy(), rows)
+    assert reduction.kept.tolist() == [2, 3]
+    assert reduction.is_top_k
+    assert reduction.removed_rows == 0
+
+
+def test_presolve_collapses_identical_assets():
+    """
+    Test that among assets with the same category only the max_assets best scores are kept.
+    """
+    df = pd.DataFrame({"ID": range(8), "value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+                       "sector": ["a", "a", "a", "a", "b", "b", "b", "b"]})
+    constraints = [MaxAssetsConstraint(max_assets=2), MeanConstraint("sector", tolerance=0.0)]
+    reduction = presolve(df["value"].to_numpy(), build_ratio_rows(constraints, df))
+    assert reduction.kept.tolist() == [2, 3, 6, 7]
+    assert not reduction.is_top_k
+
+
+def test_presolve_removes_unreachable_assets_and_redundant_rows():
+    """
+    Test that an asset whose mean violation cannot be offset is removed, after which the row is redundant.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [1.0, 2.0, 3.0, 10.0], "score": [5.0, 5.0, 5.0, 0.0]})
+    constraints = [MaxAssetsConstraint(max_assets=2), MeanConstraint("score", min_value=4.0, max_value=10.0)]
+    reduction = presolve(df["value"].to_numpy(), build_ratio_rows(constraints, df))
+    # 0 + 5 < 2 * 4, so asset 4 is never selected and the remaining assets satisfy both bounds
+    assert reduction.kept.tolist() == [1, 2]
+    assert reduction.removed_rows == 2
+    assert reduction.is_top_k
+
+
+@pytest.mark.parametrize("sense", ["maximize", "minimize"])
+def test_optimizer_presolve_matches_full_problem(sense):
+    """
+    Test that the presolved problem has the same optimal objective as the full problem
+    and that the removed variables are reported.
+    """
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"ID": range(60), "value": rng.integers(-5, 20, 60).astype(float),
+                       "score": rng.integers(0, 4, 60).astype(float), "sector": rng.choice(["a", "b", "c"], 60)})
+    constraints = [MaxAssetsConstraint(max_assets=6), MeanConstraint("score", tolerance=0.3),
+                   MeanConstraint("sector", tolerance=0.2)]
+    full = Optimizer(Universe(df), constraints, sense=sense).solve()
+    reduced = Optimizer(Universe(df), constraints, sense=sense, presolve=True).solve()
+    assert reduced.status == "optimal"
+    assert reduced.objective_value == pytest.approx(full.objective_value)
+    assert reduced.removed_variables > 0
+    assert "presolve" in reduced.timings
+    assert full.removed_variables is None
+
+
+def test_optimizer_presolve_maps_selection_to_ids():
+    """
+    Test that a problem solved by the presolve returns the original IDs without calling the solver.
+    """
+    df = pd.DataFrame({"ID": [10, 20, 30, 40], "value": [10, 20, 30, 40]})
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)], presolve=True).solve()
+    assert sorted(result.selected_ids) == [30, 40]
+    assert result.objective_value == 70
+    assert result.removed_variables == 2
+    assert result.solver is None
+
+
+def test_presolve_keeps_the_rows_sparse(monkeypatch):
+    """
+    Test that the presolve works on the sparse coefficients, on a categorical column with many levels.
+    """
+    def fail(self, indices):
+        raise AssertionError("The presolve densified the rows.")
+
+    monkeypatch.setattr(RatioRows, "dense_columns", fail)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"ID": range(2000), "value": rng.normal(size=2000), "sector": rng.integers(0, 200, 2000).astype(str)})
+    constraints = [MaxAssetsConstraint(max_assets=3), MeanConstraint("sector", tolerance=0.5)]
+    reduction = presolve(df["value"].to_numpy(), build_ratio_rows(constraints, df))
+    # Only the 3 best assets of every sector are needed
+    best = df.sort_values("value", ascending=False).groupby("sector").head(3)
+    assert set(reduction.kept) <= set(best.index)
+    assert len(reduction.kept) < 2000
@@ -0,0 +1,175 @@
+"""Tests for the on-disk store of canonicalized problems."""
+
+import json
+import os
+import subprocess
+import sys
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+import pytest
+
+from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.optimizer import Optimizer
+from corefolio.problem_store import ProblemStore, problem_key
+from corefolio.solver import SolverOptions
+from corefolio.universe import Universe
+
+
+def _df(seed=0, num_assets=40):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"ID": range(num_assets), "value": rng.normal(size=num_assets),
+                         "score": rng.integers(0, 5, num_assets).astype(float),
+                         "sector": rng.choice(["a", "b", "c"], num_assets)})
+
+
+def _constraints(tolerance=0.3):
+    return [MaxAssetsConstraint(max_assets=6), MeanConstraint("score", tolerance=tolerance),
+            MeanConstraint("sector", tolerance=0.2)]
+
+
+@pytest.mark.parametrize("sense", ["maximize", "minimize"])
+def test_stored_problem_matches_cvxpy_solve(tmp_path, sense):
+    """
+    Test that a problem solved from the store gives the CVXPY result, and that a second Optimizer reuses the artifact.
+    """
+    df = _df()
+    store = ProblemStore(str(tmp_path))
+    expected = Optimizer(Universe(df), _constraints(), sense=sense).solve()
+    first = Optimizer(Universe(df), _constraints(), sense=sense, compiled=True, problem_store=store).solve()
+    second = Optimizer(Universe(df), _constraints(), sense=sense, compiled=True, problem_store=store).solve()
+    for result in [first, second]:
+        assert result.status == "optimal"
+        assert result.solver == "SCIPY"
+        assert result.objective_value == pytest.approx(expected.objective_value)
+    assert "canonicalization" in first.timings
+    assert "canonicalization" not in second.timings
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_stored_problem_applies_new_parameter_values(tmp_path):
+    """
+    Test that an artifact is reused for new constraint parameters on the same data, and that new data,
+    which are constants of the compiled problem, are exported to another artifact.
+    """
+    store = ProblemStore(str(tmp_path))
+    df = _df()
+    Optimizer(Universe(df), _constraints(), compiled=True, problem_store=store).solve()
+    result = Optimizer(Universe(df), _constraints(0.1), compiled=True, problem_store=store).solve()
+    expected = Optimizer(Universe(df), _constraints(0.1)).solve()
+    assert "canonicalization" not in result.timings
+    assert result.objective_value == pytest.approx(expected.objective_value)
+    assert len(os.listdir(tmp_path)) == 1
+
+    updated = df.assign(value=np.random.default_rng(5).normal(size=len(df)),
+                        score=np.random.default_rng(6).integers(0, 5, len(df)).astype(float))
+    result = Optimizer(Universe(updated), _constraints(0.1), compiled=True, problem_store=store).solve()
+    expected = Optimizer(Universe(updated), _constraints(0.1)).solve()
+    assert "canonicalization" in result.timings
+    assert result.objective_value == pytest.approx(expected.objective_value)
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_stored_problem_with_conflicting_bounds_selects_nothing(tmp_path):
+    """
+    Test that a stored problem whose bounds no asset can satisfy returns the empty selection.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3], "value": [1.0, 2.0, 3.0], "score": [1.0, 2.0, 3.0]})
+    constraint = MeanConstraint("score", min_value=10.0, max_value=11.0)
+    result = Optimizer(Universe(df), [constraint], compiled=True, problem_store=ProblemStore(str(tmp_path))).solve()
+    assert result.status == "optimal"
+    assert result.selected_ids == []
+    assert result.objective_value == 0.0
+
+
+def test_artifact_of_another_version_is_discarded(tmp_path):
+    """
+    Test that an artifact written by another version is discarded and exported again.
+    """
+    df = _df()
+    store = ProblemStore(str(tmp_path))
+    optimizer = Optimizer(Universe(df), _constraints(), compiled=True, problem_store=store)
+    optimizer.solve()
+    key = problem_key(optimizer, df)
+    manifest_path = os.path.join(tmp_path, key, "manifest.json")
+    with open(manifest_path) as file:
+        manifest = json.load(file)
+    manifest["versions"]["cvxpy"] = "0.0.0"
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file)
+    assert store.get(key) is None
+    assert not os.path.exists(os.path.join(tmp_path, key))
+    result = Optimizer(Universe(df), _constraints(), compiled=True, problem_store=store).solve()
+    assert "canonicalization" in result.timings
+    assert store.get(key) is not None
+
+
+def test_artifact_of_another_universe_is_exported_again(tmp_path):
+    """
+    Test that an artifact whose asset IDs are not the ones of the Universe is discarded and exported again.
+    """
+    store = ProblemStore(str(tmp_path))
+    df = _df()
+    Optimizer(Universe(df), _constraints(), compiled=True, problem_store=store).solve()
+    moved = df.assign(ID=df["ID"] + 100)
+    optimizer = Optimizer(Universe(moved), _constraints(), compiled=True, problem_store=store)
+    result = optimizer.solve()
+    assert "canonicalization" in result.timings
+    assert store.get(problem_key(optimizer, moved)).ids.tolist() == moved["ID"].tolist()
+    assert "canonicalization" not in optimizer.solve().timings
+
+
+def test_store_is_bypassed_for_another_solver(tmp_path):
+    """
+    Test that a configured solver other than SCIPY solves the problem without the store, with a warning.
+    """
+    solvers = [solver for solver in ["HIGHS", "GLPK_MI", "CBC", "GUROBI"] if solver in cp.installed_solvers()]
+    if not solvers:
+        pytest.skip("No MIP solver other than SCIPY is installed.")
+    df = _df()
+    expected = Optimizer(Universe(df), _constraints()).solve()
+    optimizer = Optimizer(Universe(df), _constraints(), compiled=True, problem_store=ProblemStore(str(tmp_path)),
+                          solver_options=SolverOptions(solver=solvers[0]))
+    with pytest.warns(UserWarning, match="without the store"):
+        result = optimizer.solve()
+    assert result.solver == solvers[0]
+    assert result.objective_value == pytest.approx(expected.objective_value)
+    assert not os.listdir(tmp_path)
+
+
+def test_problem_key_depends_on_structure():
+    """
+    Test that the key changes with the structure and data of the problem but not with the constraint parameters.
+    """
+    df = _df()
+    key = problem_key(Optimizer(Universe(df), _constraints()), df)
+    assert problem_key(Optimizer(Universe(df), _constraints(0.1)), df) == key
+    assert problem_key(Optimizer(Universe(df), _constraints()), df.assign(value=df["value"] + 1)) != key
+    assert problem_key(Optimizer(Universe(df), _constraints(), sense="minimize"), df) != key
+    assert problem_key(Optimizer(Universe(df), _constraints()[:2]), df) != key
+    assert problem_key(Optimizer(Universe(_df(num_assets=41)), _constraints()), _df(num_assets=41)) != key
+
+
+def test_stored_problem_is_reused_by_a_fresh_process(tmp_path):
+    """
+    Test that a fresh process solves the exported problem from the store without canonicalizing it.
+    """
+    script = (
+        "import sys\n"
+        "import numpy as np\n"
+        "import pandas as pd\n"
+        "from corefolio import Optimizer, ProblemStore, Universe\n"
+        "from corefolio.constraint import MaxAssetsConstraint\n"
+        "df = pd.DataFrame({'ID': range(30), 'value': np.arange(30.0)})\n"
+        "result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=3)], compiled=True,\n"
+        "                   problem_store=ProblemStore(sys.argv[1])).solve()\n"
+        "print('canonicalization' in result.timings, sorted(result.selected_ids))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    outputs = [subprocess.run([sys.executable, "-c", script, str(tmp_path)], capture_output=True, text=True,
+                              check=True, env=env).stdout.split() for _ in range(2)]
+    assert outputs[0][0] == "True"
+    assert outputs[1][0] == "False"
+    assert " ".join(outputs[1][1:]) == "[27, 28, 29]"
@@ -0,0 +1,144 @@
+"""Tests for the SolverOptions class."""
+
+import time
+
+import cvxpy as cp
+import pandas as pd
+import pytest
+
+from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.optimizer import Optimizer
+from corefolio.solver import SolverOptions
+from corefolio.universe import Universe
+
+
+def test_solver_options_translation():
+    """
+    Test the translation of the generic options into solver-specific keyword arguments.
+    """
+    options = SolverOptions(time_limit=10, mip_gap=0.01, threads=4)
+    assert options.solve_kwargs("GUROBI") == {
+        "verbose": False, "TimeLimit": 10, "MIPGap": 0.01, "Threads": 4}
+    assert options.solve_kwargs("CPLEX")["cplex_params"] == {
+        "timelimit": 10, "mip.tolerances.mipgap": 0.01, "threads": 4}
+    with pytest.warns(UserWarning):
+        assert options.solve_kwargs("SCIPY")["scipy_options"] == {
+            "time_limit": 10, "mip_rel_gap": 0.01}
+    assert SolverOptions().solve_kwargs(None) == {"verbose": False}
+
+
+def test_solver_options_solver_kwargs_are_merged():
+    """
+    Test that the additional solver keyword arguments are merged with the translated options.
+    """
+    options = SolverOptions(time_limit=10, solver_kwargs={
+                            "SCIPY": {"scipy_options": {"presolve": False}}})
+    assert options.solve_kwargs("SCIPY")["scipy_options"] == {
+        "time_limit": 10, "presolve": False}
+
+
+def test_solver_options_chain():
+    """
+    Test that the solvers which are not installed are skipped.
+    """
+    options = SolverOptions(solver="NOT_A_SOLVER", fallback_solvers=["SCIPY"])
+    assert options.solver_chain() == ["SCIPY"]
+    with pytest.raises(cp.SolverError):
+        SolverOptions(solver="NOT_A_SOLVER").solver_chain()
+    assert SolverOptions().solver_chain() == [None]
+
+
+def test_optimizer_with_solver_options():
+    """
+    Test the Optimizer with solver options.
+    Ensures that the options are passed to the solver and that the solver and MIP gap are reported.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [
+                      10, 20, 30, 40], "category": ["A", "A", "B", "B"]})
+    constraints = [MaxAssetsConstraint(max_assets=2),
+                   MeanConstraint(column_name="category", tolerance=0.01)]
+    options = SolverOptions(solver="NOT_A_SOLVER", fallback_solvers=[
+                            "SCIPY"], time_limit=10, mip_gap=1e-6)
+    result = Optimizer(Universe(df), constraints, target_column="value",
+                       solver_options=options).solve()
+    assert sorted(result.selected_ids) == [2, 4]
+    assert result.solver == "SCIPY"
+    assert result.gap == pytest.approx(0, abs=1e-6)
+
+
+def test_optimizer_solver_fallback_on_error(monkeypatch):
+    """
+    Test that the Optimizer falls back to the next solver when a solver fails, and raises when all fail.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    solve = cp.Problem.solve
+    calls = []
+
+    def failing_solve(self, solver=None, **kwargs):
+        calls.append(solver)
+        if solver == "CLARABEL":
+            raise cp.SolverError("CLARABEL cannot solve MIPs")
+        return solve(self, solver=solver, **kwargs)
+
+    monkeypatch.setattr(cp.Problem, "solve", failing_solve)
+    options = SolverOptions(solver="CLARABEL", fallback_solvers=["SCIPY"])
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)],
+                       target_column="value", solver_options=options).solve()
+    assert calls == ["CLARABEL", "SCIPY"]
+    assert sorted(result.selected_ids) == [3, 4]
+
+    with pytest.raises(cp.SolverError, match="All solvers failed"):
+        Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)], target_column="value",
+                  solver_options=SolverOptions(solver="CLARABEL")).solve()
+
+
+def test_optimizer_time_limit_without_incumbent(monkeypatch):
+    """
+    Test that the heuristic selection is returned when the MIP finds no incumbent within the time limit.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+
+    def failing_solve(self, *args, **kwargs):
+        time.sleep(0.05)
+        raise cp.SolverError("Time limit reached without a solution")
+
+    monkeypatch.setattr(cp.Problem, "solve", failing_solve)
+    optimizer = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)], target_column="value",
+                          solver_options=SolverOptions(solver="SCIPY", time_limit=0.01))
+    result = optimizer.solve()
+    assert result.method == "greedy"
+    assert sorted(result.selected_ids) == [3, 4]
+
+    optimizer.solver_options.time_limit = None
+    with pytest.raises(cp.SolverError):
+        optimizer.solve()
+
+
+def test_optimizer_time_limit_does_not_hide_solver_errors(monkeypatch):
+    """
+    Test that solver failures other than the time limit are raised when a time limit is set.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10, 20, 30, 40]})
+    with pytest.raises(cp.SolverError, match="is installed"):
+        Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)], target_column="value",
+                  solver_options=SolverOptions(solver="NOT_A_SOLVER", time_limit=10)).solve()
+
+    def failing_solve(self, *args, **kwargs):
+        raise cp.SolverError("Numerical difficulties")
+
+    monkeypatch.setattr(cp.Problem, "solve", failing_solve)
+    with pytest.raises(cp.SolverError, match="Numerical difficulties"):
+        Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=2)], target_column="value",
+                  solver_options=SolverOptions(solver="SCIPY", time_limit=10)).solve()
+
+
+def test_solver_chain_for_continuous_problems():
+    """
+    Test that continuous problems default to a continuous solver, with or without limits.
+    """
+    installed = cp.installed_solvers()
+    expected = "CLARABEL" if "CLARABEL" in installed else None
+    assert SolverOptions().solver_chain(mixed_integer=False)[0] == expected
+    assert SolverOptions(time_limit=5).solver_chain(mixed_integer=False)[0] == expected
+    assert SolverOptions(solver="SCIPY").solver_chain(mixed_integer=False) == ["SCIPY"]
+    assert SolverOptions(time_limit=5).solve_kwargs("CLARABEL")["time_limit"] == 5
@@ -0,0 +1,105 @@
+"""Tests for the parameter sweeps of the Optimizer."""
+
+import pandas as pd
+import pytest
+
+from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.hooks import CallbackHook
+from corefolio.optimizer import Optimizer
+from corefolio.sweep import _snake_order, to_frame
+from corefolio.universe import Universe
+
+
+def _optimizer(**kwargs):
+    df = pd.DataFrame({"ID": [1, 2, 3, 4, 5, 6], "value": [10, 20, 30, 40, 50, 60],
+                       "other_value": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]})
+    constraints = [MaxAssetsConstraint(max_assets=2), MeanConstraint(column_name="other_value", tolerance=0.5)]
+    return Optimizer(Universe(df), constraints, target_column="value", **kwargs), constraints
+
+
+def test_snake_order():
+    """
+    Test that consecutive grid points differ by one step of one parameter.
+    """
+    order = _snake_order([3, 2, 2])
+    assert len(set(order)) == 12
+    for previous, current in zip(order, order[1:]):
+        assert sum(abs(a - b) for a, b in zip(previous, current)) == 1
+
+
+def test_sweep_matches_independent_solves():
+    """
+    Test that every sweep point matches a cold solve and that the constraints are restored.
+    """
+    optimizer, constraints = _optimizer()
+    grid = {(constraints[0], "max_assets"): [1, 2, 3], (constraints[1], "tolerance"): [0.5, 1.5]}
+    points = list(optimizer.sweep(grid))
+    assert len(points) == 6
+    assert [point.parameters for point in points[:3]] == [
+        {"max_assets": 1, "tolerance": 0.5}, {"max_assets": 1, "tolerance": 1.5}, {"max_assets": 2, "tolerance": 1.5}]
+    assert constraints[0].max_assets == 2 and constraints[1].tolerance == 0.5
+
+    for point in points:
+        reference, reference_constraints = _optimizer()
+        reference_constraints[0].max_assets = point.parameters["max_assets"]
+        reference_constraints[1].tolerance = point.parameters["tolerance"]
+        assert point.result.objective_value == pytest.approx(reference.solve().objective_value)
+
+    frame = to_frame(points)
+    assert list(frame.columns[:4]) == ["max_assets", "tolerance", "status", "objective_value"]
+    assert len(frame) == 6
+
+
+def test_sweep_reuses_compiled_problem():
+    """
+    Test that the problem is compiled once and only its parameters are updated.
+    """
+    phases = []
+    optimizer, constraints = _optimizer(hooks=[CallbackHook(on_phase=lambda phase, seconds: phases.append(phase))])
+    list(optimizer.sweep({(constraints[0], "max_assets"): [1, 2, 3, 4]}))
+    assert phases.count("problem") == 1
+    assert phases.count("update_parameters") == 3
+
+
+def test_sweep_streams_results():
+    """
+    Test that the results are produced incrementally and the constraints restored when the sweep is stopped.
+    """
+    optimizer, constraints = _optimizer()
+    points = optimizer.sweep({(constraints[0], "max_assets"): range(1, 100)})
+    first = next(points)
+    assert first.parameters == {"max_assets": 1}
+    assert constraints[0].max_assets == 1
+    points.close()
+    assert constraints[0].max_assets == 2
+
+
+def test_sweep_in_parallel():
+    """
+    Test that the parallel sweep returns every point.
+    """
+    results = []
+    optimizer, constraints = _optimizer(hooks=[CallbackHook(on_result=results.append)])
+    points = list(optimizer.sweep({(constraints[0], "max_assets"): [1, 2, 3, 4]}, max_workers=2))
+    assert sorted(point.parameters["max_assets"] for point in points) == [1, 2, 3, 4]
+    assert len(results) == 4
+    assert all(point.result.is_feasible for point in points)
+
+
+def test_sweep_invalid_grid():
+    """
+    Test that invalid grids are rejected before the first result is requested.
+    """
+    optimizer, constraints = _optimizer()
+    with pytest.raises(ValueError, match="not a constraint"):
+        optimizer.sweep({(MaxAssetsConstraint(), "max_assets"): [1]})
+    with pytest.raises(ValueError, match="no settable parameter"):
+        optimizer.sweep({(constraints[0], "unknown"): [1]})
+    # Read-only properties and methods are rejected before the first solve
+    with pytest.raises(ValueError, match="no settable parameter 'column_name'"):
+        optimizer.sweep({(constraints[1], "column_name"): ["value"]})
+    with pytest.raises(ValueError, match="no settable parameter 'apply_constraint'"):
+        optimizer.sweep({(constraints[1], "apply_constraint"): [None]})
+    assert constraints[1].column_name == "other_value"
+    with pytest.raises(ValueError, match="no values"):
+        optimizer.sweep({(constraints[0], "max_assets"): []})
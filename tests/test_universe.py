@@ -1,5 +1,6 @@
 """Tests for the Universe class."""
 
+import numpy as np
 import pytest
 import pandas as pd
 
@@ -64,3 +65,126 @@ def test_universe_df_property():
     # Ensure the returned DataFrame is a copy and not the original
     df_copy["value"] = [100, 200, 300]
     assert not df_copy.equals(universe.df)
+
+
+def test_universe_column_is_read_only_view():
+    data = pd.DataFrame({"ID": [1, 2, 3], "value": [10.0, 20.0, 30.0]})
+    universe = Universe(data)
+    values = universe.column("value")
+    assert values.tolist() == [10.0, 20.0, 30.0]
+    assert not values.flags.writeable
+    assert np.shares_memory(values, data["value"].to_numpy())
+    assert universe.column("value") is values
+    with pytest.raises(ValueError):
+        values[0] = 100.0
+
+
+def test_universe_frame_is_cached_view():
+    data = pd.DataFrame({"ID": [1, 2, 3], "value": [10.0, 20.0, 30.0]})
+    universe = Universe(data)
+    frame = universe.frame
+    assert frame is universe.frame
+    assert frame.equals(data)
+    assert np.shares_memory(frame["value"].to_numpy(), data["value"].to_numpy())
+    with pytest.raises(ValueError):
+        frame.loc[0, "value"] = 100.0
+    assert not np.shares_memory(
+        universe.to_dataframe()["value"].to_numpy(), data["value"].to_numpy())
+
+
+def test_universe_does_not_modify_dataframe():
+    data = pd.DataFrame({"value": [10.0, 20.0, 30.0]})
+    universe = Universe(data)
+    assert list(data.columns) == ["value"]
+    assert universe.to_dataframe()["ID"].tolist() == [1, 2, 3]
+    assert np.shares_memory(universe.column("value"), data["value"].to_numpy())
+
+
+@pytest.mark.parametrize("values", [
+    [1.0, np.nan, 3.0],
+    ["a", None, "c"],
+    pd.to_datetime(["2024-01-01", None, "2024-01-03"]),
+    pd.array([1, None, 3], dtype="Int64"),
+])
+def test_universe_nan_values_by_dtype(values):
+    data = pd.DataFrame({"ID": [1, 2, 3], "column": values})
+    with pytest.raises(ValueError, match="DataFrame contains NaN values."):
+        Universe(data)
+
+
+def test_universe_unsorted_duplicate_ids():
+    data = pd.DataFrame({"ID": ["b", "a", "b"], "value": [10, 20, 30]})
+    with pytest.raises(ValueError, match="DataFrame contains duplicate IDs."):
+        Universe(data)
+    data = pd.DataFrame({"ID": [3, 1, 2], "value": [10, 20, 30]})
+    assert Universe(data).number_of_assets == 3
+
+
+def test_universe_validate_columns_subset():
+    data = pd.DataFrame({"ID": [1, 2, 3], "value": [10.0, 20.0, 30.0], "unused": [1.0, np.nan, 3.0]})
+    universe = Universe(data, columns=["value"])
+    assert universe.number_of_assets == 3
+    with pytest.raises(ValueError, match="DataFrame contains NaN values."):
+        universe.validate()
+    with pytest.raises(ValueError, match="DataFrame contains duplicate IDs."):
+        Universe(pd.DataFrame({"ID": [1, 1], "value": [1.0, 2.0]}), columns=["value"])
+
+
+def test_universe_without_validation():
+    data = pd.DataFrame({"ID": [1, 2, 3], "value": [10.0, np.nan, 30.0]})
+    universe = Universe.from_dataframe(data, validate=False)
+    assert universe.number_of_assets == 3
+    with pytest.raises(ValueError, match="DataFrame contains NaN values."):
+        universe.validate(["value"])
+
+
+def _write_npy(directory, data):
+    for name, values in data.items():
+        np.save(directory / f"{name}.npy", np.asarray(values))
+
+
+def test_universe_from_npy_memory_maps_projected_columns(tmp_path):
+    _write_npy(tmp_path, {"ID": [1, 2, 3], "value": [10.0, 20.0, 30.0],
+                          "sector": ["a", "b", "a"], "unused": [1.0, 2.0, 3.0]})
+    universe = Universe.from_npy(tmp_path, columns=["value", "sector"])
+    assert list(universe.frame.columns) == ["ID", "sector", "value"]
+    assert universe.number_of_assets == 3
+    base = universe.column("value")
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert base is not None
+
+
+def test_universe_from_npy_errors(tmp_path):
+    _write_npy(tmp_path, {"ID": [1, 2, 3], "value": [10.0, 20.0]})
+    with pytest.raises(ValueError, match="same length"):
+        Universe.from_npy(tmp_path)
+    with pytest.raises(KeyError, match="missing"):
+        Universe.from_npy(tmp_path, columns=["missing"])
+
+
+def test_universe_from_arrow_is_zero_copy(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"ID": [1, 2, 3], "value": [10.0, 20.0, 30.0],
+                      "sector": ["a", "b", "a"], "unused": [1, 2, 3]})
+    universe = Universe.from_arrow(table, columns=["value", "sector"])
+    assert list(universe.frame.columns) == ["ID", "value", "sector"]
+    assert np.shares_memory(universe.column("value"),
+                            table.column("value").chunk(0).to_numpy())
+
+    path = tmp_path / "universe.arrow"
+    with pa.ipc.new_file(str(path), table.schema) as writer:
+        writer.write_table(table)
+    assert Universe.from_arrow(path, columns=["value"]).to_dataframe()[
+        "value"].tolist() == [10.0, 20.0, 30.0]
+
+
+def test_universe_from_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    data = pd.DataFrame({"ID": [1, 2, 3], "value": [10.0, np.nan, 30.0], "other": [1.0, 2.0, 3.0]})
+    path = tmp_path / "universe.parquet"
+    data.to_parquet(path, index=False)
+    universe = Universe.from_parquet(path, columns=["other"])
+    assert list(universe.frame.columns) == ["ID", "other"]
+    with pytest.raises(ValueError, match="DataFrame contains NaN values."):
+        Universe.from_parquet(path)
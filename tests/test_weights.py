@@ -0,0 +1,141 @@
+"""Tests for the weighted mode of the Optimizer."""
+
+import cvxpy as cp
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sp
+
+from corefolio.constraint import MaxAssetsConstraint, MeanConstraint
+from corefolio.optimizer import Optimizer
+from corefolio.solver import SolverOptions
+from corefolio.universe import Universe
+from corefolio.weights import FactorRiskModel, WeightOptions
+
+MIQP_SOLVERS = ["GUROBI", "CPLEX", "MOSEK", "SCIP", "XPRESS", "COPT"]
+
+
+def _risk_model(num_assets=6, num_factors=2, seed=0):
+    rng = np.random.default_rng(seed)
+    loadings = rng.normal(size=(num_assets, num_factors))
+    root = rng.normal(size=(num_factors, num_factors))
+    return loadings, root @ root.T, rng.uniform(0.01, 0.05, num_assets)
+
+
+def test_factor_risk_model_variance():
+    """
+    Test that the factor model variance matches the dense covariance.
+    """
+    loadings, factor_covariance, specific_variance = _risk_model()
+    model = FactorRiskModel(sp.csr_matrix(loadings), factor_covariance, specific_variance)
+    covariance = loadings @ factor_covariance @ loadings.T + np.diag(specific_variance)
+    weights = np.full(6, 1 / 6)
+    assert model.variance(weights) == pytest.approx(weights @ covariance @ weights)
+
+    w = cp.Variable(6)
+    variance, constraints = model.risk(w)
+    problem = cp.Problem(cp.Minimize(variance), constraints + [w == weights])
+    problem.solve()
+    assert problem.value == pytest.approx(weights @ covariance @ weights, rel=1e-4)
+
+
+def test_factor_risk_model_validation():
+    """
+    Test that inconsistent risk models are rejected.
+    """
+    loadings, factor_covariance, specific_variance = _risk_model()
+    with pytest.raises(ValueError, match="one value per asset"):
+        FactorRiskModel(loadings, factor_covariance, specific_variance[:-1])
+    with pytest.raises(ValueError, match="one row per factor"):
+        FactorRiskModel(loadings, np.eye(3), specific_variance)
+    with pytest.raises(ValueError, match="positive semidefinite"):
+        FactorRiskModel(loadings, -np.eye(2), specific_variance)
+    with pytest.raises(ValueError, match="nonnegative"):
+        FactorRiskModel(loadings, factor_covariance, -specific_variance)
+    with pytest.raises(ValueError, match="risk aversion"):
+        WeightOptions(risk_aversion=-1)
+
+
+def test_weighted_mean_variance():
+    """
+    Test that the weighted mode matches the dense mean-variance solution.
+    """
+    loadings, factor_covariance, specific_variance = _risk_model()
+    values = np.array([0.05, 0.08, 0.02, 0.06, 0.04, 0.07])
+    df = pd.DataFrame({"ID": range(1, 7), "value": values})
+    options = WeightOptions(FactorRiskModel(loadings, factor_covariance, specific_variance), risk_aversion=2.0)
+    result = Optimizer(Universe(df), [], target_column="value", weight_options=options).solve()
+
+    covariance = loadings @ factor_covariance @ loadings.T + np.diag(specific_variance)
+    w = cp.Variable(6, nonneg=True)
+    reference = cp.Problem(cp.Maximize(values @ w - 2.0 * cp.quad_form(w, covariance)), [cp.sum(w) == 1])
+    reference.solve()
+
+    assert result.is_feasible
+    assert sum(result.weights.values()) == pytest.approx(1.0, abs=1e-6)
+    weights = np.array([result.weights.get(i, 0.0) for i in range(1, 7)])
+    np.testing.assert_allclose(weights, w.value, atol=1e-3)
+    assert result.risk == pytest.approx(w.value @ covariance @ w.value, rel=1e-2)
+    assert result.objective_value == pytest.approx(values @ weights)
+
+
+def test_weighted_cardinality_and_mean_constraints():
+    """
+    Test that MaxAssetsConstraint applies to the selection linked to the weights by big-M,
+    and MeanConstraint bounds the weighted mean.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3, 4], "value": [10.0, 20.0, 30.0, 40.0],
+                      "other_value": [1.0, 2.0, 3.0, 9.0]})
+    options = WeightOptions(max_weight=0.6)
+    constraints = [MaxAssetsConstraint(max_assets=2), MeanConstraint(column_name="other_value", max_value=5.0)]
+    result = Optimizer(Universe(df), constraints, target_column="value", weight_options=options).solve()
+    assert result.is_feasible
+    assert len(result.selected_ids) <= 2
+    assert max(result.weights.values()) <= 0.6 + 1e-6
+    weighted_mean = sum(weight * df.set_index("ID").loc[asset, "other_value"]
+                        for asset, weight in result.weights.items())
+    assert weighted_mean <= 5.0 + 1e-6
+    # Capping asset 3 at 0.6 would leave asset 4 too much weight for the mean bound
+    assert result.selected_ids == [2, 4]
+
+
+@pytest.mark.skipif(not set(MIQP_SOLVERS) & set(cp.installed_solvers()), reason="No MIQP solver installed.")
+def test_weighted_cardinality_with_risk():
+    """
+    Test the mixed-integer quadratic problem with a cardinality constraint and a risk model.
+    """
+    loadings, factor_covariance, specific_variance = _risk_model()
+    df = pd.DataFrame({"ID": range(1, 7), "value": [0.05, 0.08, 0.02, 0.06, 0.04, 0.07]})
+    options = WeightOptions(FactorRiskModel(loadings, factor_covariance, specific_variance))
+    result = Optimizer(Universe(df), [MaxAssetsConstraint(max_assets=3)], target_column="value",
+                       weight_options=options).solve()
+    assert result.is_feasible
+    assert len(result.selected_ids) <= 3
+
+
+def test_weighted_mode_validation():
+    """
+    Test that the greedy method and mismatched risk models are rejected.
+    """
+    df = pd.DataFrame({"ID": [1, 2, 3], "value": [1.0, 2.0, 3.0]})
+    with pytest.raises(ValueError, match="greedy"):
+        Optimizer(Universe(df), [], method="greedy", weight_options=WeightOptions())
+    loadings, factor_covariance, specific_variance = _risk_model()
+    options = WeightOptions(FactorRiskModel(loadings, factor_covariance, specific_variance))
+    with pytest.raises(ValueError, match="one row per asset"):
+        Optimizer(Universe(df), [], weight_options=options).solve()
+
+
+def test_weighted_mode_with_time_limit():
+    """
+    Test that solver limits select a continuous solver for the weighted problem with a risk model.
+    """
+    loadings, factor_covariance, specific_variance = _risk_model()
+    df = pd.DataFrame({"ID": range(1, 7), "value": [0.05, 0.08, 0.02, 0.06, 0.04, 0.07]})
+    options = WeightOptions(FactorRiskModel(loadings, factor_covariance, specific_variance))
+    result = Optimizer(Universe(df), [], target_column="value", weight_options=options,
+                       solver_options=SolverOptions(time_limit=5, threads=1)).solve()
+    assert result.is_feasible
+    assert sum(result.weights.values()) == pytest.approx(1.0, abs=1e-6)
+    if "CLARABEL" in cp.installed_solvers():
+        assert result.solver == "CLARABEL"